@@ -0,0 +1,57 @@
+# benchmarks/_setup.py
+"""
+Shared bootstrap for benchmark scripts: configures Django and builds a
+throwaway test database (never touches db.sqlite3).
+
+    from benchmarks._setup import django_test_db
+    with django_test_db():
+        ...
+"""
+import contextlib
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django():
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+    django.setup()
+
+
+@contextlib.contextmanager
+def django_test_db():
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    # the manifest storage needs a collectstatic run; plain storage resolves straight from static/
+    # ...and a private in-memory cache keeps runs off the shared one (settings.CACHES)
+    storages = override_settings(STORAGES={
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }, CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    storages.enable()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        storages.disable()
+        teardown_test_environment()
+
+
+def timed(fn, repeat=5):
+    """Best wall time of `repeat` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
@@ -0,0 +1,39 @@
+# benchmarks/_slow_ai_app.py
+"""
+The real project served with Gemini replaced by a fixed-latency stand-in
+(BENCH_AI_LATENCY seconds): time.sleep for the sync client, asyncio.sleep
+for the async one, the way each really waits on the network.
+
+    gunicorn benchmarks._slow_ai_app:wsgi ...
+    uvicorn benchmarks._slow_ai_app:asgi ...
+"""
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
+
+from django.core.asgi import get_asgi_application  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+
+LATENCY = float(os.environ.get("BENCH_AI_LATENCY", "1.0"))
+
+wsgi = get_wsgi_application()
+asgi = get_asgi_application()
+
+from web.services import generation  # noqa: E402  (before web.views imports it)
+
+
+def generate_content(prompt: str) -> str:
+    time.sleep(LATENCY)
+    return "#one, #two, #three"
+
+
+async def agenerate_content(prompt: str) -> str:
+    await asyncio.sleep(LATENCY)
+    return "#one, #two, #three"
+
+
+generation.generate_content = generate_content
+generation.agenerate_content = agenerate_content
@@ -0,0 +1,139 @@
+# benchmarks/_standins.py
+"""
+Local stand-ins for the YouTube Data API and Gemini, for load tests.
+
+One ASGI app answers both, from the fixtures in benchmarks/fixtures/:
+
+    GET  /youtube/v3/search                                  search.list
+    GET  /youtube/v3/videos                                  videos.list
+    POST /v1beta/models/<model>:generateContent              Gemini
+
+Point the project at it with YOUTUBE_API_BASE_URL=<base>/youtube/v3 and
+GEMINI_BASE_URL=<base>. Each reply waits for a latency drawn from a
+distribution, in milliseconds: fixed:MS, uniform:LO:HI or
+lognormal:MEDIAN:SIGMA. A fraction of replies fail the way the real APIs
+do (YouTube 403 quotaExceeded, Gemini 503 overloaded):
+
+    STANDIN_YOUTUBE_LATENCY=lognormal:150:0.4   STANDIN_YOUTUBE_ERRORS=0.01
+    STANDIN_GEMINI_LATENCY=uniform:1500:4000    STANDIN_GEMINI_ERRORS=0.02
+
+    uvicorn benchmarks._standins:app --port 8900
+"""
+import asyncio
+import json
+import math
+import os
+import random
+import zlib
+from urllib.parse import parse_qs
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def latency(spec: str):
+    """'fixed:MS' | 'uniform:LO:HI' | 'lognormal:MEDIAN:SIGMA' -> callable returning seconds."""
+    kind, *args = spec.split(":")
+    args = [float(a) for a in args]
+    if kind == "fixed":
+        return lambda: args[0] / 1000
+    if kind == "uniform":
+        return lambda: random.uniform(args[0], args[1]) / 1000
+    if kind == "lognormal":
+        mu = math.log(args[0])
+        return lambda: random.lognormvariate(mu, args[1]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+SEARCH = _fixture("youtube_search.json")
+VIDEOS = {v["id"]: v for v in _fixture("youtube_videos.json")["items"]}
+GEMINI = _fixture("gemini.json")
+
+YOUTUBE_LATENCY = latency(os.environ.get("STANDIN_YOUTUBE_LATENCY", "lognormal:150:0.4"))
+GEMINI_LATENCY = latency(os.environ.get("STANDIN_GEMINI_LATENCY", "lognormal:2500:0.35"))
+YOUTUBE_ERRORS = float(os.environ.get("STANDIN_YOUTUBE_ERRORS", "0"))
+GEMINI_ERRORS = float(os.environ.get("STANDIN_GEMINI_ERRORS", "0"))
+
+
+def _query(scope) -> dict:
+    return {k: v[-1] for k, v in parse_qs(scope["query_string"].decode()).items()}
+
+
+def search(params) -> tuple:
+    # same videos for every keyword, in a keyword-dependent order
+    items = list(SEARCH["items"])
+    random.Random(zlib.crc32(params.get("q", "").encode())).shuffle(items)
+    n = max(1, min(int(params.get("maxResults", 5)), 50))
+    return 200, {**SEARCH, "items": items[:n], "pageInfo": {"totalResults": 1000000, "resultsPerPage": n}}
+
+
+def videos(params) -> tuple:
+    ids = [i for i in params.get("id", "").split(",") if i]
+    items = [VIDEOS[i] for i in ids if i in VIDEOS]
+    return 200, {"kind": "youtube#videoListResponse", "items": items,
+                 "pageInfo": {"totalResults": len(items), "resultsPerPage": len(items)}}
+
+
+def generate(body: bytes) -> tuple:
+    prompt = " ".join(p.get("text", "") for c in json.loads(body or b"{}").get("contents", [])
+                      for p in c.get("parts", []))
+    if "Return ONLY valid JSON" in prompt:
+        text = GEMINI["optimize"]
+    elif "search results snapshot" in prompt:
+        text = GEMINI["discover"]
+    else:
+        text = "#python, #programming, #coding, #learnpython, #pythontutorial"
+    return 200, {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4},
+        "modelVersion": "gemini-2.5-flash",
+    }
+
+
+QUOTA_ERROR = {"error": {"code": 403, "message": "The request cannot be completed because you have exceeded your "
+                                                 "quota.", "errors": [{"reason": "quotaExceeded"}]}}
+OVERLOADED = {"error": {"code": 503, "message": "The model is overloaded. Please try again later.",
+                        "status": "UNAVAILABLE"}}
+
+
+async def _body(receive) -> bytes:
+    chunks, more = [], True
+    while more:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    path = scope["path"]
+    body = await _body(receive)
+    if path.startswith("/youtube/v3/"):
+        await asyncio.sleep(YOUTUBE_LATENCY())
+        if random.random() < YOUTUBE_ERRORS:
+            status, payload = 403, QUOTA_ERROR
+        elif path.endswith("/search"):
+            status, payload = search(_query(scope))
+        elif path.endswith("/videos"):
+            status, payload = videos(_query(scope))
+        else:
+            status, payload = 404, {"error": {"code": 404, "message": "Not found"}}
+    elif path.endswith(":generateContent"):
+        await asyncio.sleep(GEMINI_LATENCY())
+        status, payload = (503, OVERLOADED) if random.random() < GEMINI_ERRORS else generate(body)
+    elif path == "/ready":
+        status, payload = 200, {"ok": True}
+    else:
+        status, payload = 404, {"error": {"code": 404, "message": "Not found"}}
+
+    data = json.dumps(payload).encode()
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json; charset=utf-8"),
+                            (b"content-length", str(len(data)).encode())]})
+    await send({"type": "http.response.body", "body": data})
@@ -0,0 +1,122 @@
+# benchmarks/bench_asgi.py
+"""
+How many slow-Gemini requests one worker process holds at once: gunicorn
+gthread (WSGI) against uvicorn (ASGI, async views).
+
+Each profile serves the real project from one worker, with Gemini replaced by
+a fixed-latency stand-in (benchmarks/_slow_ai_app.py). C clients POST the Tag
+Finder form at the same time; "held" is throughput x latency, i.e. how many
+requests were in flight on average (Little's law).
+
+    python benchmarks/bench_asgi.py [--latency 1.0] [--threads 8] [--concurrency 1 8 32 128 256]
+"""
+import argparse
+import asyncio
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def profiles(threads):
+    return {
+        f"gunicorn gthread x{threads}": lambda port: [
+            sys.executable, "-m", "gunicorn", "benchmarks._slow_ai_app:wsgi", "--workers", "1",
+            "--worker-class", "gthread", "--threads", str(threads), "--bind", f"127.0.0.1:{port}",
+            "--backlog", "2048", "--timeout", "300", "--log-level", "warning",
+        ],
+        "uvicorn (async views)": lambda port: [
+            sys.executable, "-m", "uvicorn", "benchmarks._slow_ai_app:asgi", "--workers", "1",
+            "--host", "127.0.0.1", "--port", str(port), "--backlog", "2048", "--log-level", "warning",
+        ],
+    }
+
+
+async def wait_ready(base, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError("server exited during start-up")
+            try:
+                await client.get(f"{base}/tags/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def burst(base, concurrency):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=600) as client:
+        page = await client.get("/tags/")
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', page.text).group(1)
+
+        async def one():
+            t0 = time.perf_counter()
+            r = await client.post("/tags/", data={"topic": "python", "csrfmiddlewaretoken": token},
+                                  headers={"Referer": f"{base}/tags/"})
+            return time.perf_counter() - t0, r.status_code == 200 and "#one" in r.text
+
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(concurrency)), return_exceptions=True)
+        elapsed = time.perf_counter() - t0
+    ok = [lat for res in results if not isinstance(res, BaseException) and res[1] for lat in [res[0]]]
+    return elapsed, ok, len(results) - len(ok)
+
+
+def run_profile(name, cmd, levels, latency, env):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(cmd(port), cwd=ROOT, env=env)
+    try:
+        asyncio.run(wait_ready(base, proc))
+        asyncio.run(burst(base, 1))       # warm-up
+        for c in levels:
+            elapsed, ok, errors = asyncio.run(burst(base, c))
+            rps = len(ok) / elapsed
+            p50 = statistics.median(ok) if ok else 0
+            p95 = sorted(ok)[max(0, int(len(ok) * 0.95) - 1)] if ok else 0
+            print(f"{name:<24} {c:>5} {rps:>8.1f} {rps * latency:>7.1f} {p50:>8.2f} {p95:>8.2f} {errors:>6}")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=1.0, help="Seconds per stand-in Gemini call.")
+    parser.add_argument("--threads", type=int, default=8, help="gthread threads per worker.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128, 256])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+                   CACHE_DIR=os.path.join(tmpdir, "cache"), BENCH_AI_LATENCY=str(args.latency), DJANGO_DEBUG="False", PYTHONPATH=ROOT)
+        subprocess.run([sys.executable, "manage.py", "migrate", "-v", "0", "--skip-checks"],
+                       cwd=ROOT, check=True, env=env)
+        # DEBUG=False pages link hashed static files from the collectstatic manifest
+        subprocess.run([sys.executable, "manage.py", "collectstatic", "--noinput", "-v", "0"],
+                       cwd=ROOT, check=True, env=env)
+        print(f"stand-in Gemini latency {args.latency:.2f}s, 1 worker process")
+        print(f"{'profile':<24} {'conc':>5} {'req/s':>8} {'held':>7} {'p50 s':>8} {'p95 s':>8} {'errors':>6}")
+        for name, cmd in profiles(args.threads).items():
+            run_profile(name, cmd, args.concurrency, args.latency, env)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_db_writes.py
+"""
+Concurrent Library writes under each database configuration.
+
+Every worker process plays a gunicorn worker: per "request" it runs a
+read-then-write transaction (duplicate check + Optimization save, as the
+optimize POST does) and then releases the connection the way Django's
+request_finished handler does. Each variant gets a fresh throwaway database.
+
+    python benchmarks/bench_db_writes.py [--workers 8] [--requests 150]
+    BENCH_POSTGRES_URL=postgres://…/scratch_db python benchmarks/bench_db_writes.py
+
+The Postgres variants migrate and write into BENCH_POSTGRES_URL: point it at a
+scratch database.
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def variants(tmpdir):
+    sqlite_url = lambda name: f"sqlite:///{os.path.join(tmpdir, name)}"  # noqa: E731
+    out = {
+        # what core/settings.py used to hardcode: rollback journal, DEFERRED, new connection per request
+        "sqlite-default": {"DATABASE_URL": sqlite_url("default.db"), "SQLITE_TUNED": "0", "DB_CONN_MAX_AGE": "0"},
+        "sqlite-tuned": {"DATABASE_URL": sqlite_url("tuned.db"), "SQLITE_TUNED": "1"},
+    }
+    pg = os.environ.get("BENCH_POSTGRES_URL")
+    if pg:
+        out["postgres-per-request"] = {"DATABASE_URL": pg, "DB_CONN_MAX_AGE": "0"}
+        out["postgres-persistent"] = {"DATABASE_URL": pg, "DB_CONN_MAX_AGE": "60"}
+        out["postgres-pool"] = {"DATABASE_URL": pg, "DB_POOL": "1"}
+    return out
+
+
+def worker(args):
+    worker_id, requests = args
+    from benchmarks._setup import setup_django
+    setup_django()
+    from django.db import OperationalError, close_old_connections, transaction
+    from web.models import Optimization
+
+    latencies, errors = [], 0
+    for i in range(requests):
+        t0 = time.perf_counter()
+        try:
+            with transaction.atomic():
+                keyword = f"worker {worker_id} keyword {i % 20}"
+                Optimization.objects.filter(keyword=keyword).exists()
+                Optimization.objects.create(
+                    keyword=keyword, title=f"how to test concurrent writes {worker_id}-{i}",
+                    tags_text="bench,sqlite", entities="bench", score=i % 101,
+                )
+        except OperationalError:
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+        close_old_connections()
+    return latencies, errors
+
+
+def run_variant(name, env, workers, requests):
+    os.environ.update(env)
+    subprocess.run([sys.executable, "manage.py", "migrate", "-v", "0", "--skip-checks"],
+                   cwd=ROOT, check=True, env=os.environ.copy())
+    ctx = multiprocessing.get_context("spawn")
+    t0 = time.perf_counter()
+    with ctx.Pool(workers) as pool:
+        results = pool.map(worker, [(w, requests) for w in range(workers)])
+    elapsed = time.perf_counter() - t0
+    for key in env:
+        os.environ.pop(key, None)
+
+    latencies = sorted(l for lat, _ in results for l in lat)
+    errors = sum(e for _, e in results)
+    done = len(latencies) - errors
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<22} {done / elapsed:>9.0f} {errors:>7} {statistics.median(latencies) * 1000:>8.1f} {p95 * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=150, help="Requests per worker.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"{args.workers} workers x {args.requests} requests")
+        print(f"{'variant':<22} {'writes/s':>9} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, env in variants(tmpdir).items():
+            run_variant(name, env, args.workers, args.requests)
+
+
+if __name__ == "__main__":
+    main()
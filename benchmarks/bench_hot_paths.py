@@ -0,0 +1,276 @@
+# benchmarks/bench_hot_paths.py
+"""
+Offline micro-benchmarks for the service and scoring hot paths, with baselines.
+
+Every case runs on the fixtures in benchmarks/fixtures/ (YouTube Data API v3
+search/videos responses and Gemini replies), so no network or API key is
+needed. Each case is timed as the best of several repeats and compared with
+benchmarks/baselines.json; a case slower than its baseline by more than the
+threshold is a regression and the script exits with status 1.
+
+Baselines come from one machine and shared runners drift during a run, so
+each case's repeats are interleaved with a fixed pure-Python calibration
+workload. The baseline is scaled by how fast that workload ran next to the
+case now compared with when the baseline was recorded (--no-normalize
+compares raw times). A slowdown only counts when it is also more than
+NOISE_FLOOR_US per call, and a flagged case is measured again up to RECHECKS
+times: a regression has to show up in every measurement, a burst of noise
+on the runner does not.
+
+    python benchmarks/bench_hot_paths.py [-k render] [--threshold 0.25]
+    python benchmarks/bench_hot_paths.py --save      # accept current timings as the new baselines
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks._setup import django_test_db  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+BASELINES = os.path.join(ROOT, "benchmarks", "baselines.json")
+KEYWORD = "python tutorial"
+MIN_TIME = 0.1           # seconds per repeat; the loop count is sized to reach it
+REPEAT = 9
+NOISE_FLOOR_US = 2.0     # smaller slowdowns per call are timer/scheduler noise
+RECHECKS = 2             # re-measurements of a flagged case before it is reported
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Recorded:
+    """Stands in for a requests/httpx response; json() decodes the body like the real one."""
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def _run(fn, number) -> float:
+    t0 = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - t0
+
+
+def _loops(fn) -> int:
+    """Calls needed for one repeat to take at least MIN_TIME."""
+    number = 1
+    while True:
+        elapsed = _run(fn, number)
+        if elapsed >= MIN_TIME:
+            return number
+        number *= 2 if elapsed < MIN_TIME / 10 else max(2, int(MIN_TIME / elapsed) + 1)
+
+
+def measure(fn, calibration_loops: int):
+    """(case, calibration) best times over REPEAT interleaved runs, in microseconds per call."""
+    number = _loops(fn)
+    best = calibration = float("inf")
+    for _ in range(REPEAT):
+        best = min(best, _run(fn, number))
+        calibration = min(calibration, _run(_calibration_workload, calibration_loops))
+    return best / number * 1e6, calibration / calibration_loops * 1e6
+
+
+def _calibration_workload():
+    words = [f"word{i % 97}" for i in range(2000)]
+    counts = {}
+    for w in words:
+        counts[w] = counts.get(w, 0) + 1
+    return sorted(counts.items(), key=lambda kv: -kv[1])[:10], sum(i * i for i in range(2000))
+
+
+@contextlib.contextmanager
+def youtube_replay():
+    """search_videos() answered from the recorded search/videos responses."""
+    search, videos = fixture("youtube_search.json"), fixture("youtube_videos.json")
+    by_id = {v["id"]: v for v in videos["items"]}
+    bodies = {}
+
+    def body(key, build):
+        if key not in bodies:
+            bodies[key] = json.dumps(build())
+        return Recorded(bodies[key])
+
+    def get(url, params=None, timeout=None):
+        if url.endswith("/search"):
+            n = params["maxResults"]
+            return body(("search", n), lambda: {**search, "items": search["items"][:n]})
+        ids = params["id"].split(",")
+        return body(("videos", params["id"]), lambda: {**videos, "items": [by_id[i] for i in ids if i in by_id]})
+
+    with override_settings(YOUTUBE_API_KEY="offline"), \
+            mock.patch("web.services.youtube.requests.get", side_effect=get):
+        yield
+
+
+def captured_pages():
+    """Run the Discover and Optimize views once on the fixtures and keep their render() arguments."""
+    from asgiref.sync import async_to_sync
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.contrib.auth.models import AnonymousUser
+    from django.contrib.messages.storage.fallback import FallbackStorage
+    from django.contrib.sessions.backends.cache import SessionStore
+    from web import views
+    from web.services import youtube
+
+    gemini = fixture("gemini.json")
+    pages = {}
+
+    async def capture(request, template_name, context=None):
+        pages[template_name] = (request, context)
+        return HttpResponse()
+
+    async def search_videos(*args, **kwargs):
+        return youtube.search_videos(*args, **kwargs)
+
+    async def ai(prompt):
+        return gemini["optimize"] if "Return ONLY valid JSON" in prompt else gemini["discover"]
+
+    def request(path, params):
+        r = RequestFactory().get(path, params)
+        r.user, r.session = AnonymousUser(), SessionStore()
+        r._messages = FallbackStorage(r)
+        return r
+
+    with mock.patch.object(views, "asearch_videos", side_effect=search_videos), \
+            mock.patch.object(views, "agenerate_content", side_effect=ai), \
+            mock.patch.object(views, "arender", side_effect=capture):
+        async_to_sync(views.discover)(request("/discover/", {"q": KEYWORD, "n": 20}))
+        async_to_sync(views.optimize)(request("/optimize/", {
+            "action": "analyze", "keyword": KEYWORD,
+            "title": "Python Tutorial for Beginners - Learn Python in 2 Hours",
+            "description": "Learn Python step by step: variables, lists, loops, functions and a small project. " * 4,
+            "tags": "python, python tutorial, learn python, programming, coding",
+            "has_custom_thumbnail": "1",
+        }))
+    return pages
+
+
+def cases():
+    """name -> zero-argument callable."""
+    from django.template.loader import render_to_string
+    from web import views
+    from web.services import generation, serp_stats, youtube
+
+    serp = youtube.search_videos(KEYWORD, max_results=20)
+    durations = [v["contentDetails"]["duration"] for v in fixture("youtube_videos.json")["items"]]
+    corpus = [(v["title"] or "") + " " + (v["description"] or "") for v in serp]
+    entities = serp_stats.extract_top_entities(corpus, top_k=10)
+    env = serp_stats.env_stats_from_serp(serp)
+    title = "Python Tutorial for Beginners - Learn Python in 2 Hours"
+    desc = "Learn Python step by step: variables, lists, loops, functions and a small project. " * 4
+    tags = ["python", "python tutorial", "learn python", "programming", "coding"]
+    pages = captured_pages()
+
+    def render(template):
+        request, context = pages[template]
+        assert context.get("error") is None, context["error"]
+        return lambda: render_to_string(template, context, request)
+
+    return {
+        "youtube.search_videos[20]": lambda: youtube.search_videos(KEYWORD, max_results=20),
+        "youtube._iso8601_to_seconds[20]": lambda: [youtube._iso8601_to_seconds(d) for d in durations],
+        "serp_stats.extract_top_entities": lambda: serp_stats.extract_top_entities(corpus, top_k=10),
+        "views.score_holistic_package": lambda: views.score_holistic_package(
+            KEYWORD, title, desc, tags, entities, None, True, False, env_stats=env),
+        "views.score_metadata": lambda: views.score_metadata(
+            title, desc, tags, views.hashtags_from_tags(tags, KEYWORD)),
+        "generation.suggest_titles": lambda: generation.suggest_titles(KEYWORD, entities),
+        "generation.suggest_description": lambda: generation.suggest_description(KEYWORD, entities),
+        "generation.suggest_tags": lambda: generation.suggest_tags(KEYWORD, entities),
+        "render discover.html": render("discover.html"),
+        "render optimize.html": render("optimize.html"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="only", default="", help="Only run cases whose name contains this.")
+    parser.add_argument("--threshold", type=float, default=float(os.environ.get("BENCH_THRESHOLD", 0.25)),
+                        help="Allowed slowdown over baseline, as a fraction (default 0.25, env BENCH_THRESHOLD).")
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--save", action="store_true", help="Write the measured timings as baselines.")
+    parser.add_argument("--no-normalize", action="store_true", help="Compare raw times across machines.")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baseline = json.load(f)
+
+    def compare(name, us, calibration):
+        """(expected us, change, regressed) against the baseline, or None for a new case."""
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            return None
+        expected = base["us"] if args.no_normalize else base["us"] * calibration / base["calibration_us"]
+        change = us / expected - 1
+        return expected, change, change > args.threshold and us - expected > NOISE_FLOOR_US
+
+    # a dummy cache keeps template fragments and cached SERPs from short-circuiting the work
+    with django_test_db(), override_cache(), youtube_replay():
+        calibration_loops = _loops(_calibration_workload)
+        selected = {name: fn for name, fn in cases().items() if args.only in name}
+        results = {name: measure(fn, calibration_loops) for name, fn in selected.items()}
+        if not args.save:
+            for name, fn in selected.items():
+                for _ in range(RECHECKS):
+                    verdict = compare(name, *results[name])
+                    if not verdict or not verdict[2]:
+                        break
+                    again = measure(fn, calibration_loops)
+                    if compare(name, *again)[1] < verdict[1]:
+                        results[name] = again
+
+    print(f"Python {platform.python_version()}, threshold +{args.threshold:.0%} and +{NOISE_FLOOR_US:g} us"
+          f"{', raw times' if args.no_normalize else ''}")
+    print(f"{'case':<34} {'us/op':>10} {'baseline':>10} {'change':>8}")
+    regressions = []
+    for name, (us, calibration) in results.items():
+        verdict = compare(name, us, calibration)
+        if verdict is None:
+            print(f"{name:<34} {us:>10.1f} {'-':>10} {'new':>8}")
+            continue
+        expected, change, regressed = verdict
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<34} {us:>10.1f} {expected:>10.1f} {change:>+8.0%}{flag}")
+        if flag:
+            regressions.append(name)
+
+    if args.save:
+        measured = {name: {"us": round(us, 2), "calibration_us": round(cal, 2)} for name, (us, cal) in results.items()}
+        with open(args.baselines, "w") as f:
+            json.dump({"python": platform.python_version(),
+                       "cases": {**baseline.get("cases", {}), **measured} if args.only else measured}, f, indent=2)
+            f.write("\n")
+        print(f"saved {len(results)} baselines to {os.path.relpath(args.baselines, ROOT)}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+@contextlib.contextmanager
+def override_cache():
+    with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}):
+        yield
+
+
+if __name__ == "__main__":
+    main()
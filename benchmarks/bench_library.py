@@ -0,0 +1,77 @@
+# benchmarks/bench_library.py
+"""
+Library pagination: OFFSET Paginator vs keyset cursor at increasing depth.
+
+    python benchmarks/bench_library.py [--rows 1000000] [--page-size 10]
+"""
+import argparse
+import os
+import sys
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._setup import django_test_db, timed  # noqa: E402
+
+
+def seed(rows: int):
+    from django.db import connection, transaction
+    from django.utils import timezone
+    from web.models import Optimization
+
+    table = Optimization._meta.db_table
+    start = timezone.now() - timedelta(seconds=rows)
+    sql = (
+        f"INSERT INTO {table} (keyword, title, description, tags_text, has_custom_thumbnail, "
+        f"in_playlists, score, entities, created_at) VALUES (%s, %s, '', '', 0, 0, %s, '', %s)"
+    )
+    batch = 20_000
+    with transaction.atomic(), connection.cursor() as cur:
+        for lo in range(0, rows, batch):
+            cur.executemany(sql, [
+                # every third pair shares a timestamp so the id tie-breaker is exercised
+                (f"keyword {i % 5000}", f"title {i}", i % 101, start + timedelta(seconds=i - i % 3))
+                for i in range(lo, min(rows, lo + batch))
+            ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+
+    with django_test_db():
+        from django.core.cache import cache
+        from django.core.paginator import Paginator
+        from web.models import Optimization
+        from web.services import library
+
+        print(f"seeding {args.rows:,} rows ...", flush=True)
+        seed(args.rows)
+        cache.clear()
+
+        size = args.page_size
+        qs = Optimization.objects.order_by("-created_at")
+        print(f"{'page':>8} {'offset ms':>10} {'keyset ms':>10}")
+        for number in (1, 10, 1_000, 10_000, args.rows // size):
+            def offset_page():
+                list(Paginator(qs, size).page(number).object_list)
+
+            # cursor of the row just before the requested page, as the previous page would hand out
+            anchor = (Optimization.objects.order_by("-created_at", "-id")[(number - 1) * size - 1]
+                      if number > 1 else None)
+            after = library.encode_cursor(anchor) if anchor else None
+
+            def keyset():
+                list(library.keyset_page(after=after, size=size).object_list)
+
+            print(f"{number:>8,} {timed(offset_page):>10.2f} {timed(keyset):>10.2f}")
+
+        cache.clear()
+        print(f"count: COUNT(*) {timed(Optimization.objects.count, repeat=3):.2f} ms, "
+              f"approx_total cached {timed(library.approx_total):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+# benchmarks/bench_load.py
+"""
+End-to-end load test: the real app against local YouTube/Gemini stand-ins.
+
+Starts benchmarks/_standins.py and then each server configuration in turn,
+every one on a fresh copy of a seeded SQLite database. Virtual users each
+keep their own cookies and loop over a weighted mix of requests:
+Discover searches, Optimize analyses (YouTube + Gemini), Library pages and
+saves (POST). Keywords follow a Zipf-like popularity curve, so the SERP
+cache sees a realistic mix of hits and misses. The report gives
+throughput, p50/p95/p99 latency and the error rate per request type.
+
+    python benchmarks/bench_load.py [--servers gunicorn:2x8 uvicorn:2] [--users 32] [--duration 30]
+        [--mix discover=40,optimize=25,library=25,save=10]
+        [--youtube-latency lognormal:150:0.4] [--gemini-latency lognormal:2500:0.35]
+        [--youtube-errors 0] [--gemini-errors 0]
+
+Server specs: gunicorn:WxT (gthread, W workers x T threads), uvicorn:W.
+The load generator runs on the same machine, so leave it CPU to spare.
+"""
+import argparse
+import asyncio
+import html
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_asgi import free_port  # noqa: E402
+
+KEYWORDS = [
+    "python tutorial", "learn python", "python for beginners", "django tutorial", "flask tutorial",
+    "python projects", "pandas tutorial", "numpy tutorial", "python async", "python decorators",
+    "web scraping python", "python oop", "python interview questions", "fastapi tutorial",
+    "python automation", "python list comprehension", "python data analysis", "python machine learning",
+    "python tkinter", "python pygame", "python virtual environment", "python type hints",
+    "python testing pytest", "python regex", "python file handling", "python json",
+    "python classes", "python functions", "python loops", "python dictionaries",
+]
+SEED_ROWS = 2000
+# the views turn upstream failures into a message on a 200 page; those count as errors
+FAILURE_MARKERS = ("Unexpected error", "AI error", "Search error", "Videos error")
+
+
+# ---------------- setup ----------------
+
+def server_command(spec: str, port: int):
+    kind, _, size = spec.partition(":")
+    if kind == "gunicorn":
+        workers, _, threads = (size or "2x8").partition("x")
+        return [sys.executable, "-m", "gunicorn", "core.wsgi:application", "--workers", workers,
+                "--worker-class", "gthread", "--threads", threads or "1", "--bind", f"127.0.0.1:{port}",
+                "--backlog", "2048", "--timeout", "120", "--graceful-timeout", "5", "--log-level", "warning"]
+    if kind == "uvicorn":
+        return [sys.executable, "-m", "uvicorn", "core.asgi:application", "--workers", size or "1",
+                "--host", "127.0.0.1", "--port", str(port), "--backlog", "2048", "--log-level", "warning"]
+    raise ValueError(f"Unknown server spec {spec!r} (gunicorn:WxT or uvicorn:W)")
+
+
+def seed_file(path: str, rows: int):
+    rng = random.Random(45)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            kw = rng.choice(KEYWORDS)
+            f.write(json.dumps({
+                "keyword": kw, "title": f"{kw.title()} - part {i}", "description": f"All about {kw}. " * 10,
+                "tags_text": ", ".join(rng.sample(KEYWORDS, 5)), "entities": "python, tutorial",
+                "score": rng.randint(20, 95), "has_custom_thumbnail": rng.random() < 0.5,
+                "in_playlists": rng.random() < 0.3, "created_at": "",
+            }) + "\n")
+
+
+def prepare(tmpdir: str, env: dict) -> str:
+    """Migrate and seed a template database; collect static files for DEBUG=False."""
+    db = os.path.join(tmpdir, "template.db")
+    env = dict(env, DATABASE_URL=f"sqlite:///{db}")
+    manage = [sys.executable, "manage.py"]
+    subprocess.run(manage + ["migrate", "-v", "0", "--skip-checks"], cwd=ROOT, check=True, env=env)
+    rows = os.path.join(tmpdir, "seed.jsonl")
+    seed_file(rows, SEED_ROWS)
+    subprocess.run(manage + ["import_library", rows], cwd=ROOT, check=True, env=env, stdout=subprocess.DEVNULL)
+    subprocess.run(manage + ["collectstatic", "--noinput", "-v", "0"], cwd=ROOT, check=True, env=env)
+    return db
+
+
+async def wait_ready(url, proc, timeout=60):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{' '.join(proc.args[:4])} exited during start-up")
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+# ---------------- load ----------------
+
+def _analyze(kw):
+    return {"action": "analyze", "keyword": kw, "title": f"{kw.title()} for Beginners (Full Guide)",
+            "description": f"Everything you need to know about {kw}, step by step. " * 5,
+            "tags": f"{kw}, {kw} tutorial, programming, coding"}
+
+
+def _failure(r, expected=200):
+    """None for a good response, else a short reason."""
+    if r.status_code != expected:
+        return f"HTTP {r.status_code}"
+    for marker in FAILURE_MARKERS:
+        at = r.text.find(marker)
+        if at >= 0:
+            text = html.unescape(re.sub(r"<[^>]+>", " ", r.text[at:at + 300]))
+            return " ".join(text.split())[:90]
+    return None
+
+
+async def do_discover(client, kw, rng):
+    return _failure(await client.get("/discover/", params={"q": kw}))
+
+
+async def do_optimize(client, kw, rng):
+    return _failure(await client.get("/optimize/", params=_analyze(kw)))
+
+
+async def do_library(client, kw, rng):
+    params = {"min_score": rng.choice([50, 70])} if rng.random() < 0.3 else {}
+    return _failure(await client.get("/library/", params=params))
+
+
+async def do_save(client, kw, rng):
+    form = {**_analyze(kw), "score": rng.randint(30, 95), "entities": "python, tutorial",
+            "csrfmiddlewaretoken": client.cookies.get("csrftoken", "")}
+    r = await client.post("/optimize/", data=form, headers={"Referer": f"{client.base_url}optimize/"})
+    return _failure(r, expected=302)
+
+
+ACTIONS = {"discover": do_discover, "optimize": do_optimize, "library": do_library, "save": do_save}
+
+
+async def virtual_user(base, mix, seed, start_at, stop_at, results):
+    rng = random.Random(seed)
+    names, weights = zip(*mix.items())
+    kw_weights = [1 / (i + 1) for i in range(len(KEYWORDS))]
+    async with httpx.AsyncClient(base_url=base, timeout=120) as client:
+        await client.get("/optimize/")                          # CSRF cookie
+        while time.monotonic() < stop_at:
+            name = rng.choices(names, weights)[0]
+            kw = rng.choices(KEYWORDS, kw_weights)[0]
+            t0 = time.monotonic()
+            try:
+                failure = await ACTIONS[name](client, kw, rng)
+            except httpx.HTTPError as e:
+                failure = type(e).__name__
+            if t0 >= start_at:
+                results[name].append((time.monotonic() - t0, failure))
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))] if sorted_values else 0.0
+
+
+async def drive(base, users, mix, warmup, duration):
+    results = defaultdict(list)
+    start_at = time.monotonic() + warmup
+    stop_at = start_at + duration
+    await asyncio.gather(*(virtual_user(base, mix, seed, start_at, stop_at, results) for seed in range(users)))
+    return results
+
+
+def report(spec, results, duration):
+    total = sum(len(r) for r in results.values())
+    failures = Counter(f for r in results.values() for _, f in r if f)
+    errors = sum(failures.values())
+    print(f"\n{spec}: {total / duration:.1f} req/s, {errors / total if total else 0:.1%} errors")
+    print(f"  {'request':<10} {'count':>6} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name in ACTIONS:
+        rows = results.get(name, [])
+        if not rows:
+            continue
+        lat = sorted(l * 1000 for l, _ in rows)
+        failed = sum(1 for _, f in rows if f)
+        print(f"  {name:<10} {len(rows):>6} {len(rows) / duration:>7.1f} {statistics.median(lat):>8.0f} "
+              f"{percentile(lat, 0.95):>8.0f} {percentile(lat, 0.99):>8.0f} {failed / len(rows):>7.1%}")
+    for reason, n in failures.most_common(5):
+        print(f"  {n:>6} x {reason}")
+
+
+def stop(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--servers", nargs="+", default=["gunicorn:2x8", "uvicorn:2"])
+    parser.add_argument("--users", type=int, default=32, help="Concurrent virtual users.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds per server.")
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--mix", default="discover=40,optimize=25,library=25,save=10")
+    parser.add_argument("--youtube-latency", default="lognormal:150:0.4")
+    parser.add_argument("--gemini-latency", default="lognormal:2500:0.35")
+    parser.add_argument("--youtube-errors", type=float, default=0.0)
+    parser.add_argument("--gemini-errors", type=float, default=0.0)
+    args = parser.parse_args()
+    mix = {name: float(weight) for name, weight in (part.split("=") for part in args.mix.split(","))}
+    unknown = set(mix) - set(ACTIONS)
+    if unknown:
+        parser.error(f"unknown request types in --mix: {', '.join(sorted(unknown))}")
+
+    standin_port = free_port()
+    standin = f"http://127.0.0.1:{standin_port}"
+    env = dict(
+        os.environ, PYTHONPATH=ROOT, DJANGO_DEBUG="False",
+        YOUTUBE_API_KEY="standin", GOOGLE_API_KEY="standin",
+        YOUTUBE_API_BASE_URL=f"{standin}/youtube/v3", GEMINI_BASE_URL=standin,
+        STANDIN_YOUTUBE_LATENCY=args.youtube_latency, STANDIN_GEMINI_LATENCY=args.gemini_latency,
+        STANDIN_YOUTUBE_ERRORS=str(args.youtube_errors), STANDIN_GEMINI_ERRORS=str(args.gemini_errors),
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        template = prepare(tmpdir, env)
+        standins = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "benchmarks._standins:app", "--host", "127.0.0.1",
+             "--port", str(standin_port), "--backlog", "2048", "--log-level", "warning"], cwd=ROOT, env=env)
+        try:
+            asyncio.run(wait_ready(f"{standin}/ready", standins))
+            print(f"{args.users} users, {args.duration:.0f}s per server after {args.warmup:.0f}s warm-up; "
+                  f"YouTube {args.youtube_latency}, Gemini {args.gemini_latency} (ms); mix {args.mix}")
+            for spec in args.servers:
+                db = os.path.join(tmpdir, "run.db")
+                shutil.copy(template, db)
+                port = free_port()
+                cache_dir = tempfile.mkdtemp(dir=tmpdir)          # every server starts cold
+                server = subprocess.Popen(server_command(spec, port), cwd=ROOT,
+                                          env=dict(env, DATABASE_URL=f"sqlite:///{db}", CACHE_DIR=cache_dir))
+                try:
+                    base = f"http://127.0.0.1:{port}"
+                    asyncio.run(wait_ready(f"{base}/", server))
+                    results = asyncio.run(drive(base, args.users, mix, args.warmup, args.duration))
+                    report(spec, results, args.duration)
+                finally:
+                    stop(server)
+        finally:
+            stop(standins)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_page_weight.py
+"""
+HTML weight and modelled time-to-first-render for each page.
+
+Renders every GET page through the test client and reports the HTML size
+(raw and gzipped) plus the render-blocking stylesheets it links from
+/static/. First render is modelled, not measured: measuring it needs a
+headless browser, which is not a dependency of this project, so the times
+are for comparing pages and changes, not real paint times. The model: the
+HTML arrives over a
+connection whose congestion window starts at 10 segments and doubles per
+round trip, then the blocking stylesheets load in parallel and share the
+downlink. Our own stylesheets reuse the warm connection (one round trip);
+the Bootstrap CDN stylesheets need a new connection (DNS + TCP + TLS) and
+are counted at --cdn-css-kb gzipped. On a repeat visit hashed static files
+and the versioned CDN files come from the browser cache, so only the HTML
+is fetched.
+
+    python benchmarks/bench_page_weight.py [--rtt-ms 150] [--mbps 1.6] [--cdn-css-kb 45]
+"""
+import argparse
+import gzip
+import math
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._setup import django_test_db  # noqa: E402
+
+PAGES = ("home", "optimize", "discover", "ai_generator", "tag_finder", "hashtag_finder", "library")
+SEGMENT = 1460
+INITIAL_WINDOW = 10
+CDN_SETUP_RTTS = 3
+STYLESHEET_RE = re.compile(r'<link(?=[^>]*rel="stylesheet")[^>]*href="([^"]+)"')
+
+
+def gz(data: bytes) -> int:
+    return len(gzip.compress(data, 6))
+
+
+def round_trips(size: int) -> int:
+    """Round trips to deliver `size` bytes on a fresh connection (slow start)."""
+    rounds, segments, window = 1, math.ceil(size / SEGMENT), INITIAL_WINDOW
+    while segments > window:
+        segments -= window
+        window *= 2
+        rounds += 1
+    return rounds
+
+
+def static_size(url: str) -> int:
+    from django.conf import settings
+    from django.contrib.staticfiles import finders
+
+    prefix = "/" + settings.STATIC_URL.lstrip("/")
+    if not url.startswith(prefix):
+        return 0                            # CDN
+    path = finders.find(url[len(prefix):])
+    if not path:
+        return 0
+    with open(path, "rb") as f:
+        return gz(f.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=150.0)
+    parser.add_argument("--mbps", type=float, default=1.6, help="Downlink, megabits per second.")
+    parser.add_argument("--cdn-css-kb", type=float, default=45.0,
+                        help="Gzipped Bootstrap + Bootstrap Icons CSS (~31 + ~14 KB for the pinned versions).")
+    args = parser.parse_args()
+    rtt, bytes_per_ms = args.rtt_ms, args.mbps * 1000 / 8
+    cdn = int(args.cdn_css_kb * 1024)
+
+    with django_test_db():
+        from django.test import Client
+        from django.urls import reverse
+
+        client = Client()
+        print(f"RTT {rtt:.0f} ms, {args.mbps} Mbps; times are modelled critical path")
+        print(f"{'page':<16} {'html B':>8} {'html gz':>8} {'css gz':>8} {'first ms':>9} {'repeat ms':>10}")
+        for name in PAGES:
+            response = client.get(reverse(name))
+            html = response.content
+            html_gz = gz(html)
+            css = [static_size(url) for url in STYLESHEET_RE.findall(html.decode())]
+            css = [size for size in css if size]
+            html_ms = round_trips(html_gz) * rtt + html_gz / bytes_per_ms
+            # blocking stylesheets load in parallel: the slowest handshake wins, the bytes add up
+            waits = [(CDN_SETUP_RTTS + round_trips(cdn)) * rtt] + [rtt for _ in css]
+            first = html_ms + max(waits) + (cdn + sum(css)) / bytes_per_ms
+            repeat = html_ms
+            print(f"{name:<16} {len(html):>8,} {html_gz:>8,} {sum(css):>8,} {first:>9.0f} {repeat:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_search.py
+"""
+Library full-text search vs icontains scan on a seeded Library.
+
+    python benchmarks/bench_search.py [--rows 1000000]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._setup import django_test_db, timed  # noqa: E402
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "tu", "sha", "vo", "qi", "ne", "dar", "po", "lim", "ser", "gu", "fen"]
+
+
+def vocabulary(size=20_000, seed=7):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def seed(rows: int, words):
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    rng = random.Random(11)
+    # Zipf-ish: low indexes are common words, the tail is rare
+    cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(words))))
+
+    def text(n):
+        return " ".join(rng.choices(words, cum_weights=cum_weights, k=n))
+
+    now = timezone.now()
+    sql = ("INSERT INTO web_optimization (keyword, title, description, tags_text, has_custom_thumbnail, "
+           "in_playlists, score, entities, created_at) VALUES (%s, %s, %s, '', 0, 0, %s, '', %s)")
+    t0 = time.perf_counter()
+    with transaction.atomic(), connection.cursor() as cur:
+        for lo in range(0, rows, 20_000):
+            cur.executemany(sql, [(text(2), text(7), text(30), rng.randint(0, 100), now)
+                                  for _ in range(min(20_000, rows - lo))])
+    return rows / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with django_test_db():
+        from django.db.models import Q
+        from web.models import Optimization
+        from web.services import search
+
+        words = vocabulary()
+        print(f"seeding {args.rows:,} rows (FTS triggers on) ...", flush=True)
+        rate = seed(args.rows, words)
+        print(f"insert rate with index upkeep: {rate:,.0f} rows/s")
+
+        cases = [
+            ("common word", words[0], 1),
+            ("common word, page 50", words[0], 50),
+            ("mid word", words[500], 1),
+            ("rare word", words[-1], 1),
+            ("no match", "zzzz", 1),
+            ("two words", f"{words[3]} {words[40]}", 1),
+            ("prefix", words[200][:4] + "*", 1),
+        ]
+        print(f"{'query':<22} {'hits':>6} {'fts ms':>8} {'icontains ms':>13}")
+        for label, q, number in cases:
+            page = search.search_page(q, number=number)
+            fts = timed(lambda: search.search_page(q, number=number), repeat=3)
+
+            def scan():
+                qs = Optimization.objects.all()
+                for t in q.replace("*", "").split():
+                    qs = qs.filter(Q(keyword__icontains=t) | Q(title__icontains=t) | Q(description__icontains=t))
+                list(qs.order_by("-created_at")[(number - 1) * 10:number * 10])
+
+            like = timed(scan, repeat=1)
+            print(f"{label:<22} {page.total:>6} {fts:>8.2f} {like:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,5 +12,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Every request's sync work (ORM, template render) runs on its own short-lived
+# thread under ASGI, so persistent connections would pile up rather than be
+# reused: Postgres gets a per-process psycopg pool instead (DB_POOL=False opts
+# out) and SQLite opens its cheap file connection per request.
+os.environ.setdefault('DB_POOL', 'True')
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,72 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from web.services import metrics
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can also run in an async middleware chain. The stock
+    middleware is sync-only, so under ASGI Django would wrap every request in a
+    thread that stays blocked while an async view awaits its outbound calls.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class ServerTimingMiddleware:
+    """
+    Times each request: adds a Server-Timing header with the phases recorded
+    through web.services.metrics.span() (YouTube, Gemini, scoring, render, ...)
+    and feeds the per-view latency/status counters exposed at /metrics.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token, started = metrics.begin_request(), time.perf_counter()
+        response = self.get_response(request)
+        return self._finish(request, response, token, started)
+
+    async def __acall__(self, request):
+        token, started = metrics.begin_request(), time.perf_counter()
+        response = await self.get_response(request)
+        return self._finish(request, response, token, started)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        metrics.set_view(match.url_name or match.view_name if match else metrics.UNMATCHED)
+
+    def _finish(self, request, response, token, started):
+        total = time.perf_counter() - started
+        spans = metrics.end_request(token, request.method, response.status_code, total)
+        response["Server-Timing"] = metrics.server_timing(spans, total)
+        return response
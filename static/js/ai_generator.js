@@ -0,0 +1,37 @@
+// Form submission loading state
+document.getElementById('aiGenForm').addEventListener('submit', function(e) {
+  const btn = this.querySelector('button[type="submit"]');
+  btn.disabled = true;
+  btn.innerHTML = '<span class="spinner-border spinner-border-sm me-2"></span>Generating...';
+
+  // Show loading overlay from base.html if available
+  if (typeof window.showLoading === 'function') {
+    window.showLoading();
+  }
+});
+
+// Copy to clipboard function
+function copyToClipboard() {
+  const text = document.querySelector('.ai-response-text').textContent;
+  navigator.clipboard.writeText(text).then(() => {
+    const btn = document.querySelector('.copy-btn');
+    const originalHTML = btn.innerHTML;
+    btn.innerHTML = '<i class="bi bi-check-circle"></i>Copied!';
+    btn.style.background = '#10b981';
+
+    setTimeout(() => {
+      btn.innerHTML = originalHTML;
+      btn.style.background = '';
+    }, 2000);
+
+    // Show toast notification if available
+    if (typeof window.showToast === 'function') {
+      window.showToast('Copied to clipboard!', 'success');
+    }
+  }).catch(err => {
+    console.error('Copy failed:', err);
+    if (typeof window.showToast === 'function') {
+      window.showToast('Failed to copy. Please try again.', 'error');
+    }
+  });
+}
@@ -0,0 +1,109 @@
+(function () {
+  const STORAGE_KEY = "ytbseo-theme";
+  const body = document.body;
+  const icon = document.getElementById("themeIcon");
+  const btn = document.getElementById("themeToggleBtn");
+
+  function applyTheme(theme) {
+    body.classList.remove("theme-dark", "theme-light");
+    body.classList.add("theme-" + theme);
+    if (theme === "dark") {
+      if (btn) btn.classList.remove("btn-outline-dark");
+      if (btn) btn.classList.add("btn-outline-light");
+      if (icon) icon.className = "bi bi-moon-stars";
+    } else {
+      if (btn) btn.classList.remove("btn-outline-light");
+      if (btn) btn.classList.add("btn-outline-dark");
+      if (icon) icon.className = "bi bi-sun";
+    }
+  }
+
+  let current = localStorage.getItem(STORAGE_KEY) || "dark";
+  applyTheme(current);
+
+  window.toggleTheme = function () {
+    current = current === "dark" ? "light" : "dark";
+    localStorage.setItem(STORAGE_KEY, current);
+    applyTheme(current);
+    showToast(`Switched to ${current} mode`);
+  };
+
+  // Toast notification
+  window.showToast = function(message, type = 'success') {
+    const container = document.getElementById('toastContainer');
+    const toast = document.createElement('div');
+    toast.className = 'custom-toast p-3 mb-2';
+    toast.innerHTML = `
+      <div class="d-flex align-items-center gap-2">
+        <i class="bi bi-${type === 'success' ? 'check-circle-fill' : 'info-circle-fill'}" style="color:var(--accent)"></i>
+        <span>${message}</span>
+      </div>
+    `;
+    container.appendChild(toast);
+    setTimeout(() => {
+      toast.style.animation = 'slideInRight 0.3s ease-out reverse';
+      setTimeout(() => toast.remove(), 300);
+    }, 3000);
+  };
+
+  // Scroll to top functionality
+  const scrollTopBtn = document.getElementById('scrollTopBtn');
+  window.addEventListener('scroll', function() {
+    if (window.scrollY > 300) {
+      scrollTopBtn.classList.add('show');
+    } else {
+      scrollTopBtn.classList.remove('show');
+    }
+  });
+
+  window.scrollToTop = function() {
+    window.scrollTo({ top: 0, behavior: 'smooth' });
+  };
+
+  // Show loading on form submissions
+  document.querySelectorAll('form').forEach(form => {
+    form.addEventListener('submit', function() {
+      document.getElementById('loadingOverlay').classList.add('active');
+    });
+  });
+
+  // Auto-hide loading after page load
+  window.addEventListener('load', function() {
+    document.getElementById('loadingOverlay').classList.remove('active');
+  });
+
+  // Keyword autocomplete for inputs with data-autocomplete="<endpoint>"
+  document.querySelectorAll('input[data-autocomplete]').forEach((input, idx) => {
+    const list = document.createElement('datalist');
+    list.id = 'autocomplete-list-' + idx;
+    input.after(list);
+    input.setAttribute('list', list.id);
+
+    let timer = null;
+    input.addEventListener('input', function() {
+      clearTimeout(timer);
+      const prefix = input.value.trim();
+      if (prefix.length < 2) return;
+      timer = setTimeout(function() {
+        fetch(input.dataset.autocomplete + '?q=' + encodeURIComponent(prefix))
+          .then(r => r.ok ? r.json() : { suggestions: [] })
+          .then(data => {
+            list.replaceChildren(...data.suggestions.map(s => {
+              const opt = document.createElement('option');
+              opt.value = s;
+              return opt;
+            }));
+          })
+          .catch(() => {});
+      }, 150);
+    });
+  });
+
+  // Highlight active nav link based on current URL
+  const currentPath = window.location.pathname;
+  document.querySelectorAll('.nav-link').forEach(link => {
+    if (link.getAttribute('href') === currentPath) {
+      link.classList.add('active');
+    }
+  });
+})();
@@ -0,0 +1,62 @@
+// Count and display hashtags
+document.addEventListener('DOMContentLoaded', function() {
+  const source = document.getElementById('hashtagsText');
+  if (!source) return;              // no results rendered yet
+  const hashtagsText = source.textContent.trim();
+  const hashtagsArray = hashtagsText.split(/\s+/).filter(tag => tag.startsWith('#') && tag.length > 1);
+
+  // Update count
+  document.getElementById('hashtagCount').textContent = hashtagsArray.length;
+
+  // Create visual chips
+  const visualGrid = document.getElementById('hashtagVisualGrid');
+  hashtagsArray.forEach(hashtag => {
+    const chip = document.createElement('div');
+    chip.className = 'hashtag-chip';
+    chip.innerHTML = `<i class="bi bi-hash"></i>${hashtag.substring(1)}`;
+    chip.onclick = function() {
+      navigator.clipboard.writeText(hashtag).then(() => {
+        if (typeof window.showToast === 'function') {
+          window.showToast(`${hashtag} copied!`, 'success');
+        }
+      });
+    };
+    visualGrid.appendChild(chip);
+  });
+});
+
+// Form submission loading state
+document.getElementById('hashtagFinderForm').addEventListener('submit', function(e) {
+  const btn = this.querySelector('button[type="submit"]');
+  btn.disabled = true;
+  btn.innerHTML = '<span class="spinner-border spinner-border-sm me-2"></span>Generating...';
+
+  if (typeof window.showLoading === 'function') {
+    window.showLoading();
+  }
+});
+
+// Copy hashtags function
+function copyHashtags() {
+  const text = document.getElementById('hashtagsText').textContent;
+  navigator.clipboard.writeText(text).then(() => {
+    const btn = event.target.closest('.copy-btn');
+    const originalHTML = btn.innerHTML;
+    btn.innerHTML = '<i class="bi bi-check-circle-fill"></i>Copied!';
+    btn.style.background = '#10b981';
+
+    setTimeout(() => {
+      btn.innerHTML = originalHTML;
+      btn.style.background = '';
+    }, 2000);
+
+    if (typeof window.showToast === 'function') {
+      window.showToast('Hashtags copied to clipboard!', 'success');
+    }
+  }).catch(err => {
+    console.error('Copy failed:', err);
+    if (typeof window.showToast === 'function') {
+      window.showToast('Failed to copy. Please try again.', 'error');
+    }
+  });
+}
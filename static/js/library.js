@@ -0,0 +1,21 @@
+// per-request values come from the <script> tag's data attributes
+const libraryConfig = document.currentScript.dataset;
+
+function viewDetails(id) {
+  // Placeholder - implement view details functionality
+  console.log('View item:', id);
+  alert('View details feature coming soon!');
+}
+
+// the track forms live in a shared cached fragment; each visitor's token is added here
+document.querySelectorAll(".track-form").forEach(function (form) {
+  const input = document.createElement("input");
+  input.type = "hidden";
+  input.name = "csrfmiddlewaretoken";
+  input.value = libraryConfig.csrfToken;
+  form.appendChild(input);
+});
+
+function exportItem(id) {
+  window.location = libraryConfig.exportUrl + "?format=jsonl&id=" + id;
+}
@@ -0,0 +1,110 @@
+(function() {
+  'use strict';
+
+  // Character counter function
+  function updateCounter(input) {
+    const counterName = input.getAttribute('data-counter');
+    const maxLength = parseInt(input.getAttribute('data-max'), 10);
+    const counter = document.getElementById(counterName + 'Counter');
+
+    if (!counter) return;
+
+    const length = input.value.length;
+    counter.textContent = length + '/' + maxLength;
+
+    if (length > maxLength * 0.9) {
+      counter.style.color = '#ef4444';
+    } else {
+      counter.style.color = 'var(--sub)';
+    }
+  }
+
+  // Use suggestion function
+  function useSuggestion(button) {
+    const form = document.getElementById('optimizeForm');
+    if (!form) return;
+
+    const type = button.getAttribute('data-type');
+    const value = button.getAttribute('data-value');
+
+    const fieldMap = {
+      'title': form.elements['title'],
+      'description': form.elements['description'],
+      'tags': form.elements['tags']
+    };
+
+    const field = fieldMap[type];
+    if (!field) return;
+
+    field.value = value;
+    updateCounter(field);
+    scheduleLiveScore();
+
+    // Scroll to form
+    form.scrollIntoView({ behavior: 'smooth', block: 'start' });
+
+    // Visual feedback
+    field.style.borderColor = 'var(--accent)';
+    field.style.boxShadow = '0 0 0 3px rgba(255,122,0,0.2)';
+
+    setTimeout(function() {
+      field.style.borderColor = '';
+      field.style.boxShadow = '';
+    }, 1500);
+  }
+
+  // Live score: debounced re-score using cached keyword context (no AI)
+  let liveTimer = null;
+  function refreshLiveScore() {
+    const form = document.getElementById('optimizeForm');
+    const badge = document.getElementById('liveScore');
+    if (!form || !badge) return;
+
+    const body = new FormData(form);
+    body.delete('action');
+    fetch(badge.getAttribute('data-url'), {
+      method: 'POST',
+      headers: { 'X-CSRFToken': badge.getAttribute('data-csrf') },
+      body: body
+    })
+      .then(function(r) { return r.ok ? r.json() : null; })
+      .then(function(data) {
+        if (!data) return;
+        document.getElementById('liveScoreValue').textContent =
+          data.score + '/100' + (data.context_cached ? '' : ' (analyze for SERP context)');
+      })
+      .catch(function() {});
+  }
+
+  function scheduleLiveScore() {
+    clearTimeout(liveTimer);
+    liveTimer = setTimeout(refreshLiveScore, 300);
+  }
+
+  // Initialize on page load
+  document.addEventListener('DOMContentLoaded', function() {
+    const optimizeForm = document.getElementById('optimizeForm');
+    if (optimizeForm) {
+      optimizeForm.addEventListener('input', scheduleLiveScore);
+      optimizeForm.addEventListener('change', scheduleLiveScore);
+      refreshLiveScore();
+    }
+
+    // Initialize counters
+    const inputs = document.querySelectorAll('[data-counter]');
+    inputs.forEach(function(input) {
+      updateCounter(input);
+      input.addEventListener('input', function() {
+        updateCounter(this);
+      });
+    });
+
+    // Add click handlers to use buttons
+    const useButtons = document.querySelectorAll('.use-btn');
+    useButtons.forEach(function(button) {
+      button.addEventListener('click', function() {
+        useSuggestion(this);
+      });
+    });
+  });
+})();
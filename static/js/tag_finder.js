@@ -0,0 +1,55 @@
+// Count and display tags
+document.addEventListener('DOMContentLoaded', function() {
+  const source = document.getElementById('tagsText');
+  if (!source) return;              // no results rendered yet
+  const tagsText = source.textContent.trim();
+  const tagsArray = tagsText.split(',').map(tag => tag.trim()).filter(tag => tag.length > 0);
+
+  // Update count
+  document.getElementById('tagCount').textContent = tagsArray.length;
+
+  // Create visual chips
+  const visualList = document.getElementById('tagVisualList');
+  tagsArray.forEach(tag => {
+    const chip = document.createElement('div');
+    chip.className = 'tag-chip';
+    chip.innerHTML = `<i class="bi bi-tag-fill"></i>${tag}`;
+    visualList.appendChild(chip);
+  });
+});
+
+// Form submission loading state
+document.getElementById('tagFinderForm').addEventListener('submit', function(e) {
+  const btn = this.querySelector('button[type="submit"]');
+  btn.disabled = true;
+  btn.innerHTML = '<span class="spinner-border spinner-border-sm me-2"></span>Generating...';
+
+  if (typeof window.showLoading === 'function') {
+    window.showLoading();
+  }
+});
+
+// Copy tags function
+function copyTags() {
+  const text = document.getElementById('tagsText').textContent;
+  navigator.clipboard.writeText(text).then(() => {
+    const btn = event.target.closest('.copy-btn');
+    const originalHTML = btn.innerHTML;
+    btn.innerHTML = '<i class="bi bi-check-circle-fill"></i>Copied!';
+    btn.style.background = '#10b981';
+
+    setTimeout(() => {
+      btn.innerHTML = originalHTML;
+      btn.style.background = '';
+    }, 2000);
+
+    if (typeof window.showToast === 'function') {
+      window.showToast('Tags copied to clipboard!', 'success');
+    }
+  }).catch(err => {
+    console.error('Copy failed:', err);
+    if (typeof window.showToast === 'function') {
+      window.showToast('Failed to copy. Please try again.', 'error');
+    }
+  });
+}
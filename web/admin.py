@@ -1,8 +1,24 @@
 from django.contrib import admin
-from .models import Optimization
+from .models import Optimization, KeywordStats, ResearchJob
 
 @admin.register(Optimization)
 class OptimizationAdmin(admin.ModelAdmin):
     list_display = ("keyword", "score", "created_at")
     search_fields = ("keyword", "title", "tags_text")
     list_filter = ("created_at",)
+    exclude = ("tags", "mentions")   # derived from tags_text / entities on save
+
+
+@admin.register(KeywordStats)
+class KeywordStatsAdmin(admin.ModelAdmin):
+    list_display = ("keyword", "region", "difficulty1", "difficulty5", "median_views", "fetched_at")
+    search_fields = ("keyword",)
+    list_filter = ("region",)
+    readonly_fields = ("created_at",)
+
+
+@admin.register(ResearchJob)
+class ResearchJobAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "status", "region", "units_used", "created_at")
+    list_filter = ("status",)
+    readonly_fields = ("created_at", "updated_at")
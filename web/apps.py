@@ -1,6 +1,25 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def enable_sqlite_wal(using, **kwargs):
+    """
+    Put a file-backed SQLite database in WAL mode after `migrate`. The journal
+    mode is stored in the file, so it is set once here instead of by every
+    connection (which would rewrite the file on a plain `manage.py check`).
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite" or connection.is_in_memory_db() or not getattr(settings, "SQLITE_TUNED", False):
+        return
+    with connection.cursor() as cur:
+        cur.execute("PRAGMA journal_mode=WAL")
 
 
 class WebConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'web'
+
+    def ready(self):
+        post_migrate.connect(enable_sqlite_wal, sender=self)
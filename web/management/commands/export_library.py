@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from web.services import transfer
+
+
+class Command(BaseCommand):
+    help = "Stream every Library row to CSV or JSON Lines (stdout by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=transfer.FORMATS, default="jsonl")
+        parser.add_argument("--output", "-o", default="-", help="File path, or - for stdout.")
+
+    def handle(self, *args, **opts):
+        fmt, path = opts["format"], opts["output"]
+        out = sys.stdout if path == "-" else None
+        try:
+            out = out or open(path, "w", encoding="utf-8", newline="")
+        except OSError as e:
+            raise CommandError(f"Cannot write {path}: {e}")
+        rows = 0
+        try:
+            for chunk in transfer.iter_export(fmt):
+                out.write(chunk)
+                rows += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        if path != "-":
+            rows -= 1 if fmt == "csv" else 0   # header line
+            self.stderr.write(self.style.SUCCESS(f"Exported {rows} row(s) to {path}."))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from web.services import rollups, versions
+
+
+class Command(BaseCommand):
+    help = "Recompute the Library dashboard rollups from the Optimization table."
+
+    def handle(self, *args, **opts):
+        buckets = rollups.rebuild(log=self.stdout.write)
+        versions.bump(versions.LIBRARY)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} rollup bucket(s)."))
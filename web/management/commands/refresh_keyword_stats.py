@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from web.models import Optimization
+from web.services import keyword_stats
+
+
+class Command(BaseCommand):
+    help = "Refresh precomputed KeywordStats for stale tracked keywords within a YouTube quota budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget", type=int, default=getattr(settings, "KEYWORD_STATS_QUOTA_BUDGET", 2000),
+                            help="YouTube quota units to spend (each keyword costs ~101).")
+        parser.add_argument("--max-age-hours", type=float, default=None,
+                            help="Refresh rows older than this (default: KEYWORD_STATS_MAX_AGE_HOURS).")
+        parser.add_argument("--region", default=settings.YOUTUBE_DEFAULT_REGION)
+        parser.add_argument("--track", nargs="*", default=[], metavar="KEYWORD",
+                            help="Start tracking these keywords before refreshing.")
+        parser.add_argument("--track-library", action="store_true",
+                            help="Track every keyword saved in the Library.")
+
+    def handle(self, *args, **opts):
+        region = opts["region"]
+        to_track = list(opts["track"])
+        if opts["track_library"]:
+            to_track += Optimization.objects.values_list("keyword", flat=True).distinct()
+        if to_track:
+            added = keyword_stats.track(to_track, region)
+            self.stdout.write(f"Tracking {added} new keyword(s).")
+
+        age = timedelta(hours=opts["max_age_hours"]) if opts["max_age_hours"] is not None else None
+        summary = keyword_stats.refresh_stale(opts["budget"], age=age, log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {summary['refreshed']} keyword(s), {summary['failed']} failed, "
+            f"~{summary['units']} quota units used."
+        ))
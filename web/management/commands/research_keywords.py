@@ -0,0 +1,56 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from web.models import ResearchJob
+from web.services import research
+
+
+class Command(BaseCommand):
+    help = ("Bulk keyword research: start a job from a keyword list (one per line or first CSV column), "
+            "or --resume one that stopped. Progress is saved per keyword.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Keyword list for a new job.")
+        parser.add_argument("--resume", type=int, metavar="JOB_ID", help="Continue an existing job instead.")
+        parser.add_argument("--name", default="")
+        parser.add_argument("--region", default=settings.YOUTUBE_DEFAULT_REGION)
+        parser.add_argument("--budget", type=int, default=research.default_budget(),
+                            help=f"Quota units for this run (a live keyword costs ~{research.UNITS}).")
+        parser.add_argument("--workers", type=int, default=research.default_workers(),
+                            help="Keywords researched at the same time.")
+        parser.add_argument("--output", help="Write the job's finished rows here as CSV afterwards.")
+
+    def handle(self, *args, **opts):
+        if opts["resume"]:
+            job = ResearchJob.objects.filter(pk=opts["resume"]).first()
+            if job is None:
+                raise CommandError(f"No research job {opts['resume']}")
+        elif opts["path"]:
+            if not os.path.exists(opts["path"]):
+                raise CommandError(f"No such file: {opts['path']}")
+            with open(opts["path"], encoding="utf-8-sig", newline="") as f:
+                keywords = research.parse_keywords(f.read())
+            if not keywords:
+                raise CommandError("No keywords in the file.")
+            job = research.create_job(keywords, opts["region"], opts["name"] or os.path.basename(opts["path"]))
+            self.stdout.write(f"Created research job {job.pk} with {job.total} keyword(s).")
+        else:
+            raise CommandError("Give a keyword file or --resume JOB_ID.")
+
+        summary = research.run(job, budget=opts["budget"], workers=opts["workers"], log=self.stdout.write)
+        job.refresh_from_db()
+        if job.active:
+            raise CommandError(f"Job {job.pk} is being run by another process.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Job {job.pk}: {summary['done']} done, {summary['failed']} failed this run; "
+            f"{job.done + job.failed}/{job.total} overall, ~{job.units_used} quota units used. "
+            f"{job.get_status_display()}{': ' + job.note if job.note else ''}."
+        ))
+        if job.status == "paused":
+            self.stdout.write(f"Resume with: manage.py research_keywords --resume {job.pk}")
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8", newline="") as f:
+                f.writelines(research.csv_lines(job))
+            self.stdout.write(f"Wrote {opts['output']}.")
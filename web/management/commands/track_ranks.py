@@ -0,0 +1,61 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from web.services import rank_tracking
+
+
+class Command(BaseCommand):
+    help = ("Re-check where tracked Library packages rank for their keywords. One pass within --budget, "
+            "or --loop to run as a worker that spreads --daily-quota across the day.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget", type=int, default=None,
+                            help="Quota units for a single pass (default: one interval's share of --daily-quota).")
+        parser.add_argument("--loop", action="store_true", help="Keep running, checking keywords as quota accrues.")
+        parser.add_argument("--daily-quota", type=int,
+                            default=getattr(settings, "RANK_TRACKING_DAILY_QUOTA", 5000))
+        parser.add_argument("--tick-minutes", type=float, default=15,
+                            help="How often the worker wakes up to look for due keywords.")
+        parser.add_argument("--interval-hours", type=float, default=None,
+                            help="Re-check keywords older than this (default: RANK_TRACKING_INTERVAL_HOURS).")
+        parser.add_argument("--region", default=settings.YOUTUBE_DEFAULT_REGION)
+
+    def handle(self, *args, **opts):
+        region = opts["region"]
+        age = timedelta(hours=opts["interval_hours"]) if opts["interval_hours"] is not None else None
+        if not opts["loop"]:
+            added = rank_tracking.sync(region)
+            budget = opts["budget"]
+            if budget is None:
+                budget = int(opts["daily_quota"] * (age or rank_tracking.interval()) / timedelta(days=1))
+            self._report(rank_tracking.run(budget, region=region, age=age, log=self.stdout.write), added)
+            return
+
+        bucket = rank_tracking.QuotaBucket(opts["daily_quota"])
+        tick = opts["tick_minutes"] * 60
+        self.stdout.write(f"Tracking ranks: {opts['daily_quota']} units/day, waking every {tick:.0f}s.")
+        while True:
+            close_old_connections()
+            available = bucket.available()
+            if available >= rank_tracking.units_for(1):
+                added = rank_tracking.sync(region)
+                summary = rank_tracking.run(available, region=region, age=age, log=self.stdout.write)
+                bucket.spend(summary["units"])
+                if summary["quota_exhausted"]:
+                    bucket.drain()
+                if summary["units"] or added:
+                    self._report(summary, added)
+            close_old_connections()
+            time.sleep(max(tick, min(bucket.seconds_until(rank_tracking.units_for(1)), 3600)))
+
+    def _report(self, summary, added):
+        if added:
+            self.stdout.write(f"Tracking {added} new keyword(s).")
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {summary['checked']} keyword(s), {summary['failed']} failed, "
+            f"~{summary['units']} quota units used."
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KeywordStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=200)),
+                ('region', models.CharField(default='US', max_length=8)),
+                ('difficulty1', models.PositiveSmallIntegerField(default=0)),
+                ('difficulty5', models.PositiveSmallIntegerField(default=0)),
+                ('median_views', models.BigIntegerField(default=0)),
+                ('median_likes_per_1k', models.FloatField(default=0.0)),
+                ('median_comments_per_1k', models.FloatField(default=0.0)),
+                ('entities', models.TextField(blank=True)),
+                ('serp_count', models.PositiveSmallIntegerField(default=0)),
+                ('fetched_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('keyword', 'region'), name='uniq_keywordstats_keyword_region')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0002_keywordstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=200, unique=True)),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('last_searched_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from web.services import similarity
+
+BATCH_SIZE = 1000
+
+
+def backfill_title_sketches(apps, schema_editor):
+    Optimization = apps.get_model("web", "Optimization")
+    TitleBand = apps.get_model("web", "TitleBand")
+    last_id = 0
+    while True:
+        batch = list(Optimization.objects.filter(id__gt=last_id).order_by("id").only("id", "title")[:BATCH_SIZE])
+        if not batch:
+            break
+        bands = []
+        for opt in batch:
+            sig = similarity.signature(opt.title)
+            opt.title_minhash = similarity.pack(sig) if sig else None
+            if sig:
+                bands += [TitleBand(optimization_id=opt.id, bucket=key) for key in similarity.band_keys(sig)]
+        Optimization.objects.bulk_update(batch, ["title_minhash"])
+        TitleBand.objects.bulk_create(bands)
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0003_searchquery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='keywordstats',
+            name='serp_titles',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='optimization',
+            name='title_minhash',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='TitleBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('optimization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='title_bands', to='web.optimization')),
+            ],
+        ),
+        migrations.RunPython(backfill_title_sketches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0004_title_sketches'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='optimization',
+            index=models.Index(fields=['-created_at', '-id'], name='optimization_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:53
+
+from django.db import migrations, models
+
+from web.services import terms
+
+BATCH_SIZE = 1000
+
+
+def backfill_terms(apps, schema_editor):
+    Optimization = apps.get_model("web", "Optimization")
+    last_id = 0
+    while True:
+        batch = list(
+            Optimization.objects.filter(id__gt=last_id).order_by("id").only("id", "tags_text", "entities")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        terms.link_terms(Optimization, batch, replace=False)
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0005_optimization_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Entity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'entities',
+            },
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='optimization',
+            name='mentions',
+            field=models.ManyToManyField(blank=True, related_name='optimizations', to='web.entity'),
+        ),
+        migrations.AddField(
+            model_name='optimization',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='optimizations', to='web.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='optimization',
+            index=models.Index(fields=['score'], name='optimization_score_idx'),
+        ),
+        migrations.RunPython(backfill_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from web.services import search
+
+
+def install(apps, schema_editor):
+    search.install_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    search.drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0006_tags_entities'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:17
+
+from django.db import migrations, models
+
+from web.services import rollups
+
+
+def backfill_rollups(apps, schema_editor):
+    rollups.rebuild(
+        optimization_model=apps.get_model("web", "Optimization"),
+        model=apps.get_model("web", "LibraryRollup"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0007_library_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LibraryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=16)),
+                ('bucket', models.CharField(blank=True, max_length=200)),
+                ('count', models.BigIntegerField(default=0)),
+                ('score_sum', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', '-count'], name='libraryrollup_kind_count_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'bucket'), name='uniq_libraryrollup_kind_bucket')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0008_libraryrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SerpSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=200)),
+                ('region', models.CharField(default='US', max_length=8)),
+                ('fetched_at', models.DateTimeField()),
+                ('count', models.PositiveSmallIntegerField(default=0)),
+                ('data', models.BinaryField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['keyword', 'region', '-fetched_at'], name='serpsnapshot_kw_time_idx')],
+            },
+        ),
+    ]
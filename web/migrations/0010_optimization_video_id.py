@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0009_serpsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='optimization',
+            name='video_id',
+            field=models.CharField(blank=True, max_length=11, null=True),
+        ),
+    ]
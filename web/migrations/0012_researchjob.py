@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0011_dataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResearchJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=200)),
+                ('region', models.CharField(default='US', max_length=8)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('paused', 'Paused'), ('done', 'Done')], default='pending', max_length=8)),
+                ('note', models.CharField(blank=True, max_length=200)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('done', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('units_used', models.PositiveIntegerField(default=0)),
+                ('lease_until', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResearchItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('keyword', models.CharField(max_length=200)),
+                ('status', models.CharField(default='pending', max_length=8)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('error', models.CharField(blank=True, max_length=300)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='web.researchjob')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'status', 'position'], name='researchitem_job_status_idx'), models.Index(fields=['job', 'finished_at'], name='researchitem_job_finished_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'position'), name='uniq_researchitem_job_position')],
+            },
+        ),
+    ]
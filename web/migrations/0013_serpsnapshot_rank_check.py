@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 02:11
+
+from django.db import migrations, models
+
+
+def flag_rank_checks(apps, schema_editor):
+    # Discover/Optimize/research fetch at most 20 results; anything deeper is the 50-deep tracker
+    SerpSnapshot = apps.get_model("web", "SerpSnapshot")
+    SerpSnapshot.objects.filter(count__gt=20).update(rank_check=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0012_researchjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='serpsnapshot',
+            name='rank_check',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(flag_rank_checks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='serpsnapshot',
+            index=models.Index(condition=models.Q(('rank_check', True)), fields=['keyword', 'region', '-fetched_at'], name='serpsnapshot_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+from web.services import similarity
+
+BATCH_SIZE = 1000
+
+
+def rebuild_title_sketches(apps, schema_editor):
+    # Unicode-aware normalization + 10 bands of 3 rows: every sketch and bucket changes
+    Optimization = apps.get_model("web", "Optimization")
+    TitleBand = apps.get_model("web", "TitleBand")
+    TitleBand.objects.all().delete()
+    last_id = 0
+    while True:
+        batch = list(Optimization.objects.filter(id__gt=last_id).order_by("id").only("id", "title")[:BATCH_SIZE])
+        if not batch:
+            break
+        bands = []
+        for opt in batch:
+            sig = similarity.signature(opt.title)
+            opt.title_minhash = similarity.pack(sig) if sig else None
+            if sig:
+                bands += [TitleBand(optimization_id=opt.id, bucket=key) for key in similarity.band_keys(sig)]
+        Optimization.objects.bulk_update(batch, ["title_minhash"])
+        TitleBand.objects.bulk_create(bands)
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0013_serpsnapshot_rank_check'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_title_sketches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0014_rebuild_title_sketches'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='searchquery',
+            name='last_searched_at',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -1,4 +1,25 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+
+from .services import rollups, similarity, terms, versions
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=terms.MAX_TERM_LEN, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Entity(models.Model):
+    name = models.CharField(max_length=terms.MAX_TERM_LEN, unique=True)
+
+    class Meta:
+        verbose_name_plural = "entities"
+
+    def __str__(self):
+        return self.name
+
 
 class Optimization(models.Model):
     keyword = models.CharField(max_length=200)
@@ -14,5 +35,221 @@ class Optimization(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # the published video, for rank tracking (services/rank_tracking.py). Nullable so
+    # adding it is an ALTER TABLE ADD COLUMN, not a table rebuild.
+    video_id = models.CharField(max_length=11, null=True, blank=True)
+
+    # packed MinHash sketch of the title (services/similarity.py); LSH buckets in TitleBand
+    title_minhash = models.BinaryField(null=True, blank=True, editable=False)
+
+    # normalized mirrors of tags_text / entities, kept in sync by save() (services/terms.py)
+    tags = models.ManyToManyField(Tag, related_name="optimizations", blank=True)
+    mentions = models.ManyToManyField(Entity, related_name="optimizations", blank=True)
+
+    class Meta:
+        indexes = [
+            # Library keyset pagination: ORDER BY created_at DESC, id DESC
+            models.Index(fields=["-created_at", "-id"], name="optimization_created_id_idx"),
+            models.Index(fields=["score"], name="optimization_score_idx"),
+        ]
+
     def __str__(self):
         return f"{self.keyword} ({self.score})"
+
+    def save(self, *args, **kwargs):
+        sig = similarity.signature(self.title)
+        self.title_minhash = similarity.pack(sig) if sig else None
+        # row + derived bands/links/rollups commit together (one write lock on SQLite)
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = Optimization.objects.filter(pk=self.pk).only("keyword", "score", "created_at").first()
+            super().save(*args, **kwargs)
+            self.title_bands.all().delete()
+            if sig:
+                TitleBand.objects.bulk_create(
+                    TitleBand(optimization=self, bucket=key) for key in similarity.band_keys(sig)
+                )
+            terms.link_terms(Optimization, [self])
+            rollups.apply(added=[self], removed=[previous] if previous else [])
+            versions.bump(versions.LIBRARY)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            rollups.apply(removed=[self])
+            versions.bump(versions.LIBRARY)
+        return result
+
+
+class TitleBand(models.Model):
+    """One LSH bucket of an Optimization title sketch; indexed for near-duplicate lookup."""
+    optimization = models.ForeignKey(Optimization, on_delete=models.CASCADE, related_name="title_bands")
+    bucket = models.BigIntegerField(db_index=True)
+
+
+class LibraryRollup(models.Model):
+    """
+    One precomputed Library aggregate bucket (services/rollups.py):
+    kind is total / score decile / week / keyword.
+    """
+    kind = models.CharField(max_length=16)
+    bucket = models.CharField(max_length=rollups.MAX_BUCKET_LEN, blank=True)
+    count = models.BigIntegerField(default=0)
+    score_sum = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "bucket"], name="uniq_libraryrollup_kind_bucket"),
+        ]
+        indexes = [
+            models.Index(fields=["kind", "-count"], name="libraryrollup_kind_count_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.bucket} ({self.count})"
+
+
+class KeywordStats(models.Model):
+    """
+    Precomputed SERP stats for a tracked keyword, refreshed by
+    `manage.py refresh_keyword_stats`. Views prefer a fresh row over live fetches.
+    """
+    keyword = models.CharField(max_length=200)
+    region = models.CharField(max_length=8, default="US")
+
+    difficulty1 = models.PositiveSmallIntegerField(default=0)   # #1 ranking difficulty
+    difficulty5 = models.PositiveSmallIntegerField(default=0)   # #5 ranking difficulty
+    median_views = models.BigIntegerField(default=0)
+    median_likes_per_1k = models.FloatField(default=0.0)
+    median_comments_per_1k = models.FloatField(default=0.0)
+    entities = models.TextField(blank=True)                     # comma-joined, like Optimization
+    serp_count = models.PositiveSmallIntegerField(default=0)
+    serp_titles = models.JSONField(default=list, blank=True)
+
+    fetched_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["keyword", "region"], name="uniq_keywordstats_keyword_region"),
+        ]
+
+    def __str__(self):
+        return f"{self.keyword} [{self.region}]"
+
+    @property
+    def entity_list(self):
+        return [e for e in self.entities.split(",") if e]
+
+    @property
+    def env(self):
+        return {
+            "median_views": self.median_views,
+            "median_likes_per_1k": self.median_likes_per_1k,
+            "median_comments_per_1k": self.median_comments_per_1k,
+        }
+
+
+class SerpSnapshot(models.Model):
+    """One fetched SERP for a keyword, packed by services/snapshots.py (ids, views, likes, comments)."""
+    keyword = models.CharField(max_length=200)
+    region = models.CharField(max_length=8, default="US")
+    fetched_at = models.DateTimeField()
+    count = models.PositiveSmallIntegerField(default=0)
+    data = models.BinaryField()
+    # taken by the rank tracker at its full depth; other fetches (Discover, Optimize, ...) are shallower
+    rank_check = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["keyword", "region", "-fetched_at"], name="serpsnapshot_kw_time_idx"),
+            models.Index(fields=["keyword", "region", "-fetched_at"], name="serpsnapshot_rank_idx",
+                         condition=models.Q(rank_check=True)),
+        ]
+
+    def __str__(self):
+        return f"{self.keyword} [{self.region}] @ {self.fetched_at:%Y-%m-%d %H:%M}"
+
+
+class SearchQuery(models.Model):
+    """Keywords searched in Discover/Optimize; feeds keyword autocomplete."""
+    query = models.CharField(max_length=200, unique=True)
+    count = models.PositiveIntegerField(default=1)
+    last_searched_at = models.DateTimeField(db_index=True)   # autocomplete sync high-water mark
+
+    def __str__(self):
+        return f"{self.query} ({self.count})"
+
+
+class DataVersion(models.Model):
+    """
+    Monotonic version of a data set (services/versions.py), bumped in the same
+    transaction as its writes; keys rendered-fragment caches and HTTP validators.
+    """
+    name = models.CharField(max_length=32, unique=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class ResearchJob(models.Model):
+    """
+    A bulk keyword research run (services/research.py). Progress lives in its
+    ResearchItem rows, so an interrupted run resumes where it stopped.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("paused", "Paused"),       # quota budget reached or interrupted; resumable
+        ("done", "Done"),
+    ]
+    name = models.CharField(max_length=200, blank=True)
+    region = models.CharField(max_length=8, default="US")
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default="pending")
+    note = models.CharField(max_length=200, blank=True)         # why it paused
+    total = models.PositiveIntegerField(default=0)
+    done = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    units_used = models.PositiveIntegerField(default=0)         # YouTube quota units, all runs
+    lease_until = models.DateTimeField(null=True, blank=True)   # a runner holds the job until then
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name or 'research'} #{self.pk} ({self.done + self.failed}/{self.total})"
+
+    @property
+    def active(self) -> bool:
+        """A runner holds the job right now (a 'running' row whose lease lapsed was interrupted)."""
+        return self.lease_until is not None and self.lease_until >= timezone.now()
+
+    @property
+    def progress_pct(self) -> int:
+        return int((self.done + self.failed) * 100 / self.total) if self.total else 100
+
+
+class ResearchItem(models.Model):
+    """One keyword of a ResearchJob; `result` holds its CSV row once finished."""
+    job = models.ForeignKey(ResearchJob, on_delete=models.CASCADE, related_name="items")
+    position = models.PositiveIntegerField()
+    keyword = models.CharField(max_length=200)
+    status = models.CharField(max_length=8, default="pending")  # pending / done / failed
+    result = models.JSONField(default=dict, blank=True)
+    error = models.CharField(max_length=300, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "position"], name="uniq_researchitem_job_position"),
+        ]
+        indexes = [
+            models.Index(fields=["job", "status", "position"], name="researchitem_job_status_idx"),
+            models.Index(fields=["job", "finished_at"], name="researchitem_job_finished_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.keyword} [{self.status}]"
@@ -0,0 +1,302 @@
+# web/services/autocomplete.py
+"""
+In-memory keyword autocomplete.
+
+Terms live in a sorted array: one "\\x00"-joined string blob plus `array`
+offsets and weights (~(len + 8) bytes per term instead of a Python object per
+term), searched with bisect. New terms go to a small sorted pending buffer that
+is merged into the main arrays once it grows past a fraction of the index, so
+inserts stay cheap and lookups stay O(log n).
+
+Sources: stored searches (SearchQuery), Library keywords (Optimization) and
+SERP titles (stored on KeywordStats, plus those seen by this process).
+
+Each worker process holds its own index. Every SYNC_SECONDS it applies the
+rows written since its high-water marks (new SearchQuery/Optimization ids,
+newer last_searched_at/fetched_at), so keywords saved or searched in another
+worker show up within seconds at the cost of a few indexed queries. Weights
+only grow that way (edits and deletes are not subtracted), so a background
+thread rebuilds the index from scratch every REBUILD_SECONDS and swaps it in.
+"""
+import heapq
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.db import close_old_connections
+from django.db.models import F, Max
+from django.utils import timezone
+
+from ..models import KeywordStats, Optimization, SearchQuery
+
+SEP = "\x00"
+MAX_TERM_LEN = 200
+MEMO_MIN_RANGE = 512       # memoize top-k for broad prefixes matching more terms than this
+MIN_PENDING_MERGE = 10_000
+SYNC_SECONDS = 5
+REBUILD_SECONDS = 600
+
+
+def normalize(term: str) -> str:
+    return " ".join((term or "").lower().split())[:MAX_TERM_LEN]
+
+
+class PrefixIndex:
+    def __init__(self, weighted_terms=()):
+        self._lock = threading.Lock()
+        self._pending_terms: list[str] = []          # sorted
+        self._pending_weights: dict[str, int] = {}
+        self._memo: dict[tuple, list] = {}
+        self._load(sorted(weighted_terms))
+
+    # ---------- storage ----------
+
+    def _load(self, items):
+        """items: sorted iterable of (term, weight) with unique terms."""
+        offsets = array("I", [0])
+        weights = array("I")
+        parts = []
+        pos = 0
+        for term, weight in items:
+            parts.append(term)
+            pos += len(term) + 1
+            offsets.append(pos)
+            weights.append(min(weight, 0xFFFFFFFF))
+        # single assignment so concurrent readers see a consistent snapshot
+        self._main = (SEP.join(parts) + SEP if parts else "", offsets, weights)
+        self._memo = {}
+
+    @staticmethod
+    def _term(main, i: int) -> str:
+        blob, offsets, _ = main
+        return blob[offsets[i]:offsets[i + 1] - 1]
+
+    def __len__(self):
+        return len(self._main[2]) + len(self._pending_terms)
+
+    def _main_find(self, main, term: str) -> int:
+        n = len(main[2])
+        i = bisect_left(range(n), term, key=lambda j: self._term(main, j))
+        return i if i < n and self._term(main, i) == term else -1
+
+    def _merge(self):
+        main = self._main
+        n = len(main[2])
+        pending = [(t, self._pending_weights[t]) for t in self._pending_terms]
+
+        def merged():
+            i = j = 0
+            while i < n or j < len(pending):
+                if j >= len(pending) or (i < n and self._term(main, i) < pending[j][0]):
+                    yield self._term(main, i), main[2][i]
+                    i += 1
+                else:
+                    yield pending[j]
+                    j += 1
+
+        self._load(merged())
+        self._pending_terms = []
+        self._pending_weights = {}
+
+    # ---------- writes ----------
+
+    def add(self, term: str, weight: int = 1):
+        term = normalize(term)
+        if not term:
+            return
+        with self._lock:
+            main = self._main
+            i = self._main_find(main, term)
+            if i >= 0:
+                main[2][i] = min(main[2][i] + weight, 0xFFFFFFFF)
+                # memoized rankings of prefixes of this term are now stale
+                self._memo = {k: v for k, v in self._memo.items() if not term.startswith(k[0])}
+                return
+            if term in self._pending_weights:
+                self._pending_weights[term] += weight
+                return
+            insort(self._pending_terms, term)
+            self._pending_weights[term] = weight
+            if len(self._pending_terms) > max(MIN_PENDING_MERGE, len(main[2]) // 10):
+                self._merge()
+
+    # ---------- reads ----------
+
+    def _main_top(self, main, prefix: str, limit: int):
+        n = len(main[2])
+        lo = bisect_left(range(n), prefix, key=lambda j: self._term(main, j))
+        hi = bisect_left(range(lo, n), prefix + "\U0010ffff", key=lambda j: self._term(main, j)) + lo
+        memo_key = (prefix, limit)
+        broad = hi - lo > MEMO_MIN_RANGE
+        if broad and memo_key in self._memo:
+            return list(self._memo[memo_key])
+
+        _, offsets, weights = main
+        best = heapq.nsmallest(limit, range(lo, hi), key=lambda j: (-weights[j], offsets[j + 1] - offsets[j], j))
+        top = [(self._term(main, j), weights[j]) for j in best]
+        if broad:
+            self._memo[memo_key] = top
+        return list(top)
+
+    def suggest(self, prefix: str, limit: int = 8) -> list[str]:
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        candidates = self._main_top(self._main, prefix, limit)
+
+        pending = self._pending_terms
+        i = bisect_left(pending, prefix)
+        while i < len(pending) and pending[i].startswith(prefix):
+            term = pending[i]
+            candidates.append((term, self._pending_weights.get(term, 1)))
+            i += 1
+
+        candidates.sort(key=lambda tw: (-tw[1], len(tw[0]), tw[0]))
+        return [t for t, _ in candidates[:limit]]
+
+
+# ---------------- process-wide index ----------------
+
+_index = None
+_marks = None
+_built_at = _synced_at = 0.0
+_rebuilding = False
+_local = Counter()           # weight added by this process and not yet seen by _sync
+_index_lock = threading.Lock()
+
+
+def _high_water_marks() -> dict:
+    """Newest row of every source; anything past these is applied by _sync."""
+    return {
+        "query_id": SearchQuery.objects.aggregate(m=Max("id"))["m"] or 0,
+        "query_at": SearchQuery.objects.aggregate(m=Max("last_searched_at"))["m"],
+        "optimization_id": Optimization.objects.aggregate(m=Max("id"))["m"] or 0,
+        "stats_at": KeywordStats.objects.aggregate(m=Max("fetched_at"))["m"],
+    }
+
+
+def build_index():
+    """(PrefixIndex over every source, the high-water marks it was built from)."""
+    marks = _high_water_marks()
+    weights: dict[str, int] = {}
+
+    def count(text, weight=1):
+        term = normalize(text)
+        if term:
+            weights[term] = weights.get(term, 0) + weight
+
+    for query, n in SearchQuery.objects.values_list("query", "count").iterator(chunk_size=5000):
+        count(query, n)
+    for keyword in Optimization.objects.values_list("keyword", flat=True).iterator(chunk_size=5000):
+        count(keyword)
+    for titles in KeywordStats.objects.values_list("serp_titles", flat=True).iterator(chunk_size=1000):
+        for title in titles or ():
+            count(title)
+    return PrefixIndex(weights.items()), marks
+
+
+def _apply(index, term, weight=1):
+    """Add a row seen in the database, minus what this process already added for it."""
+    term = normalize(term)
+    seen = min(_local[term], weight)
+    if seen:
+        _local[term] -= seen
+        if not _local[term]:
+            del _local[term]
+    if weight > seen:
+        index.add(term, weight - seen)
+
+
+def _sync(index, marks):
+    """Apply rows written (by any worker) since `marks` and advance them."""
+    queries = SearchQuery.objects.order_by()
+    if marks["query_at"] is not None:
+        queries = queries.filter(last_searched_at__gt=marks["query_at"])
+    for pk, query, n, at in queries.values_list("id", "query", "count", "last_searched_at"):
+        # a new row carries its whole count; an existing one was searched again
+        _apply(index, query, n if pk > marks["query_id"] else 1)
+        marks["query_id"] = max(marks["query_id"], pk)
+        marks["query_at"] = max(marks["query_at"] or at, at)
+
+    rows = Optimization.objects.filter(id__gt=marks["optimization_id"]).values_list("id", "keyword")
+    for pk, keyword in rows:
+        _apply(index, keyword)
+        marks["optimization_id"] = max(marks["optimization_id"], pk)
+
+    stats = KeywordStats.objects.order_by()
+    if marks["stats_at"] is not None:
+        stats = stats.filter(fetched_at__gt=marks["stats_at"])
+    for titles, at in stats.filter(fetched_at__isnull=False).values_list("serp_titles", "fetched_at"):
+        for title in titles or ():
+            _apply(index, title)
+        marks["stats_at"] = max(marks["stats_at"] or at, at)
+
+
+def _rebuild():
+    """Full rebuild in a background thread; the live index keeps serving meanwhile."""
+    global _index, _marks, _built_at, _synced_at, _rebuilding
+    try:
+        index, marks = build_index()
+        with _index_lock:
+            # rows written while building are past `marks`, so the next _sync adds them
+            _index, _marks, _built_at = index, marks, time.monotonic()
+            _synced_at = 0.0
+            _local.clear()
+    finally:
+        _rebuilding = False
+        close_old_connections()
+
+
+def get_index() -> PrefixIndex:
+    """
+    This process's index: built on first use, then brought up to date with rows
+    written since (every SYNC_SECONDS) and rebuilt off the request path every
+    REBUILD_SECONDS.
+    """
+    global _index, _marks, _built_at, _synced_at, _rebuilding
+    now = time.monotonic()
+    if _index is not None and now - _synced_at < SYNC_SECONDS:
+        return _index
+    with _index_lock:
+        if _index is None:
+            _index, _marks = build_index()
+            _built_at = _synced_at = now
+            _local.clear()
+        elif now - _synced_at >= SYNC_SECONDS:
+            _sync(_index, _marks)
+            _synced_at = now
+            if now - _built_at >= REBUILD_SECONDS and not _rebuilding:
+                _rebuilding = True
+                threading.Thread(target=_rebuild, name="autocomplete-rebuild", daemon=True).start()
+    return _index
+
+
+def suggest(prefix: str, limit: int = 8) -> list[str]:
+    return get_index().suggest(prefix, limit)
+
+
+def _add_local(term: str):
+    with _index_lock:
+        if _index is not None:
+            _index.add(term)
+            _local[normalize(term)] += 1
+
+
+def record_search(query: str, titles=()):
+    """Persist a searched keyword and feed it (plus SERP titles) to the live index."""
+    term = normalize(query)
+    if not term:
+        return
+    now = timezone.now()
+    if not SearchQuery.objects.filter(query=term).update(count=F("count") + 1, last_searched_at=now):
+        SearchQuery.objects.get_or_create(query=term, defaults={"last_searched_at": now})
+    _add_local(term)
+    for title in titles:
+        _add_local(title)
+
+
+def record_keyword(keyword: str):
+    """A keyword saved to the Library."""
+    _add_local(keyword)
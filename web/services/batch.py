@@ -0,0 +1,49 @@
+# web/services/batch.py
+"""
+Bounded-concurrency runner for batches of independent async jobs.
+
+`as_completed(jobs, limit)` runs at most `limit` jobs at a time and yields
+(index, result, error) in completion order, so a caller can stream each
+result as soon as it is ready instead of waiting on the slowest one.
+
+`Shared` lets jobs that need the same input (one keyword's SERP, say)
+await a single fetch instead of racing each other to make their own.
+"""
+import asyncio
+
+
+class Shared:
+    """Per-batch single flight: the first get(key, factory) starts factory(), later ones await it."""
+
+    def __init__(self):
+        self._tasks = {}
+
+    def get(self, key, factory):
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(factory())
+        return task
+
+
+async def as_completed(jobs, limit: int):
+    """
+    Run zero-argument coroutine functions with at most `limit` in flight.
+    Yields (index, result, None) or (index, None, exception) as each finishes;
+    closing the generator early (the client went away) cancels what is left.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(index, job):
+        async with semaphore:
+            try:
+                return index, await job(), None
+            except Exception as e:
+                return index, None, e
+
+    tasks = [asyncio.ensure_future(run(i, job)) for i, job in enumerate(jobs)]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        for task in tasks:
+            task.cancel()
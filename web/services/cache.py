@@ -0,0 +1,221 @@
+# web/services/cache.py
+"""
+Namespaced result cache on the shared Django cache (settings.CACHES).
+
+Every worker uses the same backend, Redis when REDIS_URL is set and a file
+cache on the local disk otherwise, so a SERP, AI reply or keyword context
+fetched by one worker is reused by the others and survives restarts.
+
+Keys are "<namespace>.v<version>:<key>". Bump a namespace in KEY_VERSIONS
+when the shape of its values changes; old entries are then ignored and
+expire on their own (CACHE_VERSION in the settings retires everything).
+Pickled values of CACHE_COMPRESS_MIN_BYTES or more are stored
+zlib-compressed. A backend that is down or failing reads as a miss.
+
+FragmentCache is the "template_fragments" alias used by {% cache %}: the
+default cache underneath, with lookups counted like get_cached() under a
+"fragment:<name>" namespace.
+"""
+import hashlib
+import pickle
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from . import metrics
+
+# Seconds to keep each kind of cached value; override per namespace via settings.CACHE_TTLS
+DEFAULT_TTLS = {
+    "serp": 600,
+    "kwctx": 1800,
+    "fragment": 3600,   # rendered template fragments, keyed on a data version
+    "ai": 3600,         # Gemini replies, keyed on the exact prompt
+    "channel": 21600,   # channel audits (uploads change a few times a week at most)
+    "video": 900,       # videos.list details per video id
+}
+
+# Value format per namespace; bump when what is stored under it changes
+KEY_VERSIONS = {
+    "serp": 1,
+    "kwctx": 2,         # 2: title sketches normalized for any script
+    "ai": 1,
+    "library": 1,
+    "channel": 1,
+    "video": 1,
+}
+
+
+def make_key(*parts) -> str:
+    """Stable short digest for any mix of strings/numbers (case-insensitive)."""
+    raw = "|".join(str(p).strip().lower() for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def ttl_for(namespace: str) -> int:
+    ttls = getattr(settings, "CACHE_TTLS", {})
+    return int(ttls.get(namespace, DEFAULT_TTLS.get(namespace, 300)))
+
+
+def _full_key(namespace: str, key: str) -> str:
+    return f"{namespace}.v{KEY_VERSIONS.get(namespace, 1)}:{key}"
+
+
+class _Compressed:
+    """A zlib-compressed pickle, as stored for large values."""
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def _pack(value):
+    threshold = getattr(settings, "CACHE_COMPRESS_MIN_BYTES", 0)
+    if not threshold or isinstance(value, (int, float, bool)) or value is None:
+        return value
+    raw = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    return _Compressed(zlib.compress(raw, 6)) if len(raw) >= threshold else value
+
+
+def _unpack(value):
+    if isinstance(value, _Compressed):
+        return pickle.loads(zlib.decompress(value.data))
+    return value
+
+
+_MISS = object()
+
+
+def get_cached(namespace: str, key: str, default=None):
+    try:
+        value = cache.get(_full_key(namespace, key), _MISS)
+    except Exception:                   # backend unreachable: behave as a miss
+        metrics.record_error("cache")
+        value = _MISS
+    metrics.record_cache(namespace, value is not _MISS)
+    return default if value is _MISS else _unpack(value)
+
+
+def set_cached(namespace: str, key: str, value, ttl: int = None):
+    try:
+        cache.set(_full_key(namespace, key), _pack(value), ttl if ttl is not None else ttl_for(namespace))
+    except Exception:
+        metrics.record_error("cache")
+    return value
+
+
+def get_many_cached(namespace: str, keys) -> dict:
+    """{key: value} for the keys that are cached, in one backend round trip."""
+    full = {_full_key(namespace, k): k for k in keys}
+    try:
+        found = cache.get_many(full)
+    except Exception:
+        metrics.record_error("cache")
+        found = {}
+    for k in full:
+        metrics.record_cache(namespace, k in found)
+    return {full[k]: _unpack(v) for k, v in found.items()}
+
+
+def set_many_cached(namespace: str, values: dict, ttl: int = None):
+    try:
+        cache.set_many({_full_key(namespace, k): _pack(v) for k, v in values.items()},
+                       ttl if ttl is not None else ttl_for(namespace))
+    except Exception:
+        metrics.record_error("cache")
+    return values
+
+
+# async twins for the async views (a shared backend may do network I/O)
+async def aget_cached(namespace: str, key: str, default=None):
+    try:
+        value = await cache.aget(_full_key(namespace, key), _MISS)
+    except Exception:
+        metrics.record_error("cache")
+        value = _MISS
+    metrics.record_cache(namespace, value is not _MISS)
+    return default if value is _MISS else _unpack(value)
+
+
+async def aset_cached(namespace: str, key: str, value, ttl: int = None):
+    try:
+        await cache.aset(_full_key(namespace, key), _pack(value), ttl if ttl is not None else ttl_for(namespace))
+    except Exception:
+        metrics.record_error("cache")
+    return value
+
+
+async def aget_many_cached(namespace: str, keys) -> dict:
+    full = {_full_key(namespace, k): k for k in keys}
+    try:
+        found = await cache.aget_many(full)
+    except Exception:
+        metrics.record_error("cache")
+        found = {}
+    for k in full:
+        metrics.record_cache(namespace, k in found)
+    return {full[k]: _unpack(v) for k, v in found.items()}
+
+
+async def aset_many_cached(namespace: str, values: dict, ttl: int = None):
+    try:
+        await cache.aset_many({_full_key(namespace, k): _pack(v) for k, v in values.items()},
+                              ttl if ttl is not None else ttl_for(namespace))
+    except Exception:
+        metrics.record_error("cache")
+    return values
+
+
+# ---------------- {% cache %} fragments ----------------
+
+class FragmentCache(BaseCache):
+    """
+    Cache backend for {% cache %}: reads and writes go to the cache alias in
+    LOCATION (the default one), hits/misses are counted in /metrics, and a
+    failing backend reads as a miss so the fragment is simply rendered.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._alias = location or "default"
+
+    @property
+    def _cache(self):
+        return caches[self._alias]
+
+    @staticmethod
+    def _namespace(key: str) -> str:
+        # {% cache %} keys are "template.cache.<fragment name>.<digest>"
+        parts = key.split(".")
+        return f"fragment:{parts[2]}" if len(parts) == 4 and key.startswith("template.cache.") else "fragment"
+
+    def get(self, key, default=None, version=None):
+        try:
+            value = self._cache.get(key, _MISS, version=version)
+        except Exception:
+            metrics.record_error("cache")
+            value = _MISS
+        metrics.record_cache(self._namespace(key), value is not _MISS)
+        return default if value is _MISS else value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        try:
+            self._cache.set(key, value, timeout, version=version)
+        except Exception:
+            metrics.record_error("cache")
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._cache.add(key, value, timeout, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._cache.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        return self._cache.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        return self._cache.has_key(key, version=version)
+
+    def clear(self):
+        return self._cache.clear()
@@ -0,0 +1,126 @@
+# web/services/channels.py
+"""
+Competitor channel audit from a channel's uploads playlist.
+
+youtube.channel_uploads() lists the latest uploads through playlistItems
+(1 unit per 50 videos) and hydrates them with videos.list (1 unit per 50)
+instead of search.list (100 units per call), so auditing 200 uploads costs
+about 9 units. analyze() turns them into upload cadence, median views, the
+uploads that outperform the rest (views per day since publishing, so older
+videos do not win by age alone) and the video lengths that do best.
+"""
+import math
+from collections import Counter
+from datetime import date
+from statistics import median
+
+from django.conf import settings
+
+from .cache import get_cached, make_key, set_cached
+from .youtube import CHANNELS_UNITS, PLAYLIST_ITEMS_UNITS, PLAYLIST_PAGE, VIDEOS_BATCH, VIDEOS_UNITS, channel_uploads
+
+# (label, upper bound in seconds)
+LENGTH_BANDS = (
+    ("Shorts (≤1 min)", 60),
+    ("1–4 min", 240),
+    ("4–10 min", 600),
+    ("10–20 min", 1200),
+    ("20–40 min", 2400),
+    ("40+ min", None),
+)
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+TOP_VIDEOS = 10
+
+
+def max_videos() -> int:
+    return getattr(settings, "CHANNEL_AUDIT_MAX_VIDEOS", 200)
+
+
+def quota_units(videos: int) -> int:
+    pages = max(1, math.ceil(videos / PLAYLIST_PAGE))
+    return CHANNELS_UNITS + pages * PLAYLIST_ITEMS_UNITS + math.ceil(videos / VIDEOS_BATCH) * VIDEOS_UNITS
+
+
+def _published(v):
+    try:
+        return date.fromisoformat(v["published"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _length_band(seconds: int) -> str:
+    for label, upper in LENGTH_BANDS:
+        if upper is None or seconds <= upper:
+            return label
+    return LENGTH_BANDS[-1][0]
+
+
+def cadence(videos, today: date = None) -> dict:
+    """Upload rhythm over the span of the given uploads."""
+    days = sorted(d for d in map(_published, videos) if d)
+    if not days:
+        return {"uploads_per_week": 0.0, "median_gap_days": None, "last_upload": None,
+                "days_since_last": None, "top_weekday": ""}
+    today = today or date.today()
+    span_weeks = max((days[-1] - days[0]).days, 1) / 7
+    gaps = [(b - a).days for a, b in zip(days, days[1:])]
+    weekday, _ = Counter(d.weekday() for d in days).most_common(1)[0]
+    return {
+        "uploads_per_week": round(len(days) / span_weeks, 2) if len(days) > 1 else 0.0,
+        "median_gap_days": median(gaps) if gaps else None,
+        "last_upload": days[-1],
+        "days_since_last": (today - days[-1]).days,
+        "top_weekday": WEEKDAYS[weekday],
+    }
+
+
+def length_bands(videos) -> list[dict]:
+    """Uploads and median views per length band, in band order (empty bands left out)."""
+    views = {}
+    for v in videos:
+        views.setdefault(_length_band(v["duration_sec"]), []).append(v["views"])
+    return [
+        {"label": label, "count": len(views[label]), "median_views": int(median(views[label]))}
+        for label, _ in LENGTH_BANDS if label in views
+    ]
+
+
+def top_videos(videos, today: date = None, k: int = TOP_VIDEOS) -> list[dict]:
+    """The k uploads with the most views per day since publishing."""
+    today = today or date.today()
+    rows = []
+    for v in videos:
+        published = _published(v)
+        age = max((today - published).days, 1) if published else 1
+        rows.append({**v, "views_per_day": round(v["views"] / age, 1),
+                     "length_band": _length_band(v["duration_sec"]), "title_len": len(v["title"])})
+    rows.sort(key=lambda r: r["views_per_day"], reverse=True)
+    return rows[:k]
+
+
+def summarize(info: dict, videos, today: date = None) -> dict:
+    bands = length_bands(videos)
+    best_band = max((b for b in bands if b["count"] >= 2), key=lambda b: b["median_views"], default=None)
+    top = top_videos(videos, today)
+    return {
+        "channel": info,
+        "count": len(videos),
+        "units": quota_units(len(videos)),
+        "median_views": int(median(v["views"] for v in videos)) if videos else 0,
+        "cadence": cadence(videos, today),
+        "length_bands": bands,
+        "best_band": best_band,
+        "top_videos": top,
+        "top_title_len": int(median(r["title_len"] for r in top)) if top else 0,
+    }
+
+
+def analyze(channel: str, limit: int = None) -> dict:
+    """summarize() of a channel's latest `limit` uploads, cached per (channel, limit)."""
+    limit = max(1, min(limit or max_videos(), max_videos()))
+    key = make_key(channel, limit)
+    report = get_cached("channel", key)
+    if report is None:
+        info, videos = channel_uploads(channel, limit)
+        report = set_cached("channel", key, summarize(info, videos))
+    return report
@@ -129,31 +129,86 @@ def score_metadata(title: str, description: str, tags: List[str], hashtags: List
     return total, breakdown, fixes
 
 
+import hashlib
+
 from django.conf import settings
 from google import genai
+from google.genai import types
+
+from . import metrics
+from .cache import get_cached, aget_cached, set_cached, aset_cached
+
+MODEL = "gemini-2.5-flash"  # fast + cheap model
+
+
+def _new_client():
+    return genai.Client(
+        api_key=settings.GOOGLE_API_KEY,
+        http_options=types.HttpOptions(base_url=settings.GEMINI_BASE_URL) if settings.GEMINI_BASE_URL else None,
+    )
 
 
 # Create a singleton client using the API key from settings
-client = genai.Client(api_key=settings.GOOGLE_API_KEY)
+client = _new_client()
+
+
+def _prompt_key(prompt: str) -> str:
+    # exact prompt (case and whitespace matter to the model), unlike cache.make_key
+    return hashlib.sha256(f"{MODEL}\n{prompt}".encode("utf-8")).hexdigest()[:32]
+
+
+@metrics.timed("gemini")
+def _generate(prompt: str) -> str:
+    response = client.models.generate_content(model=MODEL, contents=prompt)
+    # response.text is the plain text output
+    return response.text
+
+
+@metrics.timed("gemini")
+async def _agenerate(prompt: str) -> str:
+    # a client per call, like the httpx clients in youtube.py: an async client's
+    # connections belong to one event loop, and under WSGI each view gets its own
+    async with _new_client().aio as aio:
+        response = await aio.models.generate_content(model=MODEL, contents=prompt)
+    return response.text
 
 
 def generate_content(prompt: str) -> str:
     """
     Call Gemini (via Google Gen AI SDK) to generate content.
     Falls back to a clear message if the key is missing or an error happens.
+    Replies are shared across workers through the "ai" cache, keyed on the exact prompt.
     """
     if not settings.GOOGLE_API_KEY:
         return "⚠️ AI is not configured. Set GOOGLE_API_KEY in your .env file."
 
+    key = _prompt_key(prompt)
+    text = get_cached("ai", key)
+    if text is not None:
+        return text
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",  # fast + cheap model
-            contents=prompt,
-        )
-        # response.text is the plain text output
-        return response.text or "(No text returned by the AI.)"
+        text = _generate(prompt)
     except Exception as e:
-        # Fail gracefully, don’t crash the site
+        # Fail gracefully, don’t crash the site (and don't cache the failure)
         return f"⚠️ AI error: {e}"
+    if not text:
+        return "(No text returned by the AI.)"
+    return set_cached("ai", key, text)
 
 
+async def agenerate_content(prompt: str) -> str:
+    """generate_content() on the SDK's async client, for the async views."""
+    if not settings.GOOGLE_API_KEY:
+        return "⚠️ AI is not configured. Set GOOGLE_API_KEY in your .env file."
+
+    key = _prompt_key(prompt)
+    text = await aget_cached("ai", key)
+    if text is not None:
+        return text
+    try:
+        text = await _agenerate(prompt)
+    except Exception as e:
+        return f"⚠️ AI error: {e}"
+    if not text:
+        return "(No text returned by the AI.)"
+    return await aset_cached("ai", key, text)
@@ -0,0 +1,100 @@
+# web/services/keyword_stats.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import KeywordStats
+from . import snapshots
+from .serp_stats import env_stats_from_serp, ranking_difficulty, serp_entities
+from .youtube import search_videos, YouTubeError
+
+SERP_SIZE = 15             # same depth Optimize analyzes
+UNITS_PER_REFRESH = 101    # search.list (100) + videos.list (1)
+
+
+def _normalize(keyword: str) -> str:
+    return " ".join((keyword or "").lower().split())
+
+
+def max_age() -> timedelta:
+    return timedelta(hours=getattr(settings, "KEYWORD_STATS_MAX_AGE_HOURS", 24))
+
+
+def get_fresh(keyword: str, region: str):
+    """Precomputed row for (keyword, region) if fetched within max_age(), else None."""
+    kw = _normalize(keyword)
+    if not kw:
+        return None
+    return KeywordStats.objects.filter(
+        keyword=kw, region=region, fetched_at__gte=timezone.now() - max_age()
+    ).first()
+
+
+def apply_serp(stats: KeywordStats, serp) -> KeywordStats:
+    env = env_stats_from_serp(serp)
+    stats.difficulty1, stats.difficulty5 = ranking_difficulty(serp)
+    stats.median_views = env["median_views"]
+    stats.median_likes_per_1k = env["median_likes_per_1k"]
+    stats.median_comments_per_1k = env["median_comments_per_1k"]
+    stats.entities = ",".join(serp_entities(serp))
+    stats.serp_count = len(serp)
+    stats.serp_titles = [v["title"] for v in serp]
+    stats.fetched_at = timezone.now()
+    return stats
+
+
+def record_live_serp(keyword: str, region: str, serp):
+    """Write-through from a live fetch: update the row if the keyword is tracked."""
+    stats = KeywordStats.objects.filter(keyword=_normalize(keyword), region=region).first()
+    if stats is not None:
+        apply_serp(stats, serp).save()
+    return stats
+
+
+def track(keywords, region: str) -> int:
+    """Start tracking keywords (idempotent). Returns number of new rows."""
+    kws = {_normalize(k) for k in keywords} - {""}
+    existing = set(
+        KeywordStats.objects.filter(region=region, keyword__in=kws).values_list("keyword", flat=True)
+    )
+    new = [KeywordStats(keyword=k, region=region) for k in sorted(kws - existing)]
+    KeywordStats.objects.bulk_create(new, ignore_conflicts=True)
+    return len(new)
+
+
+def stale_queryset(age: timedelta = None):
+    cutoff = timezone.now() - (max_age() if age is None else age)
+    return KeywordStats.objects.filter(
+        Q(fetched_at__isnull=True) | Q(fetched_at__lt=cutoff)
+    ).order_by(F("fetched_at").asc(nulls_first=True), "id")
+
+
+def refresh_stale(quota_units: int, age: timedelta = None, log=None) -> dict:
+    """
+    Refresh the stalest keywords first until the quota budget is spent.
+    Stops early on a YouTube error that looks like quota exhaustion.
+    """
+    summary = {"refreshed": 0, "failed": 0, "units": 0}
+    # ids up front: saving rows while a cursor over the same table is open is unsafe on SQLite
+    affordable = max(int(quota_units), 0) // UNITS_PER_REFRESH
+    ids = list(stale_queryset(age).values_list("id", flat=True)[:affordable])
+    rows = KeywordStats.objects.in_bulk(ids)
+    for stats in (rows[pk] for pk in ids if pk in rows):
+        summary["units"] += UNITS_PER_REFRESH
+        try:
+            serp = search_videos(stats.keyword, max_results=SERP_SIZE, region=stats.region)
+        except YouTubeError as e:
+            summary["failed"] += 1
+            if log:
+                log(f"{stats}: {e}")
+            if "quota" in str(e).lower():
+                break
+            continue
+        apply_serp(stats, serp).save()
+        snapshots.record(stats.keyword, stats.region, serp)
+        summary["refreshed"] += 1
+        if log:
+            log(f"{stats}: difficulty {stats.difficulty1}/{stats.difficulty5}, median views {stats.median_views:,}")
+    return summary
@@ -0,0 +1,159 @@
+# web/services/library.py
+"""
+Library listing helpers.
+
+Pages use keyset (cursor) pagination on (created_at, id) instead of
+LIMIT/OFFSET, so every page is one index range scan no matter how deep,
+and the header total comes from the Library rollups (services/rollups.py)
+instead of a COUNT(*) per request. Tag/entity filters and aggregates go
+through the normalized Tag/Entity link tables (services/terms.py).
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Avg, Count, Q
+
+from ..models import Entity, Optimization, Tag
+from . import rollups, versions
+from .cache import get_cached, make_key, set_cached
+from .terms import split_terms
+
+PAGE_SIZE = 10
+TOP_TERMS = 20
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, prev_cursor, total, number):
+        self.object_list = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+        self.number = number
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+
+def encode_cursor(obj) -> str:
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    """(created_at, id) from a cursor token, or None if it is missing/garbled."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        ts, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _term(value):
+    terms = split_terms(value)
+    return terms[0] if terms else None
+
+
+def clean_filters(tag=None, entity=None, min_score=None) -> dict:
+    """Normalized filter values; empty/invalid ones dropped."""
+    filters = {"tag": _term(tag), "entity": _term(entity)}
+    try:
+        filters["min_score"] = max(0, int(min_score)) if min_score not in (None, "") else None
+    except (TypeError, ValueError):
+        filters["min_score"] = None
+    return {k: v for k, v in filters.items() if v is not None}
+
+
+def filtered(tag=None, entity=None, min_score=None):
+    qs = Optimization.objects.all()
+    if tag:
+        qs = qs.filter(tags__name=tag)
+    if entity:
+        qs = qs.filter(mentions__name=entity)
+    if min_score:
+        qs = qs.filter(score__gte=min_score)
+    return qs
+
+
+def keyset_page(after: str = None, before: str = None, size: int = PAGE_SIZE, number: int = 1,
+                **filters) -> KeysetPage:
+    """
+    Newest-first page of Optimizations.
+    The bare `created_at <=`/`>=` bound is what lets the planner seek the
+    (created_at, id) index; the OR alone degrades to a full index scan.
+    `after`: cursor of the last row of the previous page (go forward/older).
+    `before`: cursor of the first row of the next page (go back/newer).
+    """
+    qs = filtered(**filters)
+    after_key, before_key = decode_cursor(after), decode_cursor(before)
+
+    if before_key:
+        ts, pk = before_key
+        rows = list(
+            qs.filter(Q(created_at__gte=ts), Q(created_at__gt=ts) | Q(id__gt=pk))
+            .order_by("created_at", "id")[:size + 1]
+        )
+        has_more_newer = len(rows) > size
+        items = rows[:size][::-1]
+        has_more_older = True
+    else:
+        if after_key:
+            ts, pk = after_key
+            qs = qs.filter(Q(created_at__lte=ts), Q(created_at__lt=ts) | Q(id__lt=pk))
+        rows = list(qs.order_by("-created_at", "-id")[:size + 1])
+        items = rows[:size]
+        has_more_older = len(rows) > size
+        has_more_newer = after_key is not None
+
+    return KeysetPage(
+        items,
+        next_cursor=encode_cursor(items[-1]) if items and has_more_older else None,
+        prev_cursor=encode_cursor(items[0]) if items and has_more_newer else None,
+        total=approx_total(**filters),
+        number=max(1, number),
+    )
+
+
+def approx_total(**filters) -> int:
+    """
+    Saved-package count for headers. Unfiltered: the exact total from the
+    incrementally maintained rollups (O(1)). Filtered counts are cached per
+    Library data version, so a save is counted on the next read.
+    """
+    if not filters:
+        return rollups.total()
+    key = make_key("count", versions.current(versions.LIBRARY)[0], *sorted(filters.items()))
+    total = get_cached("library", key)
+    if total is None:
+        total = set_cached("library", key, filtered(**filters).count())
+    return total
+
+
+def top_terms(kind: str = "tags", min_score: int = 0, limit: int = TOP_TERMS):
+    """
+    Most-used tags (or entities) across packages scoring >= min_score, with their
+    package count and average score: one GROUP BY over the link table, cached
+    per Library data version.
+    """
+    model = Tag if kind == "tags" else Entity
+    key = make_key(kind, versions.current(versions.LIBRARY)[0], min_score, limit)
+    rows = get_cached("library", key)
+    if rows is None:
+        qs = model.objects.all()
+        if min_score:
+            qs = qs.filter(optimizations__score__gte=min_score)
+        rows = list(
+            qs.annotate(packages=Count("optimizations"), avg_score=Avg("optimizations__score"))
+            .filter(packages__gt=0)
+            .order_by("-packages", "name")
+            .values("name", "packages", "avg_score")[:limit]
+        )
+        set_cached("library", key, rows)
+    return rows
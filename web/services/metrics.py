@@ -0,0 +1,202 @@
+# web/services/metrics.py
+"""
+Request instrumentation: Server-Timing spans and Prometheus counters.
+
+`span(name)` / `timed(name)` time a phase (an outbound call, scoring,
+rendering). Each duration is added to the current request's spans, which
+core.middleware.ServerTimingMiddleware turns into a Server-Timing header,
+and to a process-wide latency histogram per span. The middleware also
+records one latency/status observation per request, labelled with the URL
+name, and get_cached() and the {% cache %} fragment backend
+(cache.FragmentCache) report cache hits against the same view.
+
+`exposition()` renders everything (plus seo_rules.rule_stats()) in the
+Prometheus text format for /metrics. Counters live in process memory, so
+with several workers each one reports its own numbers.
+"""
+import contextlib
+import functools
+import inspect
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+UNMATCHED = "unmatched"
+
+# per-request state: {"view": url name, "spans": {name: [calls, seconds]}}
+_request: ContextVar = ContextVar("metrics_request", default=None)
+
+_lock = threading.Lock()
+# (metric, labels) -> [bucket counts..., count, sum]
+_histograms = {}
+# (metric, labels) -> value
+_counters = defaultdict(int)
+
+
+# ---------------- recording ----------------
+
+def _observe(metric: str, labels: tuple, seconds: float):
+    with _lock:
+        h = _histograms.get((metric, labels))
+        if h is None:
+            h = _histograms[(metric, labels)] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                h[i] += 1
+        h[-2] += 1
+        h[-1] += seconds
+
+
+def _count(metric: str, labels: tuple, n: int = 1):
+    with _lock:
+        _counters[(metric, labels)] += n
+
+
+def current_view() -> str:
+    state = _request.get()
+    return (state or {}).get("view") or UNMATCHED
+
+
+@contextlib.contextmanager
+def span(name: str):
+    """Time a block as Server-Timing span `name`; exceptions count as span errors."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        record_error(name)
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        _observe("span_seconds", (("span", name),), seconds)
+        state = _request.get()
+        if state is not None:
+            s = state["spans"].setdefault(name, [0, 0.0])
+            s[0] += 1
+            s[1] += seconds
+
+
+def timed(name: str):
+    """Decorator form of span(), for plain and async functions."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_error(name: str):
+    """Count a failed span (for callers that turn errors into a fallback value)."""
+    _count("span_errors_total", (("span", name),))
+
+
+def record_cache(namespace: str, hit: bool):
+    _count("cache_requests_total", (("view", current_view()), ("namespace", namespace),
+                                    ("result", "hit" if hit else "miss")))
+
+
+# ---------------- per request (used by the middleware) ----------------
+
+def begin_request():
+    """Start collecting spans for this request; returns a token for end_request()."""
+    return _request.set({"view": None, "spans": {}})
+
+
+def set_view(name: str):
+    state = _request.get()
+    if state is not None:
+        state["view"] = name
+
+
+def end_request(token, method: str, status: int, seconds: float) -> dict:
+    """Record the request and return its spans as {name: (calls, seconds)}."""
+    state = _request.get()
+    _request.reset(token)
+    view = (state or {}).get("view") or UNMATCHED
+    _observe("request_seconds", (("view", view),), seconds)
+    _count("requests_total", (("view", view), ("method", method), ("status", f"{status // 100}xx")))
+    if status >= 500:
+        _count("request_errors_total", (("view", view),))
+    return {name: tuple(s) for name, s in (state or {}).get("spans", {}).items()}
+
+
+def server_timing(spans: dict, total: float) -> str:
+    """Server-Timing header value; durations in milliseconds."""
+    parts = [f'{name};dur={seconds * 1000:.1f};desc="{calls}x"' for name, (calls, seconds) in spans.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+# ---------------- exposition ----------------
+
+PREFIX = "ytbseo_"
+HELP = {
+    "request_seconds": ("histogram", "Request latency by view."),
+    "requests_total": ("counter", "Requests by view, method and status class."),
+    "request_errors_total": ("counter", "Requests that ended in a 5xx response, by view."),
+    "span_seconds": ("histogram", "Latency of instrumented phases and outbound calls."),
+    "span_errors_total": ("counter", "Failed outbound calls and phases, by span."),
+    "cache_requests_total": ("counter", "Cache lookups (get_cached() and {% cache %} fragments as "
+                                        "namespace fragment:<name>) by view, namespace and result."),
+    "seo_rule_calls_total": ("counter", "SEO rule evaluations."),
+    "seo_rule_hits_total": ("counter", "SEO rule evaluations that awarded points."),
+    "seo_rule_seconds_total": ("counter", "Time spent evaluating each SEO rule."),
+}
+
+
+def _labels(labels, extra=()) -> str:
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def exposition() -> str:
+    """All metrics in the Prometheus text format (version 0.0.4)."""
+    from .seo_rules import rule_stats
+
+    with _lock:
+        histograms = {key: list(h) for key, h in _histograms.items()}
+        counters = dict(_counters)
+    for rule, s in rule_stats().items():
+        labels = (("rule", rule),)
+        counters[("seo_rule_calls_total", labels)] = s["calls"]
+        counters[("seo_rule_hits_total", labels)] = s["hits"]
+        counters[("seo_rule_seconds_total", labels)] = s["total_ms"] / 1000
+
+    lines = []
+    for metric, (kind, text) in HELP.items():
+        name = PREFIX + metric
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+        if kind == "histogram":
+            for (m, labels), h in sorted(histograms.items()):
+                if m != metric:
+                    continue
+                for bound, n in zip(BUCKETS, h):
+                    lines.append(f"{name}_bucket{_labels(labels, [('le', repr(bound))])} {n}")
+                lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {h[-2]}")
+                lines.append(f"{name}_count{_labels(labels)} {h[-2]}")
+                lines.append(f"{name}_sum{_labels(labels)} {h[-1]:.6f}")
+        else:
+            for (m, labels), value in sorted(counters.items()):
+                if m == metric:
+                    lines.append(f"{name}{_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
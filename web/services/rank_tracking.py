@@ -0,0 +1,190 @@
+# web/services/rank_tracking.py
+"""
+Scheduled rank tracking for Library packages with a published video.
+
+A "check" of a keyword is one search.list at TRACK_DEPTH: 50 results cost
+the same 100 units as 15. Packages that share a keyword share its check.
+The statistics for every video a run saw go through videos.list 50 ids per
+call, de-duplicated across keywords. Each check refreshes the keyword's
+KeywordStats row, whose fetched_at doubles as "last checked", and stores a
+SERP snapshot flagged as a rank check (services/snapshots.py). A package's
+rank history is read back from those snapshots only, never from the
+shallower ones Discover/Optimize/research store for the same keyword.
+
+QuotaBucket spreads a daily unit budget evenly over the day for the
+long-running worker (`manage.py track_ranks --loop`).
+"""
+import math
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from ..models import Optimization, SerpSnapshot
+from . import keyword_stats, snapshots, versions
+from .youtube import SEARCH_UNITS, VIDEOS_BATCH, VIDEOS_UNITS, YouTubeError, search_ids, video_details
+
+TRACK_DEPTH = 50
+
+
+def _normalize(keyword: str) -> str:
+    return " ".join((keyword or "").lower().split())
+
+
+def interval() -> timedelta:
+    return timedelta(hours=getattr(settings, "RANK_TRACKING_INTERVAL_HOURS", 24))
+
+
+def default_region() -> str:
+    return getattr(settings, "YOUTUBE_DEFAULT_REGION", "US")
+
+
+def units_for(checks: int) -> int:
+    """Worst-case quota for `checks` keyword checks in one run."""
+    return checks * SEARCH_UNITS + math.ceil(checks * TRACK_DEPTH / VIDEOS_BATCH) * VIDEOS_UNITS
+
+
+def tracked_packages():
+    return Optimization.objects.filter(video_id__isnull=False).exclude(video_id="")
+
+
+def tracked_keywords() -> set:
+    return {_normalize(k) for k in tracked_packages().values_list("keyword", flat=True)} - {""}
+
+
+def sync(region: str = None) -> int:
+    """Make sure every tracked package's keyword has a KeywordStats row. Returns rows added."""
+    return keyword_stats.track(tracked_keywords(), region or default_region())
+
+
+def due(region: str = None, age: timedelta = None):
+    """Tracked keywords not checked within `age`, never-checked and stalest first."""
+    return keyword_stats.stale_queryset(age or interval()).filter(
+        region=region or default_region(), keyword__in=tracked_keywords(),
+    )
+
+
+def run(budget: int, region: str = None, age: timedelta = None, log=None) -> dict:
+    """
+    Check as many due keywords as `budget` units allow. Returns
+    {"checked", "failed", "units", "quota_exhausted"}.
+    """
+    summary = {"checked": 0, "failed": 0, "units": 0, "quota_exhausted": False}
+    picked = []
+    for stats in due(region, age).iterator():
+        if units_for(len(picked) + 1) > budget:
+            break
+        picked.append(stats)
+
+    # 1) one search per keyword
+    ranked = []
+    for stats in picked:
+        summary["units"] += SEARCH_UNITS
+        try:
+            ids = search_ids(stats.keyword, max_results=TRACK_DEPTH, region=stats.region)
+        except YouTubeError as e:
+            summary["failed"] += 1
+            if log:
+                log(f"{stats}: {e}")
+            if "quota" in str(e).lower():
+                summary["quota_exhausted"] = True
+                break
+            continue
+        ranked.append((stats, ids))
+
+    # 2) statistics for every distinct video, 50 per call
+    unique = list(dict.fromkeys(vid for _, ids in ranked for vid in ids))
+    details = {}
+    for i in range(0, len(unique), VIDEOS_BATCH):
+        summary["units"] += VIDEOS_UNITS
+        try:
+            details.update((v["id"], v) for v in video_details(unique[i:i + VIDEOS_BATCH]))
+        except YouTubeError as e:
+            if log:
+                log(f"videos.list: {e}")
+            if "quota" in str(e).lower():
+                summary["quota_exhausted"] = True
+                break
+
+    # 3) store: ranks always (ids are the point), KeywordStats once stats came back
+    for stats, ids in ranked:
+        snapshots.record(stats.keyword, stats.region, [details.get(vid) or {"id": vid} for vid in ids],
+                         rank_check=True)
+        serp = [details[vid] for vid in ids if vid in details]
+        if serp or not ids:
+            keyword_stats.apply_serp(stats, serp[:keyword_stats.SERP_SIZE]).save()
+        summary["checked"] += 1
+        if log:
+            log(f"{stats}: {len(ids)} results")
+    if ranked:
+        versions.bump(versions.LIBRARY)     # Library cards show the latest rank
+    return summary
+
+
+def package_ranks(opt: Optimization, region: str = None, limit: int = 90):
+    """Newest-first [(fetched_at, rank or None, depth)] for a tracked package."""
+    if not opt.video_id:
+        return []
+    return [
+        (fetched_at, cols["ids"].index(opt.video_id) + 1 if opt.video_id in cols["ids"] else None, cols["count"])
+        for fetched_at, cols in snapshots.history(opt.keyword, region or default_region(), ("ids",), limit,
+                                                  rank_checks=True)
+    ]
+
+
+def annotate_latest(items, region: str = None):
+    """
+    Set `latest_rank` (rank or None) and `rank_depth` on tracked packages from
+    the newest rank check of each keyword, in one query that only reads those rows.
+    """
+    tracked = [o for o in items if o.video_id]
+    for o in items:
+        o.latest_rank = o.rank_depth = None
+    if not tracked:
+        return items
+    region = region or default_region()
+    newest = (SerpSnapshot.objects
+              .filter(keyword=OuterRef("keyword"), region=region, rank_check=True)
+              .order_by("-fetched_at").values("pk")[:1])
+    rows = (SerpSnapshot.objects
+            .filter(region=region, rank_check=True,
+                    keyword__in={_normalize(o.keyword) for o in tracked},
+                    fetched_at__gte=timezone.now() - 2 * interval())
+            .filter(pk=Subquery(newest)).values_list("keyword", "data"))
+    latest = {kw: snapshots.decode(data, ("ids",)) for kw, data in rows}
+    for o in tracked:
+        cols = latest.get(_normalize(o.keyword))
+        if cols:
+            o.rank_depth = cols["count"]
+            o.latest_rank = cols["ids"].index(o.video_id) + 1 if o.video_id in cols["ids"] else None
+    return items
+
+
+class QuotaBucket:
+    """
+    Token bucket refilled at daily_units per day. `burst` caps what an idle
+    worker can save up, so quota is spent through the day, not at start-up.
+    """
+    def __init__(self, daily_units: int, burst: int = None, clock=time.monotonic):
+        self.rate = daily_units / 86400
+        self.capacity = max(burst or daily_units / 24, units_for(1))
+        self.clock = clock
+        self.tokens = 0.0
+        self.updated = clock()
+
+    def available(self) -> int:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return int(self.tokens)
+
+    def spend(self, units: int):
+        self.tokens = max(0.0, self.tokens - units)
+
+    def drain(self):
+        self.tokens = 0.0
+
+    def seconds_until(self, units: int) -> float:
+        return max(0.0, (units - self.tokens) / self.rate) if self.rate else float("inf")
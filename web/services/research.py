@@ -0,0 +1,272 @@
+# web/services/research.py
+"""
+Bulk keyword research: ResearchJob / ResearchItem.
+
+create_job() stores one pending item per keyword of an uploaded list (one
+keyword per line, or the first column of a CSV; blanks and repeats dropped).
+
+arun() works through a job's pending items with a bounded pool of async
+workers (batch.as_completed). A keyword is answered from a fresh
+KeywordStats row when there is one (no quota), otherwise from a live SERP
+fetch (keyword_stats.UNITS_PER_REFRESH units) that also refreshes the stats
+and snapshots like any other live fetch. Each item is saved the moment it
+finishes, so a run that stops - budget spent, quota error from the API,
+process killed, client gone - picks up at the next pending item when it is
+started again. One runner at a time holds a job (a lease on the row).
+
+acsv_lines() is the download: finished rows first, then the rest as they
+finish, from this request's own run or by following the runner that holds
+the job. csv_lines() is the finished rows only.
+"""
+import asyncio
+import csv
+import io
+import re
+from contextlib import aclosing
+from datetime import timedelta
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import ResearchItem, ResearchJob
+from . import batch, keyword_stats, snapshots
+from .csvstream import line_writer
+from .serp_stats import env_stats_from_serp, ranking_difficulty, sentiment, serp_entities
+from .youtube import YouTubeError, asearch_videos
+
+UNITS = keyword_stats.UNITS_PER_REFRESH
+LEASE = timedelta(seconds=60)      # renewed on every finished item
+TRANSIENT_RE = re.compile(r"error: (?:429|5\d\d)\b")    # YouTubeError for a rate limit / server error
+FOLLOW_POLL = 2.0                  # seconds between progress reads when another runner holds the job
+COLUMNS = (
+    "keyword", "status", "difficulty_top1", "difficulty_top5", "median_views",
+    "likes_per_1k", "comments_per_1k", "sentiment", "serp_count", "top_entities", "source", "error",
+)
+
+
+def default_budget() -> int:
+    return getattr(settings, "RESEARCH_QUOTA_BUDGET", 5000)
+
+
+def default_workers() -> int:
+    return getattr(settings, "RESEARCH_WORKERS", 4)
+
+
+# ---------------- jobs ----------------
+
+def parse_keywords(*texts: str, limit: int = None) -> list[str]:
+    """Keywords from pasted/uploaded lists: first CSV column, whitespace collapsed, first spelling kept."""
+    limit = limit or getattr(settings, "RESEARCH_MAX_KEYWORDS", 5000)
+    seen, out = set(), []
+    for text in texts:
+        for i, row in enumerate(csv.reader(io.StringIO(text))):
+            kw = " ".join(row[0].split())[:200] if row else ""
+            key = kw.lower()
+            if not kw or key in seen or (i == 0 and key in ("keyword", "keywords")):    # blank, repeat or header
+                continue
+            seen.add(key)
+            out.append(kw)
+            if len(out) >= limit:
+                return out
+    return out
+
+
+@transaction.atomic
+def create_job(keywords, region: str, name: str = "") -> ResearchJob:
+    job = ResearchJob.objects.create(name=name[:200], region=region, total=len(keywords))
+    ResearchItem.objects.bulk_create(
+        (ResearchItem(job=job, position=i, keyword=kw) for i, kw in enumerate(keywords)), batch_size=1000,
+    )
+    return job
+
+
+def _claim(job_id: int) -> bool:
+    """Take the job's lease if nobody holds it (or the holder died)."""
+    now = timezone.now()
+    return ResearchJob.objects.filter(pk=job_id).exclude(status="done").filter(
+        Q(lease_until__isnull=True) | Q(lease_until__lt=now)
+    ).update(status="running", note="", lease_until=now + LEASE) == 1
+
+
+def _release(job_id: int, note: str = ""):
+    pending = ResearchItem.objects.filter(job_id=job_id, status="pending").exists()
+    ResearchJob.objects.filter(pk=job_id).update(
+        status="paused" if pending else "done", note=note if pending else "", lease_until=None,
+    )
+
+
+def _finish(item: ResearchItem, status: str, row: dict, error: str, units: int):
+    now = timezone.now()
+    with transaction.atomic():
+        ResearchItem.objects.filter(pk=item.pk).update(status=status, result=row, error=error[:300], finished_at=now)
+        ResearchJob.objects.filter(pk=item.job_id).update(
+            done=F("done") + (status == "done"), failed=F("failed") + (status == "failed"),
+            units_used=F("units_used") + units, lease_until=now + LEASE,
+        )
+    item.status, item.result, item.error, item.finished_at = status, row, error[:300], now
+    return item
+
+
+# ---------------- research ----------------
+
+def _row(keyword, difficulty, env, entities, serp_count, source) -> dict:
+    return {
+        "keyword": keyword,
+        "difficulty_top1": difficulty[0],
+        "difficulty_top5": difficulty[1],
+        "median_views": env["median_views"],
+        "likes_per_1k": round(env["median_likes_per_1k"], 2),
+        "comments_per_1k": round(env["median_comments_per_1k"], 2),
+        "sentiment": sentiment(env["median_likes_per_1k"] / 1000 if serp_count else None)[1],
+        "serp_count": serp_count,
+        "top_entities": ", ".join(entities[:5]),
+        "source": source,
+    }
+
+
+def _store_serp(keyword: str, region: str, serp):
+    keyword_stats.record_live_serp(keyword, region, serp)
+    snapshots.record(keyword, region, serp)
+
+
+class _Budget:
+    def __init__(self, units: int):
+        self.left = units
+        self.stop_reason = ""
+        self.transient = 0          # items left pending after a network/server error
+
+    def take(self, units: int) -> bool:
+        if self.stop_reason or self.left < units:
+            return False
+        self.left -= units
+        return True
+
+
+class _Skipped(Exception):
+    """Left pending for the next run (budget spent or quota exhausted)."""
+
+
+async def _research(item: ResearchItem, region: str, budget: _Budget) -> ResearchItem:
+    stats = await sync_to_async(keyword_stats.get_fresh)(item.keyword, region)
+    if stats is not None:
+        row = _row(item.keyword, (stats.difficulty1, stats.difficulty5), stats.env,
+                   stats.entity_list, stats.serp_count, "stored")
+        return await sync_to_async(_finish)(item, "done", row, "", 0)
+
+    if not budget.take(UNITS):
+        raise _Skipped()
+    try:
+        serp = await asearch_videos(item.keyword, max_results=keyword_stats.SERP_SIZE, region=region)
+    except Exception as e:
+        if isinstance(e, YouTubeError) and "quota" in str(e).lower():
+            budget.stop_reason = "YouTube quota exhausted"
+            raise _Skipped()
+        if isinstance(e, httpx.HTTPError) or (isinstance(e, YouTubeError) and TRANSIENT_RE.search(str(e))):
+            budget.left += UNITS        # nothing was answered; the next run retries it
+            budget.transient += 1
+            raise _Skipped()
+        error = str(e) if isinstance(e, YouTubeError) else f"Unexpected error: {e}"
+        return await sync_to_async(_finish)(item, "failed", {"keyword": item.keyword}, error, UNITS)
+    await sync_to_async(_store_serp)(item.keyword, region, serp)
+    row = _row(item.keyword, ranking_difficulty(serp), env_stats_from_serp(serp),
+               serp_entities(serp), len(serp), "live")
+    return await sync_to_async(_finish)(item, "done", row, "", UNITS)
+
+
+async def arun(job: ResearchJob, budget: int = None, workers: int = None):
+    """
+    Research the job's pending items, yielding each ResearchItem as it finishes.
+    Yields nothing if another runner holds the job. Spends at most `budget`
+    quota units; what is left over stays pending.
+    """
+    if not await sync_to_async(_claim)(job.pk):
+        return
+    left = _Budget(default_budget() if budget is None else budget)
+    note = ""
+    try:
+        pending = await sync_to_async(list)(job.items.filter(status="pending").order_by("position"))
+        jobs = [(lambda item=item: _research(item, job.region, left)) for item in pending]
+        async with aclosing(batch.as_completed(jobs, workers or default_workers())) as finished:
+            async for _, item, exc in finished:
+                if exc is None:
+                    yield item
+                elif not isinstance(exc, _Skipped):
+                    raise exc
+        note = left.stop_reason or ("Quota budget for this run spent" if left.left < UNITS else "")
+        if not note and left.transient:
+            note = f"{left.transient} keyword(s) hit network/server errors; run again to retry"
+    finally:
+        await sync_to_async(_release)(job.pk, note or "Interrupted")
+
+
+def run(job: ResearchJob, budget: int = None, workers: int = None, log=None) -> dict:
+    """arun() to completion, for the management command."""
+    async def consume():
+        summary = {"done": 0, "failed": 0}
+        async for item in arun(job, budget, workers):
+            summary[item.status] += 1
+            if log:
+                log(f"{item.keyword}: {item.error or item.result.get('difficulty_top1')}")
+        return summary
+    return asyncio.run(consume())
+
+
+# ---------------- CSV ----------------
+
+def _csv_row(writer, item: ResearchItem) -> str:
+    values = {**item.result, "keyword": item.keyword, "status": item.status, "error": item.error}
+    return writer.writerow([values.get(c, "") for c in COLUMNS])
+
+
+def csv_lines(job: ResearchJob):
+    """The job's finished rows as CSV, in list order."""
+    writer = line_writer()
+    yield writer.writerow(COLUMNS)
+    for item in job.items.exclude(status="pending").order_by("position").iterator():
+        yield _csv_row(writer, item)
+
+
+def _finished_since(job_id: int, since):
+    qs = ResearchItem.objects.filter(job_id=job_id).exclude(status="pending")
+    if since is not None:
+        qs = qs.filter(finished_at__gte=since)
+    return list(qs.order_by("finished_at", "id"))
+
+
+def _lease_held(job_id: int) -> bool:
+    return ResearchJob.objects.filter(pk=job_id, lease_until__gte=timezone.now()).exists()
+
+
+async def acsv_lines(job: ResearchJob, run_pending: bool = True):
+    """CSV of the job: finished rows, then rows as they finish (running the job or following its runner)."""
+    writer = line_writer()
+    emitted, since = set(), None
+
+    def line(item):
+        emitted.add(item.pk)
+        return _csv_row(writer, item)
+
+    async def catch_up():
+        nonlocal since
+        for item in await sync_to_async(_finished_since)(job.pk, since):
+            since = item.finished_at
+            if item.pk not in emitted:
+                yield line(item)
+
+    yield writer.writerow(COLUMNS)
+    async for text in catch_up():
+        yield text
+    if run_pending:
+        async with aclosing(arun(job)) as finished:
+            async for item in finished:
+                yield line(item)
+    while await sync_to_async(_lease_held)(job.pk):       # someone else is running it
+        await asyncio.sleep(FOLLOW_POLL)
+        async for text in catch_up():
+            yield text
+    async for text in catch_up():
+        yield text
@@ -0,0 +1,158 @@
+# web/services/rollups.py
+"""
+Incrementally maintained Library aggregates (LibraryRollup rows).
+
+Every saved Optimization adds (count, score) to a handful of buckets:
+the grand total, its score decile, its week and its keyword. Dashboards read
+those few rows instead of aggregating over the whole Library. Optimization
+save()/delete() keep the buckets current; queryset-level updates/deletes do
+not, so `manage.py rebuild_library_rollups` recomputes them from scratch.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+TOTAL = "total"
+SCORE = "score"        # bucket: decile "0".."10"
+WEEK = "week"          # bucket: ISO date of the week's Monday
+KEYWORD = "keyword"    # bucket: normalized keyword
+
+MAX_BUCKET_LEN = 200
+HISTOGRAM_BINS = 11
+BATCH_SIZE = 1000
+
+
+def _model(model=None):
+    return model or apps.get_model("web", "LibraryRollup")
+
+
+def week_start(dt):
+    day = timezone.localtime(dt).date() if timezone.is_aware(dt) else dt.date()
+    return day - timedelta(days=day.weekday())
+
+
+def buckets(keyword: str, score: int, created_at):
+    yield TOTAL, ""
+    yield SCORE, str(min(max(score or 0, 0) // 10, HISTOGRAM_BINS - 1))
+    if created_at:
+        yield WEEK, week_start(created_at).isoformat()
+    kw = " ".join((keyword or "").lower().split())[:MAX_BUCKET_LEN]
+    if kw:
+        yield KEYWORD, kw
+
+
+def _add(deltas, row, sign):
+    for key in buckets(row.keyword, row.score, row.created_at):
+        n, s = deltas[key]
+        deltas[key] = (n + sign, s + sign * (row.score or 0))
+
+
+def apply(added=(), removed=(), model=None):
+    """Fold saved (`added`) and deleted/replaced (`removed`) rows into the rollups."""
+    Rollup = _model(model)
+    deltas = defaultdict(lambda: (0, 0))
+    for row in added:
+        _add(deltas, row, 1)
+    for row in removed:
+        _add(deltas, row, -1)
+    deltas = {key: d for key, d in deltas.items() if d != (0, 0)}
+    if not deltas:
+        return
+
+    by_kind = defaultdict(list)
+    for kind, bucket in deltas:
+        by_kind[kind].append(bucket)
+    existing = set()
+    for kind, bucket_list in by_kind.items():
+        for i in range(0, len(bucket_list), BATCH_SIZE):
+            existing.update(
+                Rollup.objects.filter(kind=kind, bucket__in=bucket_list[i:i + BATCH_SIZE]).values_list("kind", "bucket")
+            )
+
+    # one prepared statement for every existing bucket (a batch import touches hundreds)
+    q = connection.ops.quote_name
+    table, count, score_sum = q(Rollup._meta.db_table), q("count"), q("score_sum")
+    with connection.cursor() as cur:
+        cur.executemany(
+            f"UPDATE {table} SET {count} = {count} + %s, {score_sum} = {score_sum} + %s "
+            f"WHERE kind = %s AND bucket = %s",
+            [(n, s, kind, bucket) for (kind, bucket), (n, s) in deltas.items() if (kind, bucket) in existing],
+        )
+    for (kind, bucket), (n, s) in deltas.items():
+        if (kind, bucket) in existing:
+            continue
+        try:
+            with transaction.atomic():
+                Rollup.objects.create(kind=kind, bucket=bucket, count=n, score_sum=s)
+        except IntegrityError:
+            # created concurrently since the lookup above
+            Rollup.objects.filter(kind=kind, bucket=bucket).update(
+                count=F("count") + n, score_sum=F("score_sum") + s,
+            )
+
+
+def rebuild(optimization_model=None, model=None, log=None):
+    """Recompute every bucket from the Optimization table, in id-ordered batches."""
+    Optimization = optimization_model or apps.get_model("web", "Optimization")
+    Rollup = _model(model)
+    deltas = defaultdict(lambda: (0, 0))
+    last_id, seen = 0, 0
+    while True:
+        batch = list(
+            Optimization.objects.filter(id__gt=last_id).order_by("id")
+            .only("id", "keyword", "score", "created_at")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for row in batch:
+            _add(deltas, row, 1)
+        last_id = batch[-1].id
+        seen += len(batch)
+        if log:
+            log(f"  scanned {seen} rows")
+    with transaction.atomic():
+        Rollup.objects.all().delete()
+        Rollup.objects.bulk_create(
+            [Rollup(kind=k, bucket=b, count=n, score_sum=s) for (k, b), (n, s) in deltas.items()],
+            batch_size=BATCH_SIZE,
+        )
+    return len(deltas)
+
+
+def total() -> int:
+    row = _model().objects.filter(kind=TOTAL, bucket="").values_list("count", flat=True).first()
+    return row or 0
+
+
+def summary(top_keywords: int = 10, weeks: int = 12) -> dict:
+    """Dashboard numbers from a fixed number of indexed rollup rows."""
+    Rollup = _model()
+    total_row = Rollup.objects.filter(kind=TOTAL, bucket="").first()
+    count = total_row.count if total_row else 0
+
+    histogram = [0] * HISTOGRAM_BINS
+    for bucket, n in Rollup.objects.filter(kind=SCORE).values_list("bucket", "count"):
+        histogram[int(bucket)] = n
+    peak = max(histogram) or 1
+
+    return {
+        "count": count,
+        "avg_score": round(total_row.score_sum / count, 1) if count else 0,
+        "histogram": [
+            {"label": f"{i * 10}+" if i == HISTOGRAM_BINS - 1 else f"{i * 10}-{i * 10 + 9}",
+             "count": n, "pct": round(n * 100 / peak)}
+            for i, n in enumerate(histogram)
+        ],
+        "top_keywords": [
+            {"keyword": r.bucket, "count": r.count, "avg_score": round(r.score_sum / r.count, 1)}
+            for r in Rollup.objects.filter(kind=KEYWORD, count__gt=0).order_by("-count", "bucket")[:top_keywords]
+        ],
+        "weeks": [
+            {"week": r.bucket, "count": r.count, "avg_score": round(r.score_sum / r.count, 1)}
+            for r in reversed(Rollup.objects.filter(kind=WEEK, count__gt=0).order_by("-bucket")[:weeks])
+        ],
+    }
@@ -0,0 +1,149 @@
+# web/services/search.py
+"""
+Full-text search over Library keyword/title/description.
+
+SQLite: an external-content FTS5 table kept in sync by triggers, ranked by
+bm25(). Postgres: a generated, weighted tsvector column with a GIN index,
+ranked by ts_rank_cd(). Other backends fall back to unranked icontains.
+
+Every match is ranked; the database orders them and returns one page of
+ids (ORDER BY score LIMIT/OFFSET), whose rows are then loaded by primary
+key. The header total is a COUNT(*) over the same match.
+
+Note: on SQLite, a migration that rebuilds web_optimization (e.g. AlterField)
+drops its triggers; such migrations must call install_index() again.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .library import PAGE_SIZE, KeysetPage, filtered
+
+TABLE = "web_optimization"
+FTS_TABLE = "web_optimization_fts"
+PG_COLUMN = "search_vector"
+PG_INDEX = "web_optimization_search_gin"
+FTS_WEIGHTS = (10.0, 4.0, 1.0)       # keyword, title, description
+
+QUERY_TOKEN_RE = re.compile(r"\w+\*?", re.UNICODE)    # "pyth*" asks for a prefix match
+
+SQLITE_INSTALL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        keyword, title, description,
+        content='{TABLE}', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, keyword, title, description)
+        VALUES (new.id, new.keyword, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, keyword, title, description)
+        VALUES ('delete', old.id, old.keyword, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF keyword, title, description ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, keyword, title, description)
+        VALUES ('delete', old.id, old.keyword, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, keyword, title, description)
+        VALUES (new.id, new.keyword, new.title, new.description);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_INSTALL = [
+    f"""ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS {PG_COLUMN} tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(keyword, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(title, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED""",
+    f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON {TABLE} USING GIN ({PG_COLUMN})",
+]
+POSTGRES_DROP = [
+    f"DROP INDEX IF EXISTS {PG_INDEX}",
+    f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS {PG_COLUMN}",
+]
+
+
+def install_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def query_tokens(query: str) -> list[str]:
+    """Lowercased word tokens; a trailing "*" is kept to mark a prefix term."""
+    return QUERY_TOKEN_RE.findall((query or "").lower())[:16]
+
+
+def _matches(tokens, filters):
+    """
+    (select, from_where, params) matching `tokens` for the current backend:
+    select yields (id, score), lower score = more relevant.
+    """
+    if connection.vendor == "sqlite":
+        # every token must match (implicit AND); quoting keeps AND/OR/NOT literal
+        expr = " ".join(f'"{t[:-1]}"*' if t.endswith("*") else f'"{t}"' for t in tokens)
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        select = f"SELECT rowid AS id, bm25({FTS_TABLE}, {weights}) AS score"
+        from_where, params, id_col = f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expr], "rowid"
+    else:
+        expr = " & ".join(f"{t[:-1]}:*" if t.endswith("*") else t for t in tokens)
+        select = f"SELECT id, -ts_rank_cd({PG_COLUMN}, q) AS score"
+        from_where = f"FROM {TABLE}, to_tsquery('english', %s) AS q WHERE {PG_COLUMN} @@ q"
+        params, id_col = [expr], "id"
+    if filters:
+        sub_sql, sub_params = filtered(**filters).values("id").query.sql_with_params()
+        from_where += f" AND {id_col} IN ({sub_sql})"
+        params += list(sub_params)
+    return select, from_where, params
+
+
+def search_page(query: str, number: int = 1, size: int = PAGE_SIZE, **filters) -> KeysetPage:
+    """
+    Relevance-ordered page of Optimizations matching `query`.
+    The page number doubles as the cursor so the Library template can link it.
+    """
+    number = max(1, number)
+    tokens = query_tokens(query)
+    if not tokens:
+        return KeysetPage([], None, None, 0, number)
+
+    offset = (number - 1) * size
+    if connection.vendor not in ("sqlite", "postgresql"):
+        qs = filtered(**filters)
+        for t in (t.rstrip("*") for t in tokens):
+            qs = qs.filter(Q(keyword__icontains=t) | Q(title__icontains=t) | Q(description__icontains=t))
+        ids = list(qs.order_by("-created_at", "-id").values_list("id", flat=True)[offset:offset + size + 1])
+        total = qs.count()
+    else:
+        select, from_where, params = _matches(tokens, filters)
+        with connection.cursor() as cur:
+            cur.execute(f"{select} {from_where} ORDER BY score, id DESC LIMIT %s OFFSET %s",
+                        params + [size + 1, offset])
+            ids = [row[0] for row in cur.fetchall()]
+            cur.execute(f"SELECT COUNT(*) {from_where}", params)
+            total = cur.fetchone()[0]
+
+    has_more = len(ids) > size
+    ids = ids[:size]
+    rows = filtered().in_bulk(ids)
+    return KeysetPage(
+        [rows[i] for i in ids if i in rows],
+        next_cursor=str(number + 1) if has_more else None,
+        prev_cursor=str(number - 1) if number > 1 else None,
+        total=total,
+        number=number,
+    )
@@ -0,0 +1,402 @@
+# web/services/seo_rules.py
+"""
+Declarative SEO pillar rules (YT ranking blueprint).
+
+Every pillar is a list of rules; every rule is an ordered list of tiers and the
+first tier whose condition holds fires (the table form of an if/elif chain).
+Patterns, thresholds, points and messages all live in the table below and are
+built once at import. `evaluate()` can optionally record per-rule call counts,
+hit counts and time spent, see `rule_stats()`.
+"""
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from django.conf import settings
+
+from . import similarity
+
+# ---------------- vocabularies & precompiled patterns ----------------
+
+POWER_WORDS = {
+    "secret", "secrets", "mistake", "mistakes", "hidden", "insane", "crazy",
+    "shocking", "simple", "easy", "ultimate", "pro", "advanced", "powerful",
+    "killer", "dangerous", "hack", "hacks", "fix", "fixes", "broken"
+}
+
+CURIOSITY_PHRASES = [
+    "no one tells you",
+    "nobody tells you",
+    "what no one",
+    "what nobody",
+    "the truth about",
+    "you won't believe",
+    "stop doing this",
+    "before you",
+    "no one is talking about",
+]
+
+LOSS_AVERSION_WORDS = {
+    "stop", "avoid", "never", "lose", "losing", "wasting", "ruin", "kill"
+}
+
+HOOK_PHRASES = ["in this video", "you will learn", "we cover", "step-by-step", "tutorial"]
+SESSION_PHRASES = ["watch next", "next video", "playlist", "series", "part 2", "episode 2"]
+
+WORD_RE = re.compile(r"[A-Za-z0-9']+")
+CHAPTERS_RE = re.compile(r"\b\d{1,2}:\d{2}(:\d{2})?\b")   # 0:00, 12:34, 1:02:45
+NUMBER_RE = re.compile(r"\b\d+\b")
+DIRECT_ADDRESS_RE = re.compile(r"\byou\b|\byour\b")
+SERIES_RE = re.compile(r"\bpart\s+\d+\b|\bepisode\s+\d+\b")
+CURIOSITY_RE = re.compile("|".join(re.escape(p) for p in CURIOSITY_PHRASES))
+HOOK_RE = re.compile("|".join(re.escape(p) for p in HOOK_PHRASES))
+SESSION_RE = re.compile("|".join(re.escape(p) for p in SESSION_PHRASES))
+
+
+# ---------------- scoring context (lazy, memoized features) ----------------
+
+class PackageContext:
+    """
+    Inputs of one video package plus derived features. Features are computed on
+    first use, so per-rule timing charges each feature to the rule that needs it.
+    """
+
+    def __init__(self, main_keyword, title, description, tags_list, entities,
+                 env_stats, has_custom_thumbnail, in_playlists, closest_title=None):
+        self.kw = (main_keyword or "").strip().lower()
+        self.title = (title or "").strip()
+        self.desc = (description or "").strip()
+        self.tags = [t.strip().lower() for t in (tags_list or []) if t and t.strip()]
+        self.entities = entities or []
+        self.env = env_stats or {}
+        self.has_custom_thumbnail = has_custom_thumbnail
+        self.in_playlists = in_playlists
+        # (similarity, title, source) of the nearest existing title, see similarity.closest
+        self.closest_title = closest_title
+
+    @cached_property
+    def title_lc(self) -> str:
+        return self.title.lower()
+
+    @cached_property
+    def desc_lc(self) -> str:
+        return self.desc.lower()
+
+    @cached_property
+    def title_words(self) -> List[str]:
+        return WORD_RE.findall(self.title_lc)
+
+    @cached_property
+    def desc_words(self) -> int:
+        return len(WORD_RE.findall(self.desc))
+
+    @cached_property
+    def ent_matches(self) -> int:
+        return sum(
+            1 for e in self.entities
+            if e.lower() in self.title_lc or e.lower() in self.desc_lc
+        )
+
+    @cached_property
+    def power_words(self) -> int:
+        return sum(1 for w in self.title_words if w in POWER_WORDS)
+
+    @cached_property
+    def loss_aversion_words(self) -> int:
+        return sum(1 for w in self.title_words if w in LOSS_AVERSION_WORDS)
+
+    @cached_property
+    def median_views(self) -> int:
+        return self.env.get("median_views", 0)
+
+    @property
+    def title_similarity(self) -> float:
+        return self.closest_title[0] if self.closest_title else 0.0
+
+    @property
+    def title_similarity_pct(self) -> int:
+        return int(self.title_similarity * 100)
+
+    @property
+    def similar_title(self) -> str:
+        return self.closest_title[1] if self.closest_title else ""
+
+    @property
+    def similar_source(self) -> str:
+        return self.closest_title[2] if self.closest_title else ""
+
+
+# ---------------- rule table ----------------
+
+Points = Union[int, Callable[[PackageContext], int]]
+
+
+@dataclass(frozen=True)
+class Tier:
+    when: Callable[[PackageContext], bool]
+    points: Points = 0
+    detail: Optional[str] = None   # str.format(c=ctx) template
+    fix: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    tiers: Tuple[Tier, ...]
+
+
+@dataclass(frozen=True)
+class Pillar:
+    name: str
+    max: int
+    rules: Tuple[Rule, ...] = field(default_factory=tuple)
+
+
+def _always(c):
+    return True
+
+
+PILLARS: Tuple[Pillar, ...] = (
+    Pillar("Search Relevance", 30, (
+        Rule("kw_in_title", (
+            Tier(lambda c: c.kw and c.kw in c.title_lc, 8, "Main keyword present in title."),
+            Tier(lambda c: bool(c.kw), 0, "Keyword is missing from title.",
+                 "Include the main keyword in the title."),
+        )),
+        Rule("kw_early_in_title", (
+            Tier(lambda c: c.kw and 0 <= c.title_lc.find(c.kw) <= 15, 4,
+                 "Keyword appears early in the title."),
+        )),
+        Rule("kw_in_description", (
+            Tier(lambda c: c.kw and c.kw in c.desc_lc[:80], 6, "Keyword appears early in the description."),
+            Tier(lambda c: c.kw and c.kw in c.desc_lc, 3, "Keyword appears in the description (not early)."),
+            Tier(lambda c: bool(c.kw), 0, None,
+                 "Mention the main keyword near the start of the description."),
+        )),
+        Rule("description_length_search", (
+            Tier(lambda c: c.desc_words == 0, 0, "No description text.",
+                 "Add a descriptive, keyword-rich description (min 150–250 words)."),
+            Tier(lambda c: c.desc_words < 120, 4,
+                 "Short description – add more context and variations of your keyword.",
+                 "Expand the description to better explain the content and include related phrases."),
+            Tier(lambda c: c.desc_words <= 350, 8, "Solid description length for Search."),
+            Tier(_always, 6, "Very detailed description – good for Search, ensure it remains readable."),
+        )),
+        Rule("serp_entities", (
+            Tier(lambda c: c.ent_matches > 0, lambda c: min(8, c.ent_matches * 2),
+                 "Includes {c.ent_matches} important topic entities from top results."),
+            Tier(_always, 0, "Does not clearly reflect SERP entities in title/description.",
+                 "Include 2–4 of the important terms your competitors use (entities)."),
+        )),
+        Rule("tags", (
+            Tier(lambda c: c.tags and c.kw and any(c.kw in t for t in c.tags), 2,
+                 "Keyword appears in tags (ok but low-importance)."),
+            Tier(lambda c: len(c.tags) >= 5, 1, "Tags present (low-importance)."),
+        )),
+    )),
+    Pillar("Click-Through Potential", 25, (
+        Rule("title_length", (
+            Tier(lambda c: len(c.title) == 0, 0, "No title – cannot generate clicks.",
+                 "Add a compelling title (≤ 70 characters)."),
+            Tier(lambda c: len(c.title) <= 70, 6, "Title length is within the recommended range."),
+            Tier(_always, 3, "Title is quite long; may get truncated on mobile.",
+                 "Shorten the title so the key hook fits in the first ~60–70 characters."),
+        )),
+        Rule("power_words", (
+            Tier(lambda c: c.power_words >= 2, 5, "Title uses strong emotional/power words to stand out."),
+            Tier(lambda c: c.power_words == 1, 3, "Title includes one emotional/power word."),
+            Tier(_always, 0, "Title may be too neutral; consider adding one emotional/power word."),
+        )),
+        Rule("curiosity_gap", (
+            Tier(lambda c: CURIOSITY_RE.search(c.title_lc) is not None, 4,
+                 "Title creates a curiosity gap (very good for CTR)."),
+        )),
+        Rule("loss_aversion", (
+            Tier(lambda c: c.loss_aversion_words >= 1, 2,
+                 "Title uses loss-aversion language (e.g., 'stop', 'avoid')."),
+        )),
+        Rule("number_in_title", (
+            Tier(lambda c: NUMBER_RE.search(c.title) is not None, 3,
+                 "Number in the title suggests structure (lists, steps)."),
+        )),
+        Rule("direct_address", (
+            Tier(lambda c: DIRECT_ADDRESS_RE.search(c.title_lc) is not None, 2,
+                 "Title speaks directly to the viewer ('you', 'your')."),
+        )),
+        Rule("title_uniqueness", (
+            Tier(lambda c: c.title_similarity >= similarity.NEAR_DUPLICATE, 0,
+                 "Title is nearly identical to “{c.similar_title}” "
+                 "({c.similar_source}, ~{c.title_similarity_pct}% overlap).",
+                 "Make the title clearly distinct from titles already ranking or saved in your Library."),
+            Tier(lambda c: c.title_similarity >= similarity.SIMILAR, 0,
+                 "Title closely resembles “{c.similar_title}” "
+                 "({c.similar_source}, ~{c.title_similarity_pct}% overlap)."),
+            Tier(lambda c: c.closest_title is not None, 0,
+                 "Title is distinct from titles already ranking and in your Library."),
+        )),
+        Rule("custom_thumbnail", (
+            Tier(lambda c: c.has_custom_thumbnail, 3, "Custom thumbnail enabled – critical for CTR."),
+            Tier(_always, 0, None,
+                 "Design and upload a custom thumbnail; default frames perform poorly for CTR."),
+        )),
+    )),
+    Pillar("Retention Potential", 25, (
+        Rule("description_length_retention", (
+            Tier(lambda c: c.desc_words == 0, 0,
+                 "No description – hard to set expectations or reinforce the hook."),
+            Tier(lambda c: c.desc_words < 80, 4, "Very short description – add more context and structure."),
+            Tier(lambda c: c.desc_words <= 300, 8, "Good description length for setting expectations."),
+            Tier(_always, 6, "Long description – may be strong if well structured."),
+        )),
+        Rule("chapters", (
+            Tier(lambda c: CHAPTERS_RE.search(c.desc) is not None, 7,
+                 "Description includes timestamps/chapters – helps segment-based retention."),
+            Tier(_always, 0, None,
+                 "Add timestamps/chapters in the description for easier navigation and better retention."),
+        )),
+        Rule("description_hook", (
+            Tier(lambda c: HOOK_RE.search(c.desc_lc[:200]) is not None, 5,
+                 "First lines clearly state the value and structure (good hook for retention)."),
+            Tier(_always, 0, None,
+                 "Use the first 1–2 lines of the description to clearly state what the viewer will get."),
+        )),
+        Rule("series", (
+            Tier(lambda c: SERIES_RE.search(c.desc_lc) is not None, 3,
+                 "Part of a series – can improve binge-watching and overall retention."),
+        )),
+    )),
+    Pillar("Environment & Session", 20, (
+        Rule("competition", (
+            Tier(lambda c: c.median_views == 0, 6, "No clear competition data – environment may be open."),
+            Tier(lambda c: c.median_views < 50000, 10,
+                 "Median views ≈ {c.median_views:,} – relatively low competition."),
+            Tier(lambda c: c.median_views <= 200000, 7,
+                 "Median views ≈ {c.median_views:,} – moderate competition."),
+            Tier(_always, 4,
+                 "Median views ≈ {c.median_views:,} – heavy competition; title/thumbnail must be exceptional.",
+                 "Environment is competitive – lean harder into a bold hook and strong thumbnail contrast."),
+        )),
+        Rule("playlists", (
+            Tier(lambda c: c.in_playlists, 5,
+                 "Video will be in playlists – good for session time and binge-watching."),
+            Tier(_always, 0, None,
+                 "Add this video to at least one relevant playlist to increase session watch time."),
+        )),
+        Rule("session_cta", (
+            Tier(lambda c: SESSION_RE.search(c.desc_lc) is not None, 5,
+                 "Description hints at next videos/playlist – good for extending sessions."),
+            Tier(_always, 0, None,
+                 "Add a clear call-to-action to a relevant 'next video' or playlist to extend session time."),
+        )),
+    )),
+)
+
+
+# ---------------- profiling counters ----------------
+
+_stats_lock = threading.Lock()
+# rule id -> [calls, hits (points awarded), total ns]
+_rule_stats: Dict[str, List[int]] = {}
+
+
+def rule_stats() -> Dict[str, dict]:
+    """Snapshot of per-rule counters, most expensive first."""
+    with _stats_lock:
+        items = [(rid, list(v)) for rid, v in _rule_stats.items()]
+    out = {}
+    for rid, (calls, hits, ns) in sorted(items, key=lambda kv: kv[1][2], reverse=True):
+        out[rid] = {
+            "calls": calls,
+            "hits": hits,
+            "hit_rate": hits / calls if calls else 0.0,
+            "total_ms": ns / 1e6,
+            "avg_us": ns / calls / 1e3 if calls else 0.0,
+        }
+    return out
+
+
+def reset_rule_stats():
+    with _stats_lock:
+        _rule_stats.clear()
+
+
+def _record(rule_id: str, hit: bool, ns: int):
+    with _stats_lock:
+        s = _rule_stats.setdefault(rule_id, [0, 0, 0])
+        s[0] += 1
+        s[1] += 1 if hit else 0
+        s[2] += ns
+
+
+# ---------------- evaluator ----------------
+
+def _compile(pillars):
+    """Flatten the table into tuples, pre-resolving static points/messages."""
+    compiled = []
+    for pillar in pillars:
+        rules = []
+        for rule in pillar.rules:
+            tiers = tuple(
+                (
+                    t.when,
+                    t.points,
+                    callable(t.points),
+                    t.detail,
+                    bool(t.detail) and "{" in t.detail,
+                    t.fix,
+                )
+                for t in rule.tiers
+            )
+            rules.append((rule.id, tiers))
+        compiled.append((pillar.name, pillar.max, tuple(rules)))
+    return tuple(compiled)
+
+
+_COMPILED = _compile(PILLARS)
+
+
+def evaluate(ctx: PackageContext, profile: bool = None):
+    """
+    Run every pillar over `ctx`.
+    Returns (overall_score, pillars:dict, fixes:list) like score_holistic_package.
+    `profile` defaults to settings.SEO_RULE_PROFILING.
+    """
+    if profile is None:
+        profile = getattr(settings, "SEO_RULE_PROFILING", False)
+
+    fixes: list[str] = []
+    pillars: dict[str, dict] = {}
+    overall = 0
+
+    for name, max_score, rules in _COMPILED:
+        score = 0
+        details = []
+        for rule_id, tiers in rules:
+            if profile:
+                t0 = time.perf_counter_ns()
+            points = 0
+            for when, pts, pts_dynamic, detail, templated, fix in tiers:
+                if when(ctx):
+                    points = pts(ctx) if pts_dynamic else pts
+                    score += points
+                    if detail:
+                        details.append(detail.format(c=ctx) if templated else detail)
+                    if fix:
+                        fixes.append(fix)
+                    break
+            if profile:
+                _record(rule_id, points > 0, time.perf_counter_ns() - t0)
+
+        score = min(max_score, max(0, score))
+        pillars[name] = {
+            "score": score,
+            "max": max_score,
+            "pct": int(score / max_score * 100) if max_score else 0,
+            "details": details,
+        }
+        overall += score
+
+    return max(0, min(100, overall)), pillars, fixes
@@ -0,0 +1,99 @@
+# web/services/serp_stats.py
+"""Pure helpers that summarise a SERP (list of search_videos() dicts)."""
+import math
+import re
+from collections import Counter
+
+from . import metrics
+
+STOPWORDS = {
+    "the", "a", "an", "and", "or", "for", "with", "without", "in", "on", "of", "to", "from", "by", "at", "is", "are",
+    "be", "this", "that", "those", "these", "it", "its", "as", "you", "your", "yours", "ours", "we", "us", "our",
+    "how", "what", "why", "when", "where", "who", "will", "can", "could", "should", "would", "i", "me", "my",
+    "vs", "vs.", "&", "-", "_", "best", "new", "top", "2023", "2024", "2025"
+}
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+
+
+def tokenize(text: str):
+    if not text:
+        return []
+    words = TOKEN_RE.findall(text.lower())
+    return [w for w in words if len(w) >= 3 and w not in STOPWORDS]
+
+
+@metrics.timed("entities")
+def extract_top_entities(strings, top_k=10):
+    counter = Counter()
+    for s in strings:
+        counter.update(tokenize(s))
+    return [w for w, _ in counter.most_common(top_k)]
+
+
+def serp_entities(serp, top_k=10):
+    corpus = [(v["title"] or "") + " " + (v["description"] or "") for v in serp]
+    return extract_top_entities(corpus, top_k=top_k)
+
+
+def env_stats_from_serp(serp):
+    """Compute environment difficulty stats from SERP (views, likes, comments)."""
+    if not serp:
+        return {
+            "median_views": 0,
+            "median_likes_per_1k": 0.0,
+            "median_comments_per_1k": 0.0,
+        }
+    views_list = [v["views"] for v in serp if v.get("views") is not None]
+    if not views_list:
+        views_list = [0]
+    views_sorted = sorted(views_list)
+    mid = len(views_sorted) // 2
+    if len(views_sorted) % 2 == 0:
+        median_views = (views_sorted[mid - 1] + views_sorted[mid]) / 2
+    else:
+        median_views = views_sorted[mid]
+
+    likes_per_1k = []
+    comments_per_1k = []
+    for v in serp:
+        vw = max(v.get("views") or 0, 1)
+        likes = v.get("likes") or 0
+        comments = v.get("comments") or 0
+        likes_per_1k.append(likes * 1000 / vw)
+        comments_per_1k.append(comments * 1000 / vw)
+    likes_per_1k.sort()
+    comments_per_1k.sort()
+    mid_l = len(likes_per_1k) // 2
+    mid_c = len(comments_per_1k) // 2
+    med_likes_1k = likes_per_1k[mid_l] if likes_per_1k else 0.0
+    med_comments_1k = comments_per_1k[mid_c] if comments_per_1k else 0.0
+
+    return {
+        "median_views": int(median_views),
+        "median_likes_per_1k": med_likes_1k,
+        "median_comments_per_1k": med_comments_1k,
+    }
+
+
+def difficulty_score(views) -> int:
+    return min(100, int(math.log10(views + 1) * 20))
+
+
+def ranking_difficulty(serp):
+    """(#1 difficulty, #5 difficulty) from the most-viewed results."""
+    if not serp:
+        return 0, 0
+    top_sorted = sorted((v["views"] for v in serp), reverse=True)
+    top1 = top_sorted[0]
+    top5 = top_sorted[4] if len(top_sorted) >= 5 else top_sorted[-1]
+    return difficulty_score(top1), difficulty_score(top5)
+
+
+def sentiment(like_ratio):
+    """(emoji, text) for a SERP's likes-per-view ratio (None when unknown)."""
+    if like_ratio is None or like_ratio < 0.01:
+        return "😞", "People don't seem to like these videos"
+    if like_ratio < 0.04:
+        return "😐", "Audience sentiment looks average"
+    return "😊", "Audience seems to like these videos"
@@ -0,0 +1,93 @@
+# web/services/similarity.py
+"""
+MinHash sketches for near-duplicate title detection.
+
+A title becomes a set of character 3-grams; its sketch is the minimum of each
+of NUM_PERM independent 32-bit hashes over that set (two 64-byte BLAKE2b
+digests per 3-gram supply the 32 values). The share of equal positions in two
+sketches estimates the Jaccard overlap of their 3-gram sets. For sublinear
+lookup the first BANDS * ROWS values are cut into BANDS bands of ROWS (LSH):
+two titles share a band bucket with probability 1 - (1 - J^ROWS)^BANDS, i.e.
+~0.91 at Jaccard 0.6 (SIMILAR), ~0.999 at 0.8 and ~0.24 at 0.3, so only rows
+in the same buckets need an exact comparison. Changing NUM_PERM, BANDS or
+ROWS means re-banding every stored title (see migration 0014).
+
+Titles are casefolded and split on non-word characters, so any script
+(Cyrillic, CJK, Arabic, ...) gets a sketch, not only Latin text.
+"""
+import hashlib
+import re
+import struct
+from functools import lru_cache
+
+NUM_PERM = 32
+BANDS = 10
+ROWS = 3                # BANDS * ROWS <= NUM_PERM
+
+NEAR_DUPLICATE = 0.8   # estimated Jaccard: reads as the same title
+SIMILAR = 0.6          # close variant of the same title
+
+_HALF = struct.Struct(f">{NUM_PERM // 2}I")      # one 64-byte digest
+_PACK = struct.Struct(f">{NUM_PERM}I")
+_BAND = struct.Struct(f">B{ROWS}I")
+_NORMALIZE_RE = re.compile(r"[\W_]+")
+
+
+def _normalize(title: str) -> str:
+    return _NORMALIZE_RE.sub(" ", (title or "").casefold()).strip()
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hashes(gram: str):
+    data = gram.encode("utf-8")
+    return (
+        _HALF.unpack(hashlib.blake2b(data, digest_size=64, person=b"ytbseo-mh-0").digest())
+        + _HALF.unpack(hashlib.blake2b(data, digest_size=64, person=b"ytbseo-mh-1").digest())
+    )
+
+
+def signature(title: str):
+    """Tuple of NUM_PERM 32-bit min-hashes, or None for an empty title."""
+    text = _normalize(title)
+    if not text:
+        return None
+    padded = f" {text} "
+    grams = {padded[i:i + 3] for i in range(len(padded) - 2)}
+    return tuple(map(min, zip(*map(_shingle_hashes, grams))))
+
+
+def pack(sig) -> bytes:
+    return _PACK.pack(*sig)
+
+
+def unpack(data) -> tuple:
+    return _PACK.unpack(bytes(data))
+
+
+def band_keys(sig):
+    """One signed 64-bit bucket key per LSH band (band number is part of the key)."""
+    keys = []
+    for band in range(BANDS):
+        raw = _BAND.pack(band, *sig[band * ROWS:(band + 1) * ROWS])
+        keys.append(int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big", signed=True))
+    return keys
+
+
+def estimate(a, b) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def closest(sig, candidates):
+    """
+    candidates: iterable of (signature, title, source).
+    Returns (similarity, title, source) of the most similar candidate, or None.
+    """
+    best = None
+    for other, title, source in candidates:
+        if other is None:
+            continue
+        s = estimate(sig, other)
+        if best is None or s > best[0]:
+            best = (s, title, source)
+    return best
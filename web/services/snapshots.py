@@ -0,0 +1,187 @@
+# web/services/snapshots.py
+"""
+Compact SERP snapshots (SerpSnapshot.data).
+
+A snapshot is the ranked list of (video id, views, likes, comments) from one
+fetch. Rank is the position, so it costs nothing. Encoding, before zlib:
+
+    varint n | flags | ids | views | likes | comments
+
+- ids: 8 bytes each. A YouTube id is 11 base64url characters and the 11th
+  only carries 4 bits, so it packs into exactly 64 bits. If any id does not
+  fit, the flag is set and ids are stored as "\\n"-joined text instead.
+- each numeric column: varint byte length, then one unsigned LEB128 varint
+  per row. The length prefix lets decode() skip columns nobody asked for.
+
+Blob = version byte + zlib(body). A 15-result snapshot is ~250 bytes.
+"""
+import struct
+import zlib
+
+from django.utils import timezone
+
+from ..models import SerpSnapshot
+
+VERSION = 1
+FLAG_RAW_IDS = 0x01
+COLUMNS = ("ids", "views", "likes", "comments")
+NUMERIC = COLUMNS[1:]
+
+_B64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+_B64_INDEX = {c: i for i, c in enumerate(_B64)}
+_U64 = struct.Struct(">Q")
+
+
+# ---------------- video ids ----------------
+
+def pack_id(video_id: str):
+    """8 bytes for a canonical 11-char YouTube id, else None."""
+    if len(video_id or "") != 11:
+        return None
+    value = 0
+    for ch in video_id[:10]:
+        i = _B64_INDEX.get(ch)
+        if i is None:
+            return None
+        value = (value << 6) | i
+    last = _B64_INDEX.get(video_id[10])
+    if last is None or last % 4:
+        return None
+    return _U64.pack((value << 4) | (last >> 2))
+
+
+def unpack_id(data: bytes) -> str:
+    value = _U64.unpack(data)[0]
+    chars = [_B64[(value & 0xF) << 2]]
+    value >>= 4
+    for _ in range(10):
+        chars.append(_B64[value & 0x3F])
+        value >>= 6
+    return "".join(reversed(chars))
+
+
+# ---------------- varints ----------------
+
+def _put_varint(out: bytearray, n: int):
+    n = max(0, int(n or 0))
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf, pos: int):
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _varint_column(values) -> bytes:
+    col = bytearray()
+    for v in values:
+        _put_varint(col, v)
+    return bytes(col)
+
+
+# ---------------- encode / decode ----------------
+
+def encode(serp) -> bytes:
+    """serp: ranked list of search_videos() dicts."""
+    ids = [v.get("id") or "" for v in serp]
+    packed = [pack_id(i) for i in ids]
+    flags = 0 if all(packed) else FLAG_RAW_IDS
+
+    body = bytearray()
+    _put_varint(body, len(serp))
+    body.append(flags)
+    if flags & FLAG_RAW_IDS:
+        raw = "\n".join(ids).encode("utf-8")
+        _put_varint(body, len(raw))
+        body += raw
+    else:
+        body += b"".join(packed)
+    for name in NUMERIC:
+        col = _varint_column(v.get(name) for v in serp)
+        _put_varint(body, len(col))
+        body += col
+    return bytes([VERSION]) + zlib.compress(bytes(body), 9)
+
+
+def decode(blob, columns=COLUMNS) -> dict:
+    """Decode only the requested columns; returns {column: list} plus "count"."""
+    blob = bytes(blob)
+    if not blob or blob[0] != VERSION:
+        raise ValueError("Unknown SERP snapshot format")
+    body = zlib.decompress(blob[1:])
+    wanted = set(columns)
+    n, pos = _get_varint(body, 0)
+    flags = body[pos]
+    pos += 1
+    out = {"count": n}
+
+    if flags & FLAG_RAW_IDS:
+        size, pos = _get_varint(body, pos)
+        if "ids" in wanted:
+            out["ids"] = body[pos:pos + size].decode("utf-8").split("\n") if n else []
+        pos += size
+    else:
+        if "ids" in wanted:
+            out["ids"] = [unpack_id(body[p:p + 8]) for p in range(pos, pos + 8 * n, 8)]
+        pos += 8 * n
+
+    for name in NUMERIC:
+        size, pos = _get_varint(body, pos)
+        if name in wanted:
+            values, p = [], pos
+            for _ in range(n):
+                v, p = _get_varint(body, p)
+                values.append(v)
+            out[name] = values
+        pos += size
+    return out
+
+
+# ---------------- storage ----------------
+
+def _normalize(keyword: str) -> str:
+    return " ".join((keyword or "").lower().split())
+
+
+def record(keyword: str, region: str, serp, rank_check: bool = False):
+    """
+    Store one snapshot of a fetched SERP (no-op for an empty keyword/result).
+    `rank_check` marks the rank tracker's full-depth checks.
+    """
+    kw = _normalize(keyword)
+    if not kw or not serp:
+        return None
+    return SerpSnapshot.objects.create(
+        keyword=kw, region=region, count=len(serp), data=encode(serp), fetched_at=timezone.now(),
+        rank_check=rank_check,
+    )
+
+
+def history(keyword: str, region: str, columns=("views",), limit: int = 30, rank_checks: bool = False):
+    """Newest-first [(fetched_at, {column: list, "count": n})] for a keyword (rank checks only if asked)."""
+    qs = SerpSnapshot.objects.filter(keyword=_normalize(keyword), region=region)
+    if rank_checks:
+        qs = qs.filter(rank_check=True)
+    rows = qs.order_by("-fetched_at").values_list("fetched_at", "data")[:limit]
+    return [(fetched_at, decode(data, columns)) for fetched_at, data in rows]
+
+
+def rank_history(keyword: str, region: str, video_id: str, limit: int = 30):
+    """
+    Newest-first [(fetched_at, rank or None)] for one video from the rank
+    tracker's checks, which all go to the same depth; decodes the ids column only.
+    """
+    out = []
+    for fetched_at, cols in history(keyword, region, columns=("ids",), limit=limit, rank_checks=True):
+        ids = cols["ids"]
+        out.append((fetched_at, ids.index(video_id) + 1 if video_id in ids else None))
+    return out
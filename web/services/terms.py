@@ -0,0 +1,58 @@
+# web/services/terms.py
+"""
+Normalized Tag/Entity links for Optimizations.
+
+`tags_text` and `entities` stay the source of truth (comma-joined, as typed);
+link_terms() mirrors them into the Tag/Entity tables so filters and aggregates
+run as indexed joins. It works on whatever model class it is given, so data
+migrations can pass their historical models.
+"""
+MAX_TERM_LEN = 100
+LINKED_FIELDS = (("tags", "tags_text"), ("mentions", "entities"))
+QUERY_CHUNK = 500
+
+
+def split_terms(text: str) -> list[str]:
+    """Comma-joined text -> unique lowercase terms, in first-seen order."""
+    seen = {}
+    for part in (text or "").split(","):
+        term = " ".join(part.lower().split())[:MAX_TERM_LEN]
+        if term:
+            seen.setdefault(term, None)
+    return list(seen)
+
+
+def _chunks(items, size=QUERY_CHUNK):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def link_terms(model, rows, replace=True):
+    """
+    Create missing Tag/Entity rows and (re)write the M2M links for `rows`
+    (saved Optimization instances of `model`) in a handful of bulk queries.
+    """
+    rows = [r for r in rows if r.pk is not None]
+    if not rows:
+        return
+    for field_name, source_attr in LINKED_FIELDS:
+        field = model._meta.get_field(field_name)
+        term_model, through = field.remote_field.model, field.remote_field.through
+        src, dst = f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+
+        wanted = {r.pk: split_terms(getattr(r, source_attr)) for r in rows}
+        names = set().union(*wanted.values())
+        ids = {}
+        for chunk in _chunks(names):
+            term_model.objects.bulk_create([term_model(name=n) for n in chunk], ignore_conflicts=True)
+            ids.update(term_model.objects.filter(name__in=chunk).values_list("name", "id"))
+
+        if replace:
+            for chunk in _chunks(wanted):
+                through.objects.filter(**{f"{src}__in": chunk}).delete()
+        through.objects.bulk_create(
+            [through(**{src: pk, dst: ids[n]}) for pk, terms in wanted.items() for n in terms],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
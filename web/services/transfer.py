@@ -0,0 +1,151 @@
+# web/services/transfer.py
+"""
+Bulk export/import of Library rows as CSV or JSON Lines.
+
+Export streams: rows come from a server-side `iterator()` in id order and are
+encoded one at a time, so memory stays flat however large the Library is.
+Import parses the file lazily and inserts with `bulk_create` in one
+transaction per batch, then fills the derived data that save() would have
+written (title sketches, Tag/Entity links, rollups) for the whole batch.
+"""
+import csv
+import json
+import time
+from datetime import timezone as dt_timezone
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import Optimization, TitleBand
+from . import rollups, similarity, terms, versions
+from .csvstream import line_writer
+from .youtube import parse_video_id
+
+FORMATS = ("csv", "jsonl")
+FIELDS = (
+    "keyword", "title", "description", "tags_text", "entities",
+    "score", "has_custom_thumbnail", "in_playlists", "created_at", "video_id",
+)
+CHUNK_SIZE = 2000
+BATCH_SIZE = 1000
+CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson; charset=utf-8"}
+
+
+# ---------------- export ----------------
+
+def iter_rows(queryset=None, chunk_size=CHUNK_SIZE):
+    qs = queryset if queryset is not None else Optimization.objects.all()
+    for values in qs.order_by("id").values_list(*FIELDS).iterator(chunk_size=chunk_size):
+        row = dict(zip(FIELDS, values))
+        row["created_at"] = row["created_at"].isoformat() if row["created_at"] else ""
+        yield row
+
+
+def iter_csv(rows):
+    writer = line_writer()
+    yield writer.writerow(FIELDS)
+    for row in rows:
+        yield writer.writerow([row[f] for f in FIELDS])
+
+
+def iter_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def iter_export(fmt, queryset=None):
+    rows = iter_rows(queryset)
+    return iter_csv(rows) if fmt == "csv" else iter_jsonl(rows)
+
+
+# ---------------- import ----------------
+
+def read_rows(fileobj, fmt):
+    """Lazily parse a text file object into row dicts."""
+    if fmt == "csv":
+        yield from csv.DictReader(fileobj)
+    else:
+        for line in fileobj:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def build(row) -> Optimization:
+    opt = Optimization(
+        keyword=(row.get("keyword") or "")[:200],
+        title=(row.get("title") or "")[:200],
+        description=row.get("description") or "",
+        tags_text=(row.get("tags_text") or "")[:500],
+        entities=row.get("entities") or "",
+        score=max(0, int(row.get("score") or 0)),
+        has_custom_thumbnail=_bool(row.get("has_custom_thumbnail")),
+        in_playlists=_bool(row.get("in_playlists")),
+        video_id=parse_video_id(row.get("video_id") or ""),     # tracked video, see rank_tracking
+    )
+    sig = similarity.signature(opt.title)
+    opt.title_minhash = similarity.pack(sig) if sig else None
+    created = row.get("created_at")
+    created = parse_datetime(created) if isinstance(created, str) and created else None
+    if created and timezone.is_naive(created):
+        created = timezone.make_aware(created, dt_timezone.utc)
+    opt._imported_created_at = created
+    return opt
+
+
+def _restore_dates(objs):
+    """Put exported created_at back (bulk_update's CASE expressions cost ~1 ms/row)."""
+    if not objs:
+        return
+    for o in objs:
+        o.created_at = o._imported_created_at
+    field = Optimization._meta.get_field("created_at")
+    table = connection.ops.quote_name(Optimization._meta.db_table)
+    with connection.cursor() as cur:
+        cur.executemany(
+            f"UPDATE {table} SET created_at = %s WHERE id = %s",
+            [(field.get_db_prep_value(o.created_at, connection), o.pk) for o in objs],
+        )
+
+
+def _insert_batch(objs, keep_dates=True):
+    with transaction.atomic():
+        Optimization.objects.bulk_create(objs)     # auto_now_add stamps created_at here
+        if keep_dates:
+            _restore_dates([o for o in objs if o._imported_created_at])
+        # 8 band rows per title: a plain executemany skips per-object model overhead
+        with connection.cursor() as cur:
+            cur.executemany(
+                f"INSERT INTO {connection.ops.quote_name(TitleBand._meta.db_table)} (optimization_id, bucket) "
+                f"VALUES (%s, %s)",
+                [(o.pk, key) for o in objs if o.title_minhash
+                 for key in similarity.band_keys(similarity.unpack(o.title_minhash))],
+            )
+        terms.link_terms(Optimization, objs, replace=False)
+        rollups.apply(added=objs)
+        versions.bump(versions.LIBRARY)
+
+
+def import_rows(rows, batch_size=BATCH_SIZE, keep_dates=True, log=None) -> dict:
+    """Insert parsed rows in batches; returns {"rows", "seconds", "rows_per_sec"}."""
+    started = time.perf_counter()
+    total = 0
+    rows = iter(rows)
+    while True:
+        objs = [build(r) for r in islice(rows, batch_size)]
+        if not objs:
+            break
+        _insert_batch(objs, keep_dates=keep_dates)
+        total += len(objs)
+        if log:
+            elapsed = time.perf_counter() - started
+            log(f"  {total} rows ({total / elapsed:,.0f} rows/s)")
+    elapsed = time.perf_counter() - started
+    return {"rows": total, "seconds": elapsed, "rows_per_sec": total / elapsed if elapsed else 0.0}
@@ -0,0 +1,39 @@
+# web/services/versions.py
+"""
+Data versions for cache keys and conditional GET.
+
+Writers call bump(name) inside the transaction that changes the data, so a
+reader that sees new rows also sees the new version. Anything keyed on
+(version, params) -- rendered fragments, ETags -- then goes stale by key
+change instead of by expiry, and updated_at is the Last-Modified time.
+Versions live in the database, so every worker process agrees on them.
+"""
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+LIBRARY = "library"
+
+
+def _model():
+    return apps.get_model("web", "DataVersion")
+
+
+def bump(name: str):
+    DataVersion = _model()
+    now = timezone.now()
+    if DataVersion.objects.filter(name=name).update(version=F("version") + 1, updated_at=now):
+        return
+    try:
+        with transaction.atomic():
+            DataVersion.objects.create(name=name, version=1, updated_at=now)
+    except IntegrityError:
+        # created concurrently since the update above
+        DataVersion.objects.filter(name=name).update(version=F("version") + 1, updated_at=now)
+
+
+def current(name: str):
+    """(version, updated_at); (0, None) for a data set that was never written."""
+    row = _model().objects.filter(name=name).values_list("version", "updated_at").first()
+    return row or (0, None)
@@ -1,12 +1,71 @@
+import asyncio
+import re
+
+import httpx
 import requests
 from django.conf import settings
 
-YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
-YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+from . import metrics
+from .cache import aget_many_cached, aset_many_cached
+
+YOUTUBE_SEARCH_URL = f"{settings.YOUTUBE_API_BASE_URL.rstrip('/')}/search"
+YOUTUBE_VIDEOS_URL = f"{settings.YOUTUBE_API_BASE_URL.rstrip('/')}/videos"
+YOUTUBE_CHANNELS_URL = f"{settings.YOUTUBE_API_BASE_URL.rstrip('/')}/channels"
+YOUTUBE_PLAYLIST_ITEMS_URL = f"{settings.YOUTUBE_API_BASE_URL.rstrip('/')}/playlistItems"
+TIMEOUT = 10
+
+# Data API quota costs
+SEARCH_UNITS = 100         # search.list, any maxResults
+VIDEOS_UNITS = 1           # videos.list, any parts
+CHANNELS_UNITS = 1         # channels.list
+PLAYLIST_ITEMS_UNITS = 1   # playlistItems.list, one page
+SEARCH_MAX_RESULTS = 50
+VIDEOS_BATCH = 50          # ids per videos.list call
+PLAYLIST_PAGE = 50         # items per playlistItems.list page
+
+LIST_SPLIT_RE = re.compile(r"[\s,]+")
+# watch?v= / youtu.be / shorts / embed / live URLs on YouTube hosts, or a bare id; the id must end there
+VIDEO_ID_RE = re.compile(
+    r"^(?:https?://)?(?:(?:www|m|music)\.)?"
+    r"(?:youtube(?:-nocookie)?\.com/(?:watch\?(?:[^#\s]*&)?v=|shorts/|embed/|live/|v/)|youtu\.be/)"
+    r"([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+    r"|^([A-Za-z0-9_-]{11})$"
+)
+# channel id (UC + 22), /channel/<id> URL, @handle or youtube.com/@handle
+CHANNEL_RE = re.compile(r"(?:^|/channel/)(UC[A-Za-z0-9_-]{22})(?:[/?#]|$)|(?:^|youtube\.com/)(@[A-Za-z0-9._-]{3,30})(?:[/?#]|$)")
 
 class YouTubeError(Exception):
     pass
 
+def parse_video_id(text: str):
+    """Video id from a watch/youtu.be/shorts/embed URL or a bare id, else None."""
+    m = VIDEO_ID_RE.search((text or "").strip())
+    return (m.group(1) or m.group(2)) if m else None
+
+def parse_video_ids(text: str):
+    """
+    (ids, rejected) from pasted URLs/ids separated by whitespace or commas:
+    unique ids in paste order, and entries that are not a video.
+    """
+    ids, rejected, seen = [], [], set()
+    for part in LIST_SPLIT_RE.split(text or ""):
+        if not part:
+            continue
+        vid = parse_video_id(part)
+        if vid is None:
+            rejected.append(part)
+        elif vid not in seen:
+            seen.add(vid)
+            ids.append(vid)
+    return ids, rejected
+
+def parse_channel(text: str):
+    """channels.list filter for a channel id, /channel/ URL or @handle: ("id", ...) / ("forHandle", ...), else None."""
+    m = CHANNEL_RE.search((text or "").strip())
+    if not m:
+        return None
+    return ("id", m.group(1)) if m.group(1) else ("forHandle", m.group(2))
+
 def _require_key():
     api_key = settings.YOUTUBE_API_KEY
     if not api_key:
@@ -32,59 +91,186 @@ def _iso8601_to_seconds(s: str) -> int:
             num = ""
     return h * 3600 + m * 60 + sec
 
-def search_videos(query: str, max_results: int = 5, region: str = None):
-    """
-    Returns list of dicts:
-    { id,title,channel,thumb,url,views,likes,comments,published,description,duration_sec }
-    """
-    api_key = _require_key()
-    region = region or settings.YOUTUBE_DEFAULT_REGION
+def _video_dict(v):
+    sn = v.get("snippet", {})
+    st = v.get("statistics", {})
+    cd = v.get("contentDetails", {})
+    vid = v.get("id")
+    return {
+        "id": vid,
+        "title": sn.get("title", ""),
+        "channel": sn.get("channelTitle", ""),
+        "thumb": f"https://i.ytimg.com/vi/{vid}/hqdefault.jpg",
+        "url": f"https://www.youtube.com/watch?v={vid}",
+        "views": int(st.get("viewCount", 0) or 0),
+        "likes": int(st.get("likeCount", 0) or 0),          # may be hidden → 0
+        "comments": int(st.get("commentCount", 0) or 0),    # may be disabled → 0
+        "published": sn.get("publishedAt", "")[:10],
+        "description": sn.get("description", "") or "",
+        "duration_sec": _iso8601_to_seconds(cd.get("duration")),
+        "tags": sn.get("tags", []),
+    }
 
-    # 1) search -> ids
-    params = {
+def _search_params(query, max_results, region):
+    return {
         "part": "snippet",
         "q": query,
         "type": "video",
-        "maxResults": max(1, min(int(max_results), 20)),
-        "regionCode": region,
-        "key": api_key,
+        "maxResults": max(1, min(int(max_results), SEARCH_MAX_RESULTS)),
+        "regionCode": region or settings.YOUTUBE_DEFAULT_REGION,
+        "key": _require_key(),
     }
-    r = requests.get(YOUTUBE_SEARCH_URL, params=params, timeout=10)
-    if r.status_code != 200:
-        raise YouTubeError(f"Search error: {r.status_code} {r.text}")
-
-    data = r.json()
-    ids = [it["id"]["videoId"] for it in data.get("items", []) if "id" in it and "videoId" in it["id"]]
-    if not ids:
-        return []
 
-    # 2) videos -> stats + details
-    params2 = {
+def _videos_params(ids):
+    return {
         "part": "snippet,statistics,contentDetails",
         "id": ",".join(ids),
-        "key": api_key,
+        "key": _require_key(),
     }
-    r2 = requests.get(YOUTUBE_VIDEOS_URL, params=params2, timeout=10)
-    if r2.status_code != 200:
-        raise YouTubeError(f"Videos error: {r2.status_code} {r2.text}")
 
+def _ids_from(r):
+    """search.list response (requests or httpx) -> ranked video ids."""
+    if r.status_code != 200:
+        raise YouTubeError(f"Search error: {r.status_code} {r.text}")
+    data = r.json()
+    return [it["id"]["videoId"] for it in data.get("items", []) if "id" in it and "videoId" in it["id"]]
+
+def _videos_from(r):
+    if r.status_code != 200:
+        raise YouTubeError(f"Videos error: {r.status_code} {r.text}")
+    return [_video_dict(v) for v in r.json().get("items", [])]
+
+def search_ids(query: str, max_results: int = 5, region: str = None):
+    """Ranked video ids for a query: one search.list call (SEARCH_UNITS), up to 50 results."""
+    params = _search_params(query, max_results, region)
+    return _ids_from(requests.get(YOUTUBE_SEARCH_URL, params=params, timeout=TIMEOUT))
+
+def video_details(ids):
+    """
+    search_videos()-style dicts for any number of ids, VIDEOS_BATCH ids per
+    videos.list call (VIDEOS_UNITS each). Unknown/private ids are simply absent.
+    """
+    ids = list(ids)
     out = []
-    for v in r2.json().get("items", []):
-        sn = v.get("snippet", {})
-        st = v.get("statistics", {})
-        cd = v.get("contentDetails", {})
-        vid = v.get("id")
-        out.append({
-            "id": vid,
-            "title": sn.get("title", ""),
-            "channel": sn.get("channelTitle", ""),
-            "thumb": f"https://i.ytimg.com/vi/{vid}/hqdefault.jpg",
-            "url": f"https://www.youtube.com/watch?v={vid}",
-            "views": int(st.get("viewCount", 0) or 0),
-            "likes": int(st.get("likeCount", 0) or 0),          # may be hidden → 0
-            "comments": int(st.get("commentCount", 0) or 0),    # may be disabled → 0
-            "published": sn.get("publishedAt", "")[:10],
-            "description": sn.get("description", "") or "",
-            "duration_sec": _iso8601_to_seconds(cd.get("duration")),
-        })
+    for i in range(0, len(ids), VIDEOS_BATCH):
+        params = _videos_params(ids[i:i + VIDEOS_BATCH])
+        out.extend(_videos_from(requests.get(YOUTUBE_VIDEOS_URL, params=params, timeout=TIMEOUT)))
     return out
+
+def channel_info(channel: str):
+    """
+    { id,title,handle,thumb,url,subscribers,video_count,uploads } for a channel
+    id, URL or @handle: one channels.list call (CHANNELS_UNITS). `uploads` is
+    the playlist holding every public upload, newest first.
+    """
+    filt = parse_channel(channel)
+    if filt is None:
+        raise YouTubeError("Enter a channel URL, @handle or channel id (UC...).")
+    params = {"part": "snippet,statistics,contentDetails", filt[0]: filt[1], "key": _require_key()}
+    r = requests.get(YOUTUBE_CHANNELS_URL, params=params, timeout=TIMEOUT)
+    if r.status_code != 200:
+        raise YouTubeError(f"Channels error: {r.status_code} {r.text}")
+    items = r.json().get("items", [])
+    if not items:
+        raise YouTubeError(f"Channel not found: {channel}")
+    c = items[0]
+    sn, st = c.get("snippet", {}), c.get("statistics", {})
+    return {
+        "id": c["id"],
+        "title": sn.get("title", ""),
+        "handle": sn.get("customUrl", ""),
+        "thumb": sn.get("thumbnails", {}).get("default", {}).get("url", ""),
+        "url": f"https://www.youtube.com/channel/{c['id']}",
+        "subscribers": int(st.get("subscriberCount", 0) or 0),   # may be hidden → 0
+        "video_count": int(st.get("videoCount", 0) or 0),
+        "uploads": c.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads", ""),
+    }
+
+def playlist_video_ids(playlist_id: str, limit: int = 200):
+    """Up to `limit` video ids of a playlist in playlist order, PLAYLIST_PAGE per call (PLAYLIST_ITEMS_UNITS each)."""
+    ids, token = [], None
+    while len(ids) < limit:
+        params = {
+            "part": "contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": min(PLAYLIST_PAGE, limit - len(ids)),
+            "key": _require_key(),
+        }
+        if token:
+            params["pageToken"] = token
+        r = requests.get(YOUTUBE_PLAYLIST_ITEMS_URL, params=params, timeout=TIMEOUT)
+        if r.status_code == 404:        # a channel without uploads has no uploads playlist
+            break
+        if r.status_code != 200:
+            raise YouTubeError(f"Playlist error: {r.status_code} {r.text}")
+        data = r.json()
+        ids.extend(it["contentDetails"]["videoId"] for it in data.get("items", []) if "contentDetails" in it)
+        token = data.get("nextPageToken")
+        if not token:
+            break
+    return ids[:limit]
+
+@metrics.timed("youtube")
+def channel_uploads(channel: str, limit: int = 200):
+    """
+    (channel_info(), [search_videos()-style dicts]) for a channel's latest
+    `limit` uploads, without search.list: channels.list + playlistItems pages
+    + videos.list batches, about 1 + 2 * ceil(limit / 50) units in all.
+    """
+    info = channel_info(channel)
+    ids = playlist_video_ids(info["uploads"], limit) if info["uploads"] else []
+    return info, (video_details(ids) if ids else [])
+
+@metrics.timed("youtube")
+def search_videos(query: str, max_results: int = 5, region: str = None):
+    """
+    Returns list of dicts:
+    { id,title,channel,thumb,url,views,likes,comments,published,description,duration_sec }
+    """
+    # 1) search -> ids, 2) videos -> stats + details
+    ids = search_ids(query, max_results=max(1, min(int(max_results), 20)), region=region)
+    if not ids:
+        return []
+    return video_details(ids)
+
+# ---- async twins (httpx) for the async views: same params, parsing and errors ----
+
+async def asearch_ids(query: str, max_results: int = 5, region: str = None, client: httpx.AsyncClient = None):
+    if client is None:
+        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+            return await asearch_ids(query, max_results, region, client=client)
+    return _ids_from(await client.get(YOUTUBE_SEARCH_URL, params=_search_params(query, max_results, region)))
+
+async def avideo_details(ids, client: httpx.AsyncClient = None):
+    """video_details(), with the 50-id batches requested concurrently."""
+    if client is None:
+        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+            return await avideo_details(ids, client=client)
+    ids = list(ids)
+    batches = [_videos_params(ids[i:i + VIDEOS_BATCH]) for i in range(0, len(ids), VIDEOS_BATCH)]
+    responses = await asyncio.gather(*(client.get(YOUTUBE_VIDEOS_URL, params=p) for p in batches))
+    return [v for r in responses for v in _videos_from(r)]
+
+@metrics.timed("youtube")
+async def alookup_videos(ids):
+    """
+    ({id: video dict}, videos.list calls made) for the given ids through the
+    per-id "video" cache: only ids missing from it are requested, VIDEOS_BATCH
+    per call. Unknown/private ids are absent (and remembered as such).
+    """
+    ids = list(dict.fromkeys(ids))
+    cached = await aget_many_cached("video", ids)
+    missing = [i for i in ids if i not in cached]
+    if missing:
+        fetched = {v["id"]: v for v in await avideo_details(missing)}
+        cached.update(await aset_many_cached("video", {i: fetched.get(i, False) for i in missing}))
+    calls = -(-len(missing) // VIDEOS_BATCH)
+    return {i: cached[i] for i in ids if cached.get(i)}, calls
+
+@metrics.timed("youtube")
+async def asearch_videos(query: str, max_results: int = 5, region: str = None):
+    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        ids = await asearch_ids(query, max_results=max(1, min(int(max_results), 20)), region=region, client=client)
+        if not ids:
+            return []
+        return await avideo_details(ids, client=client)
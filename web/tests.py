@@ -1,3 +1,1024 @@
-from django.test import TestCase
+import io
+import json
+import random
+import re
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from . import views
+from .models import KeywordStats, LibraryRollup, Optimization, ResearchJob, SearchQuery, TitleBand
+from .services import (
+    autocomplete, channels, keyword_stats, library, metrics, research, rollups, search, similarity, snapshots,
+    transfer,
+)
+from .services import youtube
+from .services.youtube import YouTubeError
+from .services.seo_rules import (
+    CURIOSITY_PHRASES, HOOK_PHRASES, LOSS_AVERSION_WORDS, POWER_WORDS, SESSION_PHRASES,
+    PackageContext, evaluate,
+)
+from .views import _batch_items
+
+LOCMEM = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "template_fragments": {"BACKEND": "web.services.cache.FragmentCache", "LOCATION": "default"},
+}
+# the manifest storage needs a collectstatic run; plain storage resolves straight from static/
+PLAIN_STATIC = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        created = datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=dt_timezone.utc)
+        token = library.encode_cursor(SimpleNamespace(created_at=created, pk=4217))
+        self.assertNotIn("=", token)
+        self.assertEqual(library.decode_cursor(token), (created, 4217))
+
+    def test_missing_or_garbled(self):
+        for token in (None, "", "not a cursor", "@@@", library.encode_cursor(
+                SimpleNamespace(created_at=datetime(2026, 1, 1), pk=1))[:-3] + "!!!"):
+            self.assertIsNone(library.decode_cursor(token), token)
+
+
+class SnapshotCodecTests(SimpleTestCase):
+    SERP = [
+        {"id": "dQw4w9WgXcQ", "views": 1_500_000_000, "likes": 17_000_000, "comments": 2_300_000},
+        {"id": "9bZkp7q19f0", "views": 5_000_000_000, "likes": 0, "comments": 127},
+        {"id": "M7lc1UVf-VE", "views": 0, "likes": None, "comments": 1},
+    ]
+
+    def test_round_trip_packed_ids(self):
+        out = snapshots.decode(snapshots.encode(self.SERP))
+        self.assertEqual(out["count"], 3)
+        self.assertEqual(out["ids"], [v["id"] for v in self.SERP])
+        self.assertEqual(out["views"], [v["views"] for v in self.SERP])
+        self.assertEqual(out["likes"], [17_000_000, 0, 0])
+        self.assertEqual(out["comments"], [v["comments"] for v in self.SERP])
+
+    def test_round_trip_raw_ids(self):
+        serp = self.SERP + [{"id": "not-a-video-id", "views": 7}]
+        out = snapshots.decode(snapshots.encode(serp))
+        self.assertEqual(out["ids"], [v["id"] for v in serp])
+        self.assertEqual(out["views"][-1], 7)
+
+    def test_decode_selected_columns(self):
+        out = snapshots.decode(snapshots.encode(self.SERP), columns=("views",))
+        self.assertEqual(set(out), {"count", "views"})
+        self.assertEqual(out["views"], [v["views"] for v in self.SERP])
+
+    def test_empty_serp(self):
+        out = snapshots.decode(snapshots.encode([]))
+        self.assertEqual(out, {"count": 0, "ids": [], "views": [], "likes": [], "comments": []})
+
+    def test_pack_id(self):
+        for video_id in ("dQw4w9WgXcQ", "M7lc1UVf-VE", "___________"[:10] + "A"):
+            self.assertEqual(snapshots.unpack_id(snapshots.pack_id(video_id)), video_id)
+        for video_id in ("", "short", "dQw4w9WgXcR", "dQw4w9WgXc!", "dQw4w9WgXcQx"):
+            self.assertIsNone(snapshots.pack_id(video_id), video_id)
+
+    def test_unknown_format(self):
+        blob = snapshots.encode(self.SERP)
+        with self.assertRaises(ValueError):
+            snapshots.decode(bytes([snapshots.VERSION + 1]) + blob[1:])
+        with self.assertRaises(ValueError):
+            snapshots.decode(b"")
+
+
+class SimilarityTests(SimpleTestCase):
+    def test_signature(self):
+        sig = similarity.signature("How to bake sourdough bread")
+        self.assertEqual(len(sig), similarity.NUM_PERM)
+        self.assertTrue(all(0 <= h < 2 ** 32 for h in sig))
+        self.assertEqual(sig, similarity.signature("  HOW to bake -- Sourdough bread!! "))
+        self.assertEqual(similarity.unpack(similarity.pack(sig)), sig)
+
+    def test_signature_of_empty_title(self):
+        for title in (None, "", "   ", "?!_--"):
+            self.assertIsNone(similarity.signature(title), title)
+
+    def test_signature_of_non_latin_titles(self):
+        sig = similarity.signature("Как испечь хлеб на закваске")
+        self.assertIsNotNone(sig)
+        self.assertEqual(sig, similarity.signature("КАК испечь хлеб, на закваске!"))
+        self.assertIsNotNone(similarity.signature("サワードウの焼き方"))
+
+    def test_estimate(self):
+        a = similarity.signature("How to bake sourdough bread at home")
+        near = similarity.signature("How to bake sourdough bread at home fast")
+        other = similarity.signature("Best budget gaming laptops of the year")
+        self.assertEqual(similarity.estimate(a, a), 1.0)
+        self.assertGreater(similarity.estimate(a, near), similarity.SIMILAR)
+        self.assertLess(similarity.estimate(a, other), 0.3)
+
+    def test_band_keys(self):
+        a = similarity.signature("How to bake sourdough bread at home")
+        keys = similarity.band_keys(a)
+        self.assertEqual(len(keys), similarity.BANDS)
+        self.assertEqual(len(set(keys)), similarity.BANDS)
+        self.assertTrue(all(-2 ** 63 <= k < 2 ** 63 for k in keys))
+        self.assertEqual(keys, similarity.band_keys(similarity.signature("how to bake SOURDOUGH bread at home")))
+
+        near = similarity.band_keys(similarity.signature("How to bake sourdough bread at home fast"))
+        other = similarity.band_keys(similarity.signature("Best budget gaming laptops of the year"))
+        self.assertTrue(set(keys) & set(near))
+        self.assertFalse(set(keys) & set(other))
+
+    def test_band_key_includes_band_number(self):
+        # identical rows in two bands must still land in different buckets
+        sig = (7,) * similarity.NUM_PERM
+        self.assertEqual(len(set(similarity.band_keys(sig))), similarity.BANDS)
+
+    def test_closest(self):
+        sig = similarity.signature("How to bake sourdough bread")
+        candidates = [
+            (similarity.signature("Gaming laptops ranked"), "Gaming laptops ranked", "SERP"),
+            (None, "", "Library"),
+            (similarity.signature("how to bake sourdough bread"), "how to bake sourdough bread", "Library"),
+        ]
+        self.assertEqual(similarity.closest(sig, candidates), (1.0, "how to bake sourdough bread", "Library"))
+        self.assertIsNone(similarity.closest(sig, []))
+
+
+@override_settings(CACHES=LOCMEM)
+class ClosestTitleTests(TestCase):
+    TITLE = "How to bake sourdough bread at home"
+
+    def test_near_duplicate_among_weak_collisions(self):
+        keys = similarity.band_keys(similarity.signature(self.TITLE))
+        weak = Optimization.objects.bulk_create(
+            Optimization(keyword="misc", title=f"Unrelated title number {i}",
+                         title_minhash=similarity.pack(similarity.signature(f"Unrelated title number {i}")))
+            for i in range(60)
+        )
+        # each weak row shares exactly one band with the query
+        TitleBand.objects.bulk_create(
+            TitleBand(optimization=row, bucket=keys[i % len(keys)]) for i, row in enumerate(weak)
+        )
+        Optimization.objects.create(keyword="bread", title="How to bake sourdough bread at home fast")
+
+        with mock.patch.object(views, "LIBRARY_SIMILAR_CANDIDATES", 10):
+            found = views._closest_title(self.TITLE)
+        self.assertEqual(found[1:], ("How to bake sourdough bread at home fast", "in your Library"))
+        self.assertGreater(found[0], similarity.SIMILAR)
+
+    def test_no_match(self):
+        Optimization.objects.create(keyword="laptop", title="Best budget gaming laptops of the year")
+        self.assertIsNone(views._closest_title(self.TITLE))
+        self.assertIsNone(views._closest_title("?!"))
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def test_ranking(self):
+        index = autocomplete.PrefixIndex([
+            ("bread", 3), ("bread machine", 9), ("bread maker", 9), ("breakfast", 20), ("brownies", 50),
+        ])
+        self.assertEqual(index.suggest("Brea", 3), ["breakfast", "bread maker", "bread machine"])
+        self.assertEqual(index.suggest("  BREAD  m"), ["bread maker", "bread machine"])
+        self.assertEqual(index.suggest("x"), [])
+        self.assertEqual(index.suggest(""), [])
+
+    def test_pending_terms_rank_with_main(self):
+        index = autocomplete.PrefixIndex([("bread", 3), ("bread machine", 9)])
+        index.add("Bread  Pudding", 5)
+        index.add("bread pudding", 5)
+        self.assertEqual(index.suggest("bread"), ["bread pudding", "bread machine", "bread"])
+        self.assertEqual(len(index), 3)
+
+    def test_memo_invalidated_by_weight_update(self):
+        terms = [(f"a{i:04d}", 10) for i in range(autocomplete.MEMO_MIN_RANGE + 100)]
+        index = autocomplete.PrefixIndex(terms + [("b", 1)])
+        self.assertEqual(index.suggest("a", 2), ["a0000", "a0001"])
+        self.assertTrue(index._memo)
+        index.add("a0500", 5)
+        self.assertEqual(index.suggest("a", 2), ["a0500", "a0000"])
+        index.add("b", 100)     # unrelated prefix: memo kept
+        self.assertIn(("a", 2), index._memo)
+
+    def test_merge(self):
+        index = autocomplete.PrefixIndex([("bread", 3), ("cake", 2)])
+        with mock.patch.object(autocomplete, "MIN_PENDING_MERGE", 2):
+            for term in ("banana bread", "apple cake", "bread"):
+                index.add(term)
+            self.assertEqual(index._pending_terms, ["apple cake", "banana bread"])
+            index.add("carrot cake", 4)
+        self.assertEqual(index._pending_terms, [])
+        self.assertEqual(len(index), 5)
+        blob, offsets, weights = index._main
+        terms = [index._term(index._main, i) for i in range(len(weights))]
+        self.assertEqual(terms, ["apple cake", "banana bread", "bread", "cake", "carrot cake"])
+        self.assertEqual(list(weights), [1, 1, 4, 2, 4])
+        self.assertEqual(index.suggest("ca"), ["carrot cake", "cake"])
+
+
+@override_settings(CACHES=LOCMEM)
+class AutocompleteSyncTests(TestCase):
+    def setUp(self):
+        autocomplete._index = None
+        self.addCleanup(setattr, autocomplete, "_index", None)
+
+    def _sync(self):
+        autocomplete._synced_at = 0.0
+        return autocomplete.get_index()
+
+    def test_rows_from_other_workers(self):
+        SearchQuery.objects.create(query="sourdough bread", count=4, last_searched_at=timezone.now())
+        index = autocomplete.get_index()
+        self.assertEqual(index.suggest("sour"), ["sourdough bread"])
+
+        # written by another process: no local add
+        SearchQuery.objects.create(query="sourdough starter", count=7,
+                                   last_searched_at=timezone.now() + timedelta(seconds=1))
+        SearchQuery.objects.filter(query="sourdough bread").update(
+            count=5, last_searched_at=timezone.now() + timedelta(seconds=1))
+        Optimization.objects.create(keyword="Sourdough Discard")
+        KeywordStats.objects.create(keyword="bread", serp_titles=["Sourdough for beginners"],
+                                    fetched_at=timezone.now())
+        with mock.patch.object(autocomplete, "build_index") as rebuild:
+            index = self._sync()
+        rebuild.assert_not_called()
+        self.assertEqual(index.suggest("sour"), [
+            "sourdough starter", "sourdough bread", "sourdough discard", "sourdough for beginners",
+        ])
+        self.assertEqual(index._pending_weights["sourdough starter"], 7)
+
+        # nothing new: weights unchanged
+        self._sync()
+        self.assertEqual(index._pending_weights["sourdough starter"], 7)
+
+    def test_local_writes_not_counted_twice(self):
+        index = autocomplete.get_index()
+        autocomplete.record_search("Banana bread", ["Easy banana bread"])
+        autocomplete.record_search("banana bread")
+        self.assertEqual(index.suggest("banana"), ["banana bread"])
+        self.assertEqual(index._pending_weights["banana bread"], 2)
+        self._sync()
+        self.assertEqual(index._pending_weights["banana bread"], 2)
+        self.assertEqual(autocomplete._local, {"easy banana bread": 1})
+
+    def test_rebuild_runs_in_background(self):
+        autocomplete.get_index()
+        autocomplete._built_at -= autocomplete.REBUILD_SECONDS
+        with mock.patch.object(autocomplete.threading, "Thread") as thread:
+            self._sync()
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+        autocomplete._rebuilding = False
+
+
+@override_settings(CACHES=LOCMEM)
+class SearchPageTests(TestCase):
+    def setUp(self):
+        self.desc = Optimization.objects.create(keyword="baking", title="Weekend loaves",
+                                                description="A sourdough starter guide", score=30)
+        self.title = Optimization.objects.create(keyword="baking", title="Sourdough starter in 5 days", score=60)
+        self.keyword = Optimization.objects.create(keyword="sourdough starter", title="Feed it right", score=90)
+        Optimization.objects.create(keyword="gaming laptop", title="Budget picks", score=80)
+
+    def _ids(self, page):
+        return [o.pk for o in page.object_list]
+
+    def test_ranked_by_field_weight(self):
+        page = search.search_page("Sourdough starter")
+        self.assertEqual(self._ids(page), [self.keyword.pk, self.title.pk, self.desc.pk])
+        self.assertEqual(page.total, 3)
+
+    def test_all_tokens_must_match(self):
+        self.assertEqual(self._ids(search.search_page("sourdough laptop")), [])
+        self.assertEqual(search.search_page("sourdough OR laptop").total, 0)
+
+    def test_prefix_and_stemming(self):
+        self.assertEqual(search.search_page("sourd*").total, 3)
+        self.assertEqual(search.search_page("starters").total, 3)
+        self.assertEqual(search.search_page("sourd").total, 0)
+
+    def test_pages(self):
+        first = search.search_page("sourdough", size=2)
+        self.assertEqual((first.total, first.next_cursor, first.prev_cursor), (3, "2", None))
+        second = search.search_page("sourdough", number=2, size=2)
+        self.assertEqual(self._ids(first) + self._ids(second), [self.keyword.pk, self.title.pk, self.desc.pk])
+        self.assertEqual((second.total, second.next_cursor, second.prev_cursor), (3, None, "1"))
+        beyond = search.search_page("sourdough", number=9, size=2)
+        self.assertEqual((beyond.object_list, beyond.total), ([], 3))
+
+    def test_filters(self):
+        page = search.search_page("sourdough", min_score=50)
+        self.assertEqual(self._ids(page), [self.keyword.pk, self.title.pk])
+        self.assertEqual(page.total, 2)
+
+    def test_index_follows_writes(self):
+        self.keyword.keyword = "rye starter"
+        self.keyword.title = "Feed it right"
+        self.keyword.save()
+        self.title.delete()
+        self.assertEqual(self._ids(search.search_page("sourdough")), [self.desc.pk])
+        self.assertEqual(self._ids(search.search_page("rye")), [self.keyword.pk])
+
+    def test_empty_query(self):
+        for query in ("", "   ", "!!"):
+            page = search.search_page(query)
+            self.assertEqual((page.object_list, page.total), ([], 0))
+
+
+@override_settings(CACHES=LOCMEM, STORAGES=PLAIN_STATIC)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        Optimization.objects.create(keyword="sourdough bread", title="Bake it", score=70)
+        self.client.get("/library/")    # sets the CSRF cookie the ETag is keyed on
+
+    def test_validators(self):
+        response = self.client.get("/library/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_not_modified(self):
+        etag = self.client.get("/library/")["ETag"]
+        response = self.client.get("/library/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        # other parameters are another representation
+        self.assertEqual(self.client.get("/library/?min_score=50", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get("/library/")["ETag"]
+        Optimization.objects.create(keyword="rye bread", score=40)
+        response = self.client.get("/library/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertContains(response, "rye bread")
+
+    def test_etag_is_per_csrf_cookie(self):
+        etag = self.client.get("/library/")["ETag"]
+        self.client.cookies["csrftoken"] = "x" * 32
+        self.assertNotEqual(self.client.get("/library/")["ETag"], etag)
+
+    def test_fragment_hits_are_counted(self):
+        metrics.reset()
+        self.client.get("/library/?min_score=10")
+        self.client.get("/library/?min_score=10")
+        text = metrics.exposition()
+        self.assertIn('namespace="fragment:library_page",result="miss"} 1', text)
+        self.assertIn('namespace="fragment:library_page",result="hit"} 1', text)
+
+    def test_pending_message_is_rendered(self):
+        etag = self.client.get("/library/")["ETag"]
+        opt = Optimization.objects.get()
+        self.client.post(f"/library/{opt.pk}/track/", {"video": "not a video"})
+        response = self.client.get("/library/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "look like a YouTube video")
+        self.assertEqual(self.client.get("/library/", HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+
+@override_settings(CACHES=LOCMEM, API_TOKEN="", API_OPEN=False)
+class BatchApiAuthTests(SimpleTestCase):
+    BODY = json.dumps({"keywords": ["sourdough"]})
+
+    async def _post(self, body=BODY, content_type="application/json", **headers):
+        return await self.async_client.post("/api/batch/", body, content_type=content_type, headers=headers)
+
+    async def test_disabled_without_token(self):
+        response = await self._post()
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("API_TOKEN", json.loads(response.content)["error"])
+        response = await self._post(Authorization="Bearer anything")
+        self.assertEqual(response.status_code, 503)
+
+    @override_settings(API_TOKEN="s3cret")
+    async def test_token_required(self):
+        for headers in ({}, {"Authorization": "s3cret"}, {"Authorization": "Bearer wrong"},
+                        {"Authorization": "Bearer s3cret "}):
+            with self.subTest(headers=headers):
+                self.assertEqual((await self._post(**headers)).status_code, 403)
+
+    @override_settings(API_TOKEN="s3cret")
+    async def test_valid_token(self):
+        auth = {"Authorization": "Bearer s3cret"}
+        self.assertEqual((await self._post(content_type="text/plain", **auth)).status_code, 415)
+        response = await self._post(body="{}", **auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Send "items"', json.loads(response.content)["error"])
+
+        entry = {"items": [], "ai_insight": None}
+        with mock.patch.object(views, "_discover_results", mock.AsyncMock(return_value=entry)):
+            response = await self._post(**auth)
+            self.assertEqual(response.status_code, 200)
+            lines = [json.loads(line) async for line in response.streaming_content]
+        self.assertEqual(lines[0]["keyword"], "sourdough")
+        self.assertTrue(lines[0]["ok"])
+        self.assertEqual(lines[-1]["done"], True)
+
+    @override_settings(API_OPEN=True)
+    async def test_explicitly_open(self):
+        self.assertEqual((await self._post(body="{}")).status_code, 400)
+
+    async def test_post_only(self):
+        self.assertEqual((await self.async_client.get("/api/batch/")).status_code, 405)
+
+
+def _serp(keyword, n=5):
+    return [
+        {"id": f"vid{i:08d}", "title": f"{keyword} video {i}", "description": f"all about {keyword}",
+         "views": 1000 * (n - i), "likes": 50, "comments": 5}
+        for i in range(n)
+    ]
+
+
+@override_settings(CACHES=LOCMEM)
+class ResearchTests(TestCase):
+    def setUp(self):
+        self.job = research.create_job(["sourdough", "rye bread", "focaccia"], "US", name="bread")
+        self.searched = []
+
+    async def _search(self, keyword, max_results, region):
+        self.searched.append(keyword)
+        return _serp(keyword)
+
+    async def _run(self, search=None, **kwargs):
+        with mock.patch.object(research, "asearch_videos", search or self._search):
+            return [item async for item in research.arun(self.job, **kwargs)]
+
+    async def _job(self):
+        return await ResearchJob.objects.aget(pk=self.job.pk)
+
+    def test_parse_keywords(self):
+        text = "Keyword,volume\nsourdough,10\n\n  Rye   bread ,4\nSOURDOUGH\nfocaccia"
+        self.assertEqual(research.parse_keywords(text), ["sourdough", "Rye bread", "focaccia"])
+        self.assertEqual(research.parse_keywords(text, "pizza", limit=2), ["sourdough", "Rye bread"])
+
+    async def test_resumes_after_budget(self):
+        items = await self._run(budget=2 * research.UNITS, workers=1)
+        self.assertEqual([i.keyword for i in items], ["sourdough", "rye bread"])
+        job = await self._job()
+        self.assertEqual((job.status, job.done, job.lease_until), ("paused", 2, None))
+        self.assertEqual(job.note, "Quota budget for this run spent")
+
+        items = await self._run(workers=1)
+        self.assertEqual([i.keyword for i in items], ["focaccia"])
+        self.assertEqual(self.searched, ["sourdough", "rye bread", "focaccia"])
+        job = await self._job()
+        self.assertEqual((job.status, job.done, job.failed, job.note), ("done", 3, 0, ""))
+        self.assertEqual(job.units_used, 3 * research.UNITS)
+        self.assertEqual(await self._run(), [])
+
+    async def test_lease(self):
+        await ResearchJob.objects.filter(pk=self.job.pk).aupdate(
+            status="running", lease_until=timezone.now() + timedelta(seconds=30))
+        self.assertEqual(await self._run(), [])
+        self.assertEqual(self.searched, [])
+        self.assertEqual((await self._job()).status, "running")
+
+        # the holder died: its lease lapses and the next run takes over
+        await ResearchJob.objects.filter(pk=self.job.pk).aupdate(lease_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(len(await self._run()), 3)
+        self.assertEqual((await self._job()).status, "done")
+
+    async def test_transient_errors_stay_pending(self):
+        async def flaky(keyword, max_results, region):
+            if keyword == "rye bread":
+                raise YouTubeError("Search error: 503 backend error")
+            if keyword == "focaccia":
+                raise YouTubeError("Search error: 400 invalid region")
+            return await self._search(keyword, max_results, region)
+
+        items = await self._run(flaky, budget=10 * research.UNITS, workers=1)
+        self.assertEqual({i.keyword: i.status for i in items}, {"sourdough": "done", "focaccia": "failed"})
+        job = await self._job()
+        self.assertEqual((job.status, job.done, job.failed), ("paused", 1, 1))
+        self.assertEqual(job.note, "1 keyword(s) hit network/server errors; run again to retry")
+        self.assertEqual(job.units_used, 2 * research.UNITS)
+
+        self.assertEqual([i.keyword for i in await self._run()], ["rye bread"])
+        self.assertEqual((await self._job()).status, "done")
+
+    async def test_quota_exhausted(self):
+        async def exhausted(keyword, max_results, region):
+            raise YouTubeError('Search error: 403 {"reason": "quotaExceeded"}')
+
+        self.assertEqual(await self._run(exhausted, workers=1), [])
+        job = await self._job()
+        self.assertEqual((job.status, job.note, job.units_used), ("paused", "YouTube quota exhausted", 0))
+
+    async def test_stored_stats_cost_nothing(self):
+        await KeywordStats.objects.acreate(keyword="sourdough", region="US", difficulty1=40, difficulty5=20,
+                                           serp_count=20, fetched_at=timezone.now())
+        items = await self._run(workers=1)
+        self.assertEqual({i.keyword: i.result["source"] for i in items},
+                         {"sourdough": "stored", "rye bread": "live", "focaccia": "live"})
+        self.assertEqual(self.searched, ["rye bread", "focaccia"])
+        self.assertEqual((await self._job()).units_used, 2 * research.UNITS)
+
+    async def test_csv(self):
+        await self._run(budget=research.UNITS, workers=1)
+        lines = await sync_to_async(list)(research.csv_lines(self.job))
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("keyword,status,difficulty_top1"))
+        self.assertTrue(lines[1].startswith("sourdough,done,"))
+
+        # the download of a paused job: finished rows only, nothing run
+        streamed = [line async for line in research.acsv_lines(await self._job(), run_pending=False)]
+        self.assertEqual(streamed, lines)
+        self.assertEqual(self.searched, ["sourdough"])
+
+
+class ChannelSummaryTests(SimpleTestCase):
+    TODAY = date(2026, 3, 31)
+
+    def _video(self, published, views, seconds, title="Video"):
+        return {"id": published, "title": title, "published": published, "views": views, "duration_sec": seconds}
+
+    def setUp(self):
+        self.videos = [
+            self._video("2026-03-30", 9_000, 45, "Quick tip"),              # Monday
+            self._video("2026-03-23", 40_000, 600, "Full sourdough guide"),  # Monday
+            self._video("2026-03-16", 20_000, 480, "Rye loaf"),              # Monday
+            self._video("2026-03-12", 2_000, 1500, "Baking livestream"),     # Thursday
+            self._video("2026-03-02", 30_000, 59, "Shaping in 60s"),         # Monday
+        ]
+
+    def test_cadence(self):
+        cad = channels.cadence(self.videos, self.TODAY)
+        self.assertEqual(cad["uploads_per_week"], round(5 / (28 / 7), 2))
+        self.assertEqual(cad["median_gap_days"], 7)
+        self.assertEqual((cad["last_upload"], cad["days_since_last"]), (date(2026, 3, 30), 1))
+        self.assertEqual(cad["top_weekday"], "Monday")
+
+    def test_cadence_edge_cases(self):
+        self.assertEqual(channels.cadence([], self.TODAY)["median_gap_days"], None)
+        one = channels.cadence([self._video("2026-03-30", 1, 1)], self.TODAY)
+        self.assertEqual((one["uploads_per_week"], one["median_gap_days"]), (0.0, None))
+        self.assertEqual(channels.cadence([self._video("", 1, 1)], self.TODAY)["last_upload"], None)
+
+    def test_length_bands(self):
+        self.assertEqual(channels.length_bands(self.videos), [
+            {"label": "Shorts (≤1 min)", "count": 2, "median_views": 19_500},
+            {"label": "4–10 min", "count": 2, "median_views": 30_000},
+            {"label": "20–40 min", "count": 1, "median_views": 2_000},
+        ])
+
+    def test_top_videos_by_views_per_day(self):
+        top = channels.top_videos(self.videos, self.TODAY, k=3)
+        # the 2-day-old short outruns older uploads with more views
+        self.assertEqual([v["title"] for v in top], ["Quick tip", "Full sourdough guide", "Rye loaf"])
+        self.assertEqual(top[0]["views_per_day"], 9_000.0)
+        self.assertEqual(top[0]["length_band"], "Shorts (≤1 min)")
+
+    def test_summarize(self):
+        report = channels.summarize({"title": "Bread Lab"}, self.videos, self.TODAY)
+        self.assertEqual((report["count"], report["median_views"]), (5, 20_000))
+        self.assertEqual(report["best_band"]["label"], "4–10 min")     # single-upload bands never win
+        self.assertEqual(report["units"], channels.quota_units(5))
+        self.assertEqual(len(report["top_videos"]), 5)
+        empty = channels.summarize({}, [], self.TODAY)
+        self.assertEqual((empty["median_views"], empty["best_band"], empty["top_title_len"]), (0, None, 0))
+
+    def test_quota_units(self):
+        self.assertEqual(channels.quota_units(50), 3)
+        self.assertEqual(channels.quota_units(200), 9)
+
+
+class VideoIdTests(SimpleTestCase):
+    def test_accepted(self):
+        for text in (
+            "dQw4w9WgXcQ",
+            "  https://www.youtube.com/watch?v=dQw4w9WgXcQ  ",
+            "https://youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=42",
+            "http://m.youtube.com/watch?v=dQw4w9WgXcQ#t=1",
+            "https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RD",
+            "youtu.be/dQw4w9WgXcQ?si=abc",
+            "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+            "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ?start=3",
+            "https://www.youtube.com/live/dQw4w9WgXcQ",
+            "https://www.youtube.com/v/dQw4w9WgXcQ",
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(youtube.parse_video_id(text), "dQw4w9WgXcQ")
+
+    def test_rejected(self):
+        for text in (
+            None, "", "dQw4w9WgXc", "dQw4w9WgXcQQ", "dQw4w9WgXc!",
+            "https://example.com/watch?v=dQw4w9WgXcQ",
+            "https://notyoutube.com/shorts/dQw4w9WgXcQ",
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQQ",
+            "https://www.youtube.com/watch?list=dQw4w9WgXcQ",
+            "https://www.youtube.com/@dQw4w9WgXcQ",
+            "see https://youtu.be/dQw4w9WgXcQ",
+        ):
+            with self.subTest(text=text):
+                self.assertIsNone(youtube.parse_video_id(text))
+
+    def test_parse_video_ids(self):
+        ids, rejected = youtube.parse_video_ids(
+            "https://youtu.be/dQw4w9WgXcQ, 9bZkp7q19f0\n\n"
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ  nope https://example.com/x"
+        )
+        self.assertEqual(ids, ["dQw4w9WgXcQ", "9bZkp7q19f0"])
+        self.assertEqual(rejected, ["nope", "https://example.com/x"])
+        self.assertEqual(youtube.parse_video_ids(""), ([], []))
+
+
+@override_settings(CACHES=LOCMEM)
+class LookupVideosTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.requested = []
+
+    async def _details(self, ids, client=None):
+        self.requested.append(list(ids))
+        return [{"id": i, "title": f"Video {i}"} for i in ids if not i.startswith("gone")]
+
+    async def _lookup(self, ids):
+        with mock.patch.object(youtube, "avideo_details", self._details):
+            return await youtube.alookup_videos(ids)
+
+    async def test_cached_per_id(self):
+        found, calls = await self._lookup(["aaaaaaaaaaa", "gone0000000", "aaaaaaaaaaa"])
+        self.assertEqual((list(found), calls), (["aaaaaaaaaaa"], 1))
+        self.assertEqual(self.requested, [["aaaaaaaaaaa", "gone0000000"]])
+
+        # known and missing ids both come from the cache; only the new one is fetched
+        found, calls = await self._lookup(["gone0000000", "bbbbbbbbbbb", "aaaaaaaaaaa"])
+        self.assertEqual((list(found), calls), (["bbbbbbbbbbb", "aaaaaaaaaaa"], 1))
+        self.assertEqual(self.requested[-1], ["bbbbbbbbbbb"])
+
+        found, calls = await self._lookup(["aaaaaaaaaaa", "bbbbbbbbbbb"])
+        self.assertEqual((len(found), calls), (2, 0))
+        self.assertEqual(len(self.requested), 2)
+
+    async def test_calls_counted_per_batch(self):
+        ids = [f"v{i:010d}" for i in range(youtube.VIDEOS_BATCH + 1)]
+        found, calls = await self._lookup(ids)
+        self.assertEqual((len(found), calls), (len(ids), 2))
+
+
+@override_settings(CACHES=LOCMEM, KEYWORD_STATS_MAX_AGE_HOURS=24)
+class KeywordStatsRefreshTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.never = KeywordStats.objects.create(keyword="rye bread")
+        self.old = KeywordStats.objects.create(keyword="focaccia", fetched_at=now - timedelta(days=3))
+        self.fresh = KeywordStats.objects.create(keyword="sourdough", fetched_at=now - timedelta(hours=1))
+        self.searched = []
+
+    def _search(self, keyword, max_results, region):
+        self.searched.append(keyword)
+        return _serp(keyword)
+
+    def _refresh(self, units, age=None, search=None):
+        with mock.patch.object(keyword_stats, "search_videos", search or self._search):
+            return keyword_stats.refresh_stale(units, age=age)
+
+    def test_stalest_first_within_budget(self):
+        summary = self._refresh(2 * keyword_stats.UNITS_PER_REFRESH + 50)
+        self.assertEqual(summary, {"refreshed": 2, "failed": 0, "units": 2 * keyword_stats.UNITS_PER_REFRESH})
+        self.assertEqual(self.searched, ["rye bread", "focaccia"])
+        self.never.refresh_from_db()
+        self.assertEqual((self.never.serp_count, self.never.median_views), (5, 3000))
+        self.assertIsNotNone(self.never.fetched_at)
+
+    def test_zero_max_age_refreshes_everything(self):
+        self.assertEqual(keyword_stats.stale_queryset().count(), 2)
+        self.assertEqual(keyword_stats.stale_queryset(timedelta(0)).count(), 3)
+        summary = self._refresh(10 * keyword_stats.UNITS_PER_REFRESH, age=timedelta(0))
+        self.assertEqual(summary["refreshed"], 3)
+        self.assertEqual(self.searched, ["rye bread", "focaccia", "sourdough"])
+
+    def test_quota_error_stops(self):
+        def exhausted(keyword, max_results, region):
+            raise YouTubeError('Search error: 403 {"reason": "quotaExceeded"}')
+
+        summary = self._refresh(10 * keyword_stats.UNITS_PER_REFRESH, search=exhausted)
+        self.assertEqual((summary["refreshed"], summary["failed"]), (0, 1))
+
+    def test_no_budget(self):
+        self.assertEqual(self._refresh(keyword_stats.UNITS_PER_REFRESH - 1)["units"], 0)
+        self.assertEqual(self.searched, [])
+
+
+@override_settings(CACHES=LOCMEM)
+class TransferTests(TestCase):
+    def setUp(self):
+        self.tracked = Optimization.objects.create(
+            keyword="sourdough bread", title="Bake sourdough, step by step", description="Flour, water, salt.",
+            tags_text="sourdough,bread", entities="starter,levain", score=72,
+            has_custom_thumbnail=True, video_id="dQw4w9WgXcQ",
+        )
+        Optimization.objects.create(keyword="rye", title="Rye, \"dense\" and good", score=40, in_playlists=True)
+
+    def _round_trip(self, fmt):
+        before = list(transfer.iter_rows())
+        exported = "".join(transfer.iter_export(fmt))
+        for row in Optimization.objects.all():
+            row.delete()
+        summary = transfer.import_rows(transfer.read_rows(io.StringIO(exported), fmt))
+        self.assertEqual(summary["rows"], 2)
+        self.assertEqual(list(transfer.iter_rows()), before)
+
+    def test_csv_round_trip(self):
+        self._round_trip("csv")
+        self.assertEqual(Optimization.objects.get(keyword="sourdough bread").video_id, "dQw4w9WgXcQ")
+        self.assertIsNone(Optimization.objects.get(keyword="rye").video_id)
+
+    def test_jsonl_round_trip(self):
+        self._round_trip("jsonl")
+        imported = Optimization.objects.get(keyword="sourdough bread")
+        self.assertEqual(imported.video_id, "dQw4w9WgXcQ")
+        self.assertEqual(imported.created_at, self.tracked.created_at)
+        # derived rows that save() would have written
+        self.assertEqual(imported.title_bands.count(), similarity.BANDS)
+        self.assertEqual(rollups.total(), 2)
+
+    def test_import_checks_video_ids(self):
+        rows = [{"keyword": "a", "video_id": "https://youtu.be/dQw4w9WgXcQ"}, {"keyword": "b", "video_id": "nope"}]
+        transfer.import_rows(rows)
+        self.assertEqual(Optimization.objects.get(keyword="a").video_id, "dQw4w9WgXcQ")
+        self.assertIsNone(Optimization.objects.get(keyword="b").video_id)
+
+
+# ---------------- reference: the if/elif scorer the rule table replaced ----------------
+
+def _legacy_words(text):
+    return re.findall(r"[A-Za-z0-9']+", (text or "").lower())
+
+
+def _legacy_score(main_keyword, title, description, tags_list, entities, env, has_custom_thumbnail, in_playlists):
+    fixes, pillars = [], {}
+    kw = (main_keyword or "").strip().lower()
+    t = (title or "").strip()
+    d = (description or "").strip()
+    tags_clean = [x.strip().lower() for x in tags_list if x and x.strip()]
+    title_lc, desc_lc = t.lower(), d.lower()
+
+    def pillar(name, score, max_score, details):
+        score = min(max_score, max(0, score))
+        pillars[name] = {"score": score, "max": max_score, "pct": int(score / max_score * 100), "details": details}
+        return score
+
+    p1, det = 0, []
+    if kw:
+        if kw in title_lc:
+            p1 += 8
+            det.append("Main keyword present in title.")
+            if title_lc.find(kw) <= 15:
+                p1 += 4
+                det.append("Keyword appears early in the title.")
+        else:
+            det.append("Keyword is missing from title.")
+            fixes.append("Include the main keyword in the title.")
+        if kw in desc_lc[:80]:
+            p1 += 6
+            det.append("Keyword appears early in the description.")
+        elif kw in desc_lc:
+            p1 += 3
+            det.append("Keyword appears in the description (not early).")
+        else:
+            fixes.append("Mention the main keyword near the start of the description.")
+    desc_words = len(re.findall(r"[A-Za-z0-9']+", d))
+    if desc_words == 0:
+        det.append("No description text.")
+        fixes.append("Add a descriptive, keyword-rich description (min 150–250 words).")
+    elif desc_words < 120:
+        p1 += 4
+        det.append("Short description – add more context and variations of your keyword.")
+        fixes.append("Expand the description to better explain the content and include related phrases.")
+    elif desc_words <= 350:
+        p1 += 8
+        det.append("Solid description length for Search.")
+    else:
+        p1 += 6
+        det.append("Very detailed description – good for Search, ensure it remains readable.")
+    ent_matches = sum(1 for e in entities or [] if e.lower() in title_lc or e.lower() in desc_lc)
+    if ent_matches:
+        p1 += min(8, ent_matches * 2)
+        det.append(f"Includes {ent_matches} important topic entities from top results.")
+    else:
+        det.append("Does not clearly reflect SERP entities in title/description.")
+        fixes.append("Include 2–4 of the important terms your competitors use (entities).")
+    if tags_clean:
+        if kw and any(kw in x for x in tags_clean):
+            p1 += 2
+            det.append("Keyword appears in tags (ok but low-importance).")
+        elif len(tags_clean) >= 5:
+            p1 += 1
+            det.append("Tags present (low-importance).")
+    overall = pillar("Search Relevance", p1, 30, det)
+
+    p2, det = 0, []
+    if len(t) == 0:
+        det.append("No title – cannot generate clicks.")
+        fixes.append("Add a compelling title (≤ 70 characters).")
+    elif len(t) <= 70:
+        p2 += 6
+        det.append("Title length is within the recommended range.")
+    else:
+        p2 += 3
+        det.append("Title is quite long; may get truncated on mobile.")
+        fixes.append("Shorten the title so the key hook fits in the first ~60–70 characters.")
+    pw_count = sum(1 for w in _legacy_words(t) if w in POWER_WORDS)
+    if pw_count >= 2:
+        p2 += 5
+        det.append("Title uses strong emotional/power words to stand out.")
+    elif pw_count == 1:
+        p2 += 3
+        det.append("Title includes one emotional/power word.")
+    else:
+        det.append("Title may be too neutral; consider adding one emotional/power word.")
+    if any(p in title_lc for p in CURIOSITY_PHRASES):
+        p2 += 4
+        det.append("Title creates a curiosity gap (very good for CTR).")
+    if any(w in LOSS_AVERSION_WORDS for w in _legacy_words(t)):
+        p2 += 2
+        det.append("Title uses loss-aversion language (e.g., 'stop', 'avoid').")
+    if re.search(r"\b\d+\b", t):
+        p2 += 3
+        det.append("Number in the title suggests structure (lists, steps).")
+    if re.search(r"\byou\b|\byour\b", title_lc):
+        p2 += 2
+        det.append("Title speaks directly to the viewer ('you', 'your').")
+    if has_custom_thumbnail:
+        p2 += 3
+        det.append("Custom thumbnail enabled – critical for CTR.")
+    else:
+        fixes.append("Design and upload a custom thumbnail; default frames perform poorly for CTR.")
+    overall += pillar("Click-Through Potential", p2, 25, det)
+
+    p3, det = 0, []
+    if desc_words == 0:
+        det.append("No description – hard to set expectations or reinforce the hook.")
+    elif desc_words < 80:
+        p3 += 4
+        det.append("Very short description – add more context and structure.")
+    elif desc_words <= 300:
+        p3 += 8
+        det.append("Good description length for setting expectations.")
+    else:
+        p3 += 6
+        det.append("Long description – may be strong if well structured.")
+    if re.search(r"\b\d{1,2}:\d{2}(:\d{2})?\b", d):
+        p3 += 7
+        det.append("Description includes timestamps/chapters – helps segment-based retention.")
+    else:
+        fixes.append("Add timestamps/chapters in the description for easier navigation and better retention.")
+    if any(p in d[:200].lower() for p in HOOK_PHRASES):
+        p3 += 5
+        det.append("First lines clearly state the value and structure (good hook for retention).")
+    else:
+        fixes.append("Use the first 1–2 lines of the description to clearly state what the viewer will get.")
+    if re.search(r"\bpart\s+\d+\b|\bepisode\s+\d+\b", desc_lc):
+        p3 += 3
+        det.append("Part of a series – can improve binge-watching and overall retention.")
+    overall += pillar("Retention Potential", p3, 25, det)
+
+    p4, det = 0, []
+    med_views = env["median_views"]
+    if med_views == 0:
+        p4 += 6
+        det.append("No clear competition data – environment may be open.")
+    elif med_views < 50000:
+        p4 += 10
+        det.append(f"Median views ≈ {med_views:,} – relatively low competition.")
+    elif med_views <= 200000:
+        p4 += 7
+        det.append(f"Median views ≈ {med_views:,} – moderate competition.")
+    else:
+        p4 += 4
+        det.append(f"Median views ≈ {med_views:,} – heavy competition; title/thumbnail must be exceptional.")
+        fixes.append("Environment is competitive – lean harder into a bold hook and strong thumbnail contrast.")
+    if in_playlists:
+        p4 += 5
+        det.append("Video will be in playlists – good for session time and binge-watching.")
+    else:
+        fixes.append("Add this video to at least one relevant playlist to increase session watch time.")
+    if any(p in desc_lc for p in SESSION_PHRASES):
+        p4 += 5
+        det.append("Description hints at next videos/playlist – good for extending sessions.")
+    else:
+        fixes.append("Add a clear call-to-action to a relevant 'next video' or playlist to extend session time.")
+    overall += pillar("Environment & Session", p4, 20, det)
+
+    return max(0, min(100, overall)), pillars, fixes
+
+
+class SeoRulesTests(SimpleTestCase):
+    VOCAB = (
+        sorted(POWER_WORDS) + sorted(LOSS_AVERSION_WORDS) + CURIOSITY_PHRASES + HOOK_PHRASES + SESSION_PHRASES
+        + ["sourdough", "bread", "bake", "home", "you", "your", "0:00", "12:34", "1:02:45", "part 3",
+           "episode 12", "7", "2026", "Bread!", "YOUR", "the", "and", "it's"]
+    )
+    KEYWORDS = ["", "sourdough", "sourdough bread", "bake", "gaming laptop"]
+
+    def _text(self, rng, words):
+        return " ".join(rng.choice(self.VOCAB) for _ in range(words))
+
+    def _package(self, rng):
+        kw = rng.choice(self.KEYWORDS)
+        title = self._text(rng, rng.choice([0, 2, 5, 9, 16]))
+        if kw and rng.random() < 0.5:
+            title = f"{kw} {title}" if rng.random() < 0.5 else f"{title} {kw}"
+        desc = self._text(rng, rng.choice([0, 10, 60, 100, 150, 320, 400]))
+        if kw and rng.random() < 0.4:
+            desc = f"{kw} {desc}" if rng.random() < 0.5 else f"{desc} {kw}"
+        tags = [rng.choice(self.VOCAB + self.KEYWORDS + ["  "]) for _ in range(rng.choice([0, 2, 6]))]
+        entities = rng.sample(["bread", "sourdough", "oven", "laptop", "flour", "starter"], rng.randint(0, 5))
+        env = {"median_views": rng.choice([0, 1200, 49_999, 50_000, 120_000, 200_000, 200_001, 3_000_000])}
+        return kw, title, desc, tags, entities, env, rng.random() < 0.5, rng.random() < 0.5
+
+    def test_matches_if_elif_scorer(self):
+        rng = random.Random(20260301)
+        for _ in range(2000):
+            args = self._package(rng)
+            with self.subTest(args=args):
+                self.assertEqual(evaluate(PackageContext(*args), profile=False), _legacy_score(*args))
+
+    def test_title_uniqueness(self):
+        args = ("bread", "Bread basics", "", [], [], {"median_views": 0}, False, False)
+        _, pillars, fixes = evaluate(PackageContext(*args, closest_title=(0.9, "Bread basics!", "SERP")))
+        self.assertIn("Title is nearly identical to “Bread basics!” (SERP, ~90% overlap).",
+                      pillars["Click-Through Potential"]["details"])
+        self.assertIn("Make the title clearly distinct from titles already ranking or saved in your Library.", fixes)
+
+        score, pillars, fixes = evaluate(PackageContext(*args, closest_title=(0.1, "Other", "Library")))
+        self.assertEqual(score, evaluate(PackageContext(*args))[0])
+        self.assertIn("Title is distinct from titles already ranking and in your Library.",
+                      pillars["Click-Through Potential"]["details"])
+
+
+@override_settings(CACHES=LOCMEM)
+class RollupTests(TestCase):
+    def _rollups(self):
+        return {(r.kind, r.bucket): (r.count, r.score_sum) for r in LibraryRollup.objects.all()}
+
+    def test_apply_matches_rebuild(self):
+        rows = [
+            Optimization.objects.create(keyword=kw, score=score)
+            for kw, score in [("Sourdough Bread", 72), ("sourdough  bread", 55), ("gaming laptop", 100),
+                              ("", 0), ("budget mic", 9), ("gaming laptop", 41)]
+        ]
+        rows[1].created_at -= timedelta(days=21)
+        rows[1].save()
+        rows[0].score = 88
+        rows[0].keyword = "sourdough starter"
+        rows[0].save()
+        rows[2].delete()
+        rows[4].delete()
+
+        incremental = self._rollups()
+        self.assertEqual(incremental[(rollups.TOTAL, "")], (4, 88 + 55 + 0 + 41))
+        self.assertEqual(incremental[(rollups.KEYWORD, "sourdough bread")], (1, 55))
+        self.assertEqual(incremental[(rollups.SCORE, "8")], (1, 88))
+        self.assertEqual(incremental[(rollups.KEYWORD, "gaming laptop")], (1, 41))
+
+        rollups.rebuild()
+        rebuilt = self._rollups()
+        # apply() keeps emptied buckets at zero; rebuild() leaves them out
+        self.assertEqual({k: v for k, v in incremental.items() if v != (0, 0)}, rebuilt)
+        self.assertEqual(rollups.total(), 4)
+
+    def test_apply_without_changes(self):
+        row = Optimization.objects.create(keyword="bread", score=50)
+        before = self._rollups()
+        rollups.apply(added=[row], removed=[row])
+        self.assertEqual(self._rollups(), before)
+
+
+class BatchItemsTests(SimpleTestCase):
+    @override_settings(BATCH_API_MAX_ITEMS=3)
+    def test_rejections(self):
+        cases = [
+            (["bread"], "Expected a JSON object."),
+            ("bread", "Expected a JSON object."),
+            ({}, 'Send "items"'),
+            ({"items": []}, 'Send "items"'),
+            ({"keywords": []}, 'Send "items"'),
+            ({"items": {"keyword": "bread"}}, 'Send "items"'),
+            ({"keywords": ["a", "b", "c", "d"]}, "At most 3 items per batch."),
+            ({"items": ["bread"]}, "Item 0: expected an object."),
+            ({"items": [{"keyword": "a"}, {"type": "delete", "keyword": "b"}]}, "Item 1: type must be one of"),
+            ({"items": [{"type": "discover"}]}, "Item 0: keyword is required."),
+            ({"items": [{"keyword": "   "}]}, "Item 0: keyword is required."),
+            ({"items": [{"keyword": 42}]}, "Item 0: keyword is required."),
+        ]
+        for payload, message in cases:
+            with self.subTest(payload=payload):
+                with self.assertRaisesMessage(ValueError, message):
+                    _batch_items(payload)
+
+    def test_accepted(self):
+        self.assertEqual(
+            _batch_items({"keywords": [" sourdough bread "]}),
+            [{"type": "discover", "keyword": "sourdough bread"}],
+        )
+        items = _batch_items({"items": [{"type": "optimize", "keyword": "bread", "title": "Bread"}]})
+        self.assertEqual(items, [{"type": "optimize", "keyword": "bread", "title": "Bread"}])
@@ -4,10 +4,21 @@ from . import views
 urlpatterns = [
     path("", views.home, name="home"),
     path("optimize/", views.optimize, name="optimize"),
+    path("optimize/score/", views.optimize_score, name="optimize_score"),
     path("discover/", views.discover, name="discover"),
+    path("autocomplete/", views.keyword_autocomplete, name="keyword_autocomplete"),
+    path("serp/history/", views.serp_history, name="serp_history"),
     path("ai/", views.ai_generator, name="ai_generator"),
     path("url/", views.youtube_lookup, name="youtube_lookup"),
     path("tags/", views.tag_finder, name="tag_finder"),
     path("hashtags/", views.hashtag_finder, name="hashtag_finder"),
     path("library/", views.library, name="library"),
+    path("library/export/", views.library_export, name="library_export"),
+    path("library/<int:pk>/track/", views.library_track, name="library_track"),
+    path("library/<int:pk>/ranks/", views.library_ranks, name="library_ranks"),
+    path("research/", views.research_jobs, name="research"),
+    path("research/<int:pk>.csv", views.research_csv, name="research_csv"),
+    path("channel/", views.channel_audit, name="channel_audit"),
+    path("api/batch/", views.api_batch, name="api_batch"),
+    path("metrics", views.metrics_view, name="metrics"),
 ]
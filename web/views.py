@@ -1,26 +1,205 @@
 # web/views.py
 import re
-import math
 import json
-from collections import Counter
+import time
+import asyncio
+from contextlib import aclosing
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.shortcuts import render, redirect
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import http_date, urlencode
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render as django_render
+from django.core.serializers.json import DjangoJSONEncoder
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.contrib import messages
-from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count
 
-from .services.youtube import search_videos, YouTubeError
-from .models import Optimization
-from .services.generation import generate_content  # Gemini wrapper
+from .services.youtube import alookup_videos, asearch_videos, parse_video_id, parse_video_ids, YouTubeError
+from .services.cache import make_key, get_cached, aget_cached, aset_cached, ttl_for
+from .models import Optimization, ResearchJob, TitleBand
+from .services.generation import agenerate_content  # Gemini wrapper
+from .services.seo_rules import PackageContext, evaluate as evaluate_rules
+from .services.serp_stats import env_stats_from_serp, ranking_difficulty, sentiment, serp_entities
+from .services import (
+    autocomplete, batch, channels, keyword_stats, library as library_pages, metrics, rank_tracking, research, rollups,
+    search, similarity, snapshots, transfer, versions,
+)
+
+
+# every page render is a Server-Timing span (lazy context values are evaluated inside it)
+render = metrics.timed("render")(django_render)
+# render() from async views: context processors may read the session (DB)
+arender = sync_to_async(render)
 
 
 def home(request):
     return render(request, "home.html")
 
 
+# ===================== CONDITIONAL GET =====================
+
+def _etag(request, *parts) -> str:
+    # the visitor's CSRF cookie is part of it, so a 304 never revives a page
+    # rendered with someone else's token
+    return '"%s"' % make_key(*parts, request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""))
+
+
+def _with_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)   # always revalidate, never shared
+    return response
+
+
+def _not_modified(request, etag, last_modified=None):
+    """A 304 if the client's copy is current and no flash message is waiting, else None."""
+    if request.method not in ("GET", "HEAD") or len(messages.get_messages(request)):
+        return None
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified) if last_modified else None,
+    )
+    return _with_validators(response, etag, last_modified) if response is not None else None
+
+
 # ===================== DISCOVER =====================
 
-def discover(request):
+def _store_discover_serp(q: str, region: str, data):
+    """The DB side of a Discover fetch, in one sync hop (a tracked keyword's stats get the live SERP)."""
+    autocomplete.record_search(q, [v["title"] for v in data])
+    snapshots.record(q, region, data)
+    if len(data) >= keyword_stats.SERP_SIZE:    # stats are defined at SERP_SIZE depth
+        keyword_stats.record_live_serp(q, region, data[:keyword_stats.SERP_SIZE])
+
+
+async def _discover_results(q: str, n: int, region: str) -> dict:
+    """
+    Raw SERP + AI insight for (q, n, region), kept under a short-lived result handle
+    so sort/filter/length changes re-render from cache with no API or AI calls.
+    """
+    handle = make_key(q, n, region)
+    entry = await aget_cached("serp", handle)
+    if entry is not None:
+        return entry
+
+    data = await asearch_videos(q, max_results=n, region=region)
+    store = sync_to_async(_store_discover_serp)
+
+    # ---- AI insight for Discover (on the raw ranking, independent of filters) ----
+    ai_insight = None
+    if data:
+        sample = [
+            {
+                "title": v["title"],
+                "views": v["views"],
+                "likes": v["likes"],
+                "comments": v["comments"],
+                "duration_sec": v["duration_sec"],
+            }
+            for v in data[:8]
+        ]
+        prompt = f"""
+You are a senior YouTube SEO strategist.
+
+Analyze this search results snapshot for keyword: "{q}"
+
+DATA (JSON list):
+{json.dumps(sample, indent=2)}
+
+In 5 bullet points, answer:
+- How competitive is this keyword (low/medium/high) and why?
+- What style of videos are winning (tutorials, shorts, reviews, etc.)?
+- What angle would you recommend for a new video to stand out?
+- Suggested ideal video length.
+- Any quick-win ideas for title hooks.
+
+Answer concisely in markdown bullet points only.
+"""
+        # the DB writes run while Gemini thinks
+        ai_insight, _ = await asyncio.gather(agenerate_content(prompt), store(q, region, data))
+    else:
+        await store(q, region, data)
+
+    return await aset_cached("serp", handle, {
+        "handle": handle,
+        "fetched_at": time.time(),      # data version of everything rendered from this entry
+        "items": data,
+        "ai_insight": ai_insight,
+    })
+
+
+def _refine_results(data, sort, text_filter, min_len_sec, max_len_sec):
+    """Filter + sort a cached SERP in memory (never mutates the cached items)."""
+    processed = []
+    for v in data:
+        if min_len_sec is not None and v["duration_sec"] < min_len_sec:
+            continue
+        if max_len_sec is not None and v["duration_sec"] > max_len_sec:
+            continue
+        if text_filter:
+            blob = (v["title"] + " " + (v.get("description") or "")).lower()
+            if text_filter not in blob:
+                continue
+        v = dict(v)
+        v["ratio"] = (v["likes"] / v["views"]) if v["views"] > 0 else None
+        processed.append(v)
+
+    # sorting
+    if sort == "likes":
+        processed.sort(key=lambda x: x["likes"], reverse=True)
+    elif sort == "comments":
+        processed.sort(key=lambda x: x["comments"], reverse=True)
+    elif sort == "views":
+        processed.sort(key=lambda x: x["views"], reverse=True)
+    elif sort == "published":
+        processed.sort(key=lambda x: x["published"], reverse=True)
+    # else 'ranking' = API order
+
+    return processed
+
+
+def _serp_summary(results) -> dict:
+    """Sidebar aggregates for a refined SERP: averages, audience sentiment and ranking difficulty."""
+    avg_likes = avg_views = avg_comments = avg_ratio = None
+    sentiment_emoji, sentiment_text = "😶", "No data yet"
+    difficulty1 = difficulty5 = 0
+
+    if results:
+        nres = len(results)
+        avg_likes = sum(v["likes"] for v in results) / nres
+        avg_views = sum(v["views"] for v in results) / nres
+        avg_comments = sum(v["comments"] for v in results) / nres
+        ratios = [v["ratio"] for v in results if v["ratio"] is not None]
+        avg_ratio = (sum(ratios) / len(ratios)) if ratios else None
+
+        sentiment_emoji, sentiment_text = sentiment(avg_ratio)
+        difficulty1, difficulty5 = ranking_difficulty(results)
+
+    return {
+        "avg": {
+            "likes": avg_likes,
+            "views": avg_views,
+            "comments": avg_comments,
+            "ratio": avg_ratio,
+        },
+        "sentiment": {
+            "emoji": sentiment_emoji,
+            "text": sentiment_text,
+        },
+        "difficulty": {
+            "top1": difficulty1,
+            "top5": difficulty5,
+        },
+    }
+
+
+async def discover(request):
     q = request.GET.get("q", "").strip()
 
     # basic bar
@@ -45,108 +224,39 @@ def discover(request):
 
     region = getattr(settings, "YOUTUBE_DEFAULT_REGION", "US")
     results, error = [], None
-
-    # aggregated stats defaults
-    avg_likes = avg_views = avg_comments = avg_ratio = None
-    sentiment_emoji, sentiment_text = "😶", "No data yet"
-    difficulty1 = difficulty5 = 0
+    summary = _serp_summary([])   # aggregated stats defaults
 
     ai_insight = None  # 👈 AI summary for Discover
 
+    # rendered fragments/validators need a data version; without one, don't cache (ttl 0)
+    frag_key, fragment_ttl, etag, last_modified = None, 0, None, None
+
     if q:
         try:
-            data = search_videos(q, max_results=n, region=region)
-
-            # filter + ratio
-            processed = []
-            for v in data:
-                if min_len_sec is not None and v["duration_sec"] < min_len_sec:
-                    continue
-                if max_len_sec is not None and v["duration_sec"] > max_len_sec:
-                    continue
-                if text_filter:
-                    blob = (v["title"] + " " + (v.get("description") or "")).lower()
-                    if text_filter not in blob:
-                        continue
-                v["ratio"] = (v["likes"] / v["views"]) if v["views"] > 0 else None
-                processed.append(v)
-
-            # sorting
-            if sort == "likes":
-                processed.sort(key=lambda x: x["likes"], reverse=True)
-            elif sort == "comments":
-                processed.sort(key=lambda x: x["comments"], reverse=True)
-            elif sort == "views":
-                processed.sort(key=lambda x: x["views"], reverse=True)
-            elif sort == "published":
-                processed.sort(key=lambda x: x["published"], reverse=True)
-            # else 'ranking' = API order
-
-            results = processed
+            entry = await _discover_results(q, n, region)
+            if entry.get("fetched_at"):
+                last_modified = entry["fetched_at"]
+                frag_key = make_key(entry["handle"], last_modified, q, sort, text_filter, min_len_sec, max_len_sec)
+                fragment_ttl = ttl_for("serp")
+                etag = _etag(request, "discover", frag_key)
+                not_modified = await sync_to_async(_not_modified)(request, etag, last_modified)
+                if not_modified is not None:
+                    return not_modified
+            results = _refine_results(entry["items"], sort, text_filter, min_len_sec, max_len_sec)
 
             # aggregates (sidebar)
+            summary = _serp_summary(results)
             if results:
-                nres = len(results)
-                avg_likes = sum(v["likes"] for v in results) / nres
-                avg_views = sum(v["views"] for v in results) / nres
-                avg_comments = sum(v["comments"] for v in results) / nres
-                ratios = [v["ratio"] for v in results if v["ratio"] is not None]
-                avg_ratio = (sum(ratios) / len(ratios)) if ratios else None
-
-                if avg_ratio is None or avg_ratio < 0.01:
-                    sentiment_emoji, sentiment_text = "😞", "People don't seem to like these videos"
-                elif avg_ratio < 0.04:
-                    sentiment_emoji, sentiment_text = "😐", "Audience sentiment looks average"
-                else:
-                    sentiment_emoji, sentiment_text = "😊", "Audience seems to like these videos"
-
-                top_sorted = sorted(results, key=lambda x: x["views"], reverse=True)
-                top1 = top_sorted[0]["views"] if top_sorted else 0
-                top5 = top_sorted[4]["views"] if len(top_sorted) >= 5 else (
-                    top_sorted[-1]["views"] if top_sorted else 0
-                )
-
-                def score(v):
-                    return min(100, int(math.log10(v + 1) * 20))
-
-                difficulty1, difficulty5 = score(top1), score(top5)
-
-                # ---- AI insight for Discover ----
-                sample = [
-                    {
-                        "title": v["title"],
-                        "views": v["views"],
-                        "likes": v["likes"],
-                        "comments": v["comments"],
-                        "duration_sec": v["duration_sec"],
-                    }
-                    for v in results[:8]
-                ]
-                prompt = f"""
-You are a senior YouTube SEO strategist.
-
-Analyze this search results snapshot for keyword: "{q}"
-
-DATA (JSON list):
-{json.dumps(sample, indent=2)}
-
-In 5 bullet points, answer:
-- How competitive is this keyword (low/medium/high) and why?
-- What style of videos are winning (tutorials, shorts, reviews, etc.)?
-- What angle would you recommend for a new video to stand out?
-- Suggested ideal video length.
-- Any quick-win ideas for title hooks.
-
-Answer concisely in markdown bullet points only.
-"""
-                ai_insight = generate_content(prompt)
+                ai_insight = entry["ai_insight"]
 
         except YouTubeError as e:
             error = str(e)
         except Exception as e:
             error = f"Unexpected error: {e}"
 
-    return render(request, "discover.html", {
+    response = await arender(request, "discover.html", {
+        "frag_key": frag_key,
+        "fragment_ttl": fragment_ttl,
         "q": q,
         "n": n,
         "n_options": n_options,
@@ -157,124 +267,51 @@ Answer concisely in markdown bullet points only.
         "text_filter": request.GET.get("filter", ""),
         "min_len_min": min_len_min,
         "max_len_min": max_len_min,
-        "avg": {
-            "likes": avg_likes,
-            "views": avg_views,
-            "comments": avg_comments,
-            "ratio": avg_ratio,
-        },
-        "sentiment": {
-            "emoji": sentiment_emoji,
-            "text": sentiment_text,
-        },
-        "difficulty": {
-            "top1": difficulty1,
-            "top5": difficulty5,
-        },
+        **summary,
         "ai_insight": ai_insight,
     })
+    return _with_validators(response, etag, last_modified) if etag and not error else response
 
 
-# ===================== OPTIMIZE HELPERS =====================
+# ===================== KEYWORD AUTOCOMPLETE =====================
 
-STOPWORDS = {
-    "the", "a", "an", "and", "or", "for", "with", "without", "in", "on", "of", "to", "from", "by", "at", "is", "are",
-    "be", "this", "that", "those", "these", "it", "its", "as", "you", "your", "yours", "ours", "we", "us", "our",
-    "how", "what", "why", "when", "where", "who", "will", "can", "could", "should", "would", "i", "me", "my",
-    "vs", "vs.", "&", "-", "_", "best", "new", "top", "2023", "2024", "2025"
-}
-
-# ---- New: advanced optimization scoring based on YT ranking blueprint ----
-
-POWER_WORDS = {
-    "secret", "secrets", "mistake", "mistakes", "hidden", "insane", "crazy",
-    "shocking", "simple", "easy", "ultimate", "pro", "advanced", "powerful",
-    "killer", "dangerous", "hack", "hacks", "fix", "fixes", "broken"
-}
-
-CURIOSITY_PHRASES = [
-    "no one tells you",
-    "nobody tells you",
-    "what no one",
-    "what nobody",
-    "the truth about",
-    "you won't believe",
-    "stop doing this",
-    "before you",
-    "no one is talking about",
-]
-
-LOSS_AVERSION_WORDS = {
-    "stop", "avoid", "never", "lose", "losing", "wasting", "ruin", "kill"
-}
-
-
-def _count_occurrences(text: str, words: set[str]) -> int:
-    if not text:
-        return 0
-    tokens = re.findall(r"[A-Za-z0-9']+", text.lower())
-    return sum(1 for t in tokens if t in words)
-
-
-def _has_any_phrase(text: str, phrases: list[str]) -> bool:
-    if not text:
-        return False
-    tl = text.lower()
-    return any(p in tl for p in phrases)
-
-
-def _has_chapters(description: str) -> bool:
-    """Rough check for timestamps like 0:00, 12:34, 1:02:45."""
-    if not description:
-        return False
-    return bool(re.search(r"\b\d{1,2}:\d{2}(:\d{2})?\b", description))
-
-
-def _word_count(text: str) -> int:
-    if not text:
-        return 0
-    return len(re.findall(r"[A-Za-z0-9']+", text))
-
-
-def _env_stats_from_serp(serp):
-    """Compute environment difficulty stats from SERP (views, likes, comments)."""
-    if not serp:
-        return {
-            "median_views": 0,
-            "median_likes_per_1k": 0.0,
-            "median_comments_per_1k": 0.0,
-        }
-    views_list = [v["views"] for v in serp if v.get("views") is not None]
-    if not views_list:
-        views_list = [0]
-    views_sorted = sorted(views_list)
-    mid = len(views_sorted) // 2
-    if len(views_sorted) % 2 == 0:
-        median_views = (views_sorted[mid - 1] + views_sorted[mid]) / 2
-    else:
-        median_views = views_sorted[mid]
-
-    likes_per_1k = []
-    comments_per_1k = []
-    for v in serp:
-        vw = max(v.get("views") or 0, 1)
-        likes = v.get("likes") or 0
-        comments = v.get("comments") or 0
-        likes_per_1k.append(likes * 1000 / vw)
-        comments_per_1k.append(comments * 1000 / vw)
-    likes_per_1k.sort()
-    comments_per_1k.sort()
-    mid_l = len(likes_per_1k) // 2
-    mid_c = len(comments_per_1k) // 2
-    med_likes_1k = likes_per_1k[mid_l] if likes_per_1k else 0.0
-    med_comments_1k = comments_per_1k[mid_c] if comments_per_1k else 0.0
+def keyword_autocomplete(request):
+    """Ranked keyword suggestions for a typed prefix (JSON)."""
+    prefix = request.GET.get("q", "")
+    try:
+        limit = max(1, min(int(request.GET.get("limit", "8")), 20))
+    except ValueError:
+        limit = 8
+    return JsonResponse({"q": prefix, "suggestions": autocomplete.suggest(prefix, limit)})
 
-    return {
-        "median_views": int(median_views),
-        "median_likes_per_1k": med_likes_1k,
-        "median_comments_per_1k": med_comments_1k,
-    }
 
+def serp_history(request):
+    """
+    Stored SERP snapshots for a keyword (JSON), newest first.
+    ?columns=ids,views,likes,comments picks what gets decoded (default: views);
+    ?video=<id> returns that video's rank per snapshot instead.
+    """
+    kw = request.GET.get("keyword", "").strip()
+    region = request.GET.get("region") or getattr(settings, "YOUTUBE_DEFAULT_REGION", "US")
+    try:
+        limit = max(1, min(int(request.GET.get("limit", "30")), 200))
+    except ValueError:
+        limit = 30
+    video = request.GET.get("video", "").strip()
+    if video:
+        ranks = snapshots.rank_history(kw, region, video, limit=limit)
+        return JsonResponse({"keyword": kw, "region": region, "video": video,
+                             "ranks": [{"fetched_at": t.isoformat(), "rank": r} for t, r in ranks]})
+
+    columns = [c for c in request.GET.get("columns", "views").split(",") if c in snapshots.COLUMNS] or ["views"]
+    rows = snapshots.history(kw, region, columns=columns, limit=limit)
+    return JsonResponse({"keyword": kw, "region": region, "columns": columns,
+                         "snapshots": [{"fetched_at": t.isoformat(), **cols} for t, cols in rows]})
+
+
+# ===================== OPTIMIZE HELPERS =====================
+
+@metrics.timed("score")
 def score_holistic_package(
     main_keyword: str,
     title: str,
@@ -284,274 +321,87 @@ def score_holistic_package(
     serp,
     has_custom_thumbnail: bool,
     in_playlists: bool,
+    env_stats: dict = None,
+    closest_title=None,
 ):
     """
     Returns (overall_score, pillars:dict, fixes:list)
 
-    Pillars (0–100 scaled):
+    Pillars (0–100 scaled), defined as rule tables in services/seo_rules.py:
       - Search Relevance (max 30)
       - Click-Through Potential (max 25)
       - Retention Potential (max 25)
       - Environment & Session Setup (max 20)
-    """
-    fixes: list[str] = []
-    pillars: dict[str, dict] = {}
-
-    kw = (main_keyword or "").strip().lower()
-    t = (title or "").strip()
-    d = (description or "").strip()
-    tags_clean = [t.strip().lower() for t in tags_list if t and t.strip()]
-    ents = entities or []
-
-    title_lc = t.lower()
-    desc_lc = d.lower()
 
-    # ---------- Pillar 1: Search Relevance (0–30) ----------
-    p1_score = 0
-    p1_max = 30
-    p1_details = []
-
-    # Keyword in title & early
-    if kw:
-        if kw in title_lc:
-            p1_score += 8
-            p1_details.append("Main keyword present in title.")
-            idx = title_lc.find(kw)
-            if idx <= 15:
-                p1_score += 4
-                p1_details.append("Keyword appears early in the title.")
-        else:
-            p1_details.append("Keyword is missing from title.")
-            fixes.append("Include the main keyword in the title.")
-
-        # keyword "above the fold" in description (first ~80 chars)
-        if kw in desc_lc[:80]:
-            p1_score += 6
-            p1_details.append("Keyword appears early in the description.")
-        elif kw in desc_lc:
-            p1_score += 3
-            p1_details.append("Keyword appears in the description (not early).")
-        else:
-            fixes.append("Mention the main keyword near the start of the description.")
-
-    # Description length – aim for at least ~250 words (Search best practice)
-    desc_words = _word_count(d)
-    if desc_words == 0:
-        p1_details.append("No description text.")
-        fixes.append("Add a descriptive, keyword-rich description (min 150–250 words).")
-    elif desc_words < 120:
-        p1_score += 4
-        p1_details.append("Short description – add more context and variations of your keyword.")
-        fixes.append("Expand the description to better explain the content and include related phrases.")
-    elif 120 <= desc_words <= 350:
-        p1_score += 8
-        p1_details.append("Solid description length for Search.")
-    elif desc_words > 350:
-        p1_score += 6
-        p1_details.append("Very detailed description – good for Search, ensure it remains readable.")
-
-    # Entities & semantic coverage
-    ent_matches = 0
-    for e in ents:
-        if e.lower() in title_lc or e.lower() in desc_lc:
-            ent_matches += 1
-    if ent_matches:
-        bonus = min(8, ent_matches * 2)
-        p1_score += bonus
-        p1_details.append(f"Includes {ent_matches} important topic entities from top results.")
-    else:
-        p1_details.append("Does not clearly reflect SERP entities in title/description.")
-        fixes.append("Include 2–4 of the important terms your competitors use (entities).")
-
-    # Tags: tiny weight
-    if tags_clean:
-        if kw and any(kw in t for t in tags_clean):
-            p1_score += 2
-            p1_details.append("Keyword appears in tags (ok but low-importance).")
-        elif len(tags_clean) >= 5:
-            p1_score += 1
-            p1_details.append("Tags present (low-importance).")
-
-    p1_score = min(p1_max, max(0, p1_score))
-    p1_pct = int(p1_score / p1_max * 100) if p1_max else 0
-    pillars["Search Relevance"] = {
-        "score": p1_score,
-        "max": p1_max,
-        "pct": p1_pct,
-        "details": p1_details,
-    }
-
-    # ---------- Pillar 2: Click-Through Potential (0–25) ----------
-    p2_score = 0
-    p2_max = 25
-    p2_details = []
-
-    tlen = len(t)
-    if tlen == 0:
-        p2_details.append("No title – cannot generate clicks.")
-        fixes.append("Add a compelling title (≤ 70 characters).")
-    elif tlen <= 70:
-        p2_score += 6
-        p2_details.append("Title length is within the recommended range.")
-    else:
-        p2_score += 3
-        p2_details.append("Title is quite long; may get truncated on mobile.")
-        fixes.append("Shorten the title so the key hook fits in the first ~60–70 characters.")
-
-    # Power words & emotion
-    pw_count = _count_occurrences(t, POWER_WORDS)
-    if pw_count >= 2:
-        p2_score += 5
-        p2_details.append("Title uses strong emotional/power words to stand out.")
-    elif pw_count == 1:
-        p2_score += 3
-        p2_details.append("Title includes one emotional/power word.")
-    else:
-        p2_details.append("Title may be too neutral; consider adding one emotional/power word.")
-
-    # Curiosity & loss aversion
-    if _has_any_phrase(t, CURIOSITY_PHRASES):
-        p2_score += 4
-        p2_details.append("Title creates a curiosity gap (very good for CTR).")
-    la_count = _count_occurrences(t, LOSS_AVERSION_WORDS)
-    if la_count >= 1:
-        p2_score += 2
-        p2_details.append("Title uses loss-aversion language (e.g., 'stop', 'avoid').")
-
-    # Numbers / structured format
-    if re.search(r"\b\d+\b", t):
-        p2_score += 3
-        p2_details.append("Number in the title suggests structure (lists, steps).")
-
-    # Direct address
-    if re.search(r"\byou\b|\byour\b", t.lower()):
-        p2_score += 2
-        p2_details.append("Title speaks directly to the viewer ('you', 'your').")
-
-    # Custom thumbnail?
-    if has_custom_thumbnail:
-        p2_score += 3
-        p2_details.append("Custom thumbnail enabled – critical for CTR.")
-    else:
-        fixes.append("Design and upload a custom thumbnail; default frames perform poorly for CTR.")
-
-    p2_score = min(p2_max, max(0, p2_score))
-    p2_pct = int(p2_score / p2_max * 100) if p2_max else 0
-    pillars["Click-Through Potential"] = {
-        "score": p2_score,
-        "max": p2_max,
-        "pct": p2_pct,
-        "details": p2_details,
-    }
-
-    # ---------- Pillar 3: Retention Potential (0–25) ----------
-    p3_score = 0
-    p3_max = 25
-    p3_details = []
-
-    if desc_words == 0:
-        p3_details.append("No description – hard to set expectations or reinforce the hook.")
-    elif desc_words < 80:
-        p3_score += 4
-        p3_details.append("Very short description – add more context and structure.")
-    elif 80 <= desc_words <= 300:
-        p3_score += 8
-        p3_details.append("Good description length for setting expectations.")
-    else:
-        p3_score += 6
-        p3_details.append("Long description – may be strong if well structured.")
-
-    # Chapters
-    if _has_chapters(d):
-        p3_score += 7
-        p3_details.append("Description includes timestamps/chapters – helps segment-based retention.")
-    else:
-        fixes.append("Add timestamps/chapters in the description for easier navigation and better retention.")
+    Pass precomputed `env_stats` (see serp_stats.env_stats_from_serp) to skip recomputing
+    them from `serp`, and `closest_title` (see _closest_title) to report title uniqueness.
+    """
+    env = env_stats if env_stats is not None else env_stats_from_serp(serp or [])
+    ctx = PackageContext(
+        main_keyword, title, description, tags_list, entities,
+        env, has_custom_thumbnail, in_playlists, closest_title,
+    )
+    return evaluate_rules(ctx)
 
-    # Hook language in first lines
-    first_200 = d[:200].lower()
-    if any(word in first_200 for word in ["in this video", "you will learn", "we cover", "step-by-step", "tutorial"]):
-        p3_score += 5
-        p3_details.append("First lines clearly state the value and structure (good hook for retention).")
-    else:
-        fixes.append("Use the first 1–2 lines of the description to clearly state what the viewer will get.")
-
-    # Series hint
-    if re.search(r"\bpart\s+\d+\b|\bepisode\s+\d+\b", d.lower()):
-        p3_score += 3
-        p3_details.append("Part of a series – can improve binge-watching and overall retention.")
-
-    p3_score = min(p3_max, max(0, p3_score))
-    p3_pct = int(p3_score / p3_max * 100) if p3_max else 0
-    pillars["Retention Potential"] = {
-        "score": p3_score,
-        "max": p3_max,
-        "pct": p3_pct,
-        "details": p3_details,
-    }
 
-    # ---------- Pillar 4: Environment & Session Setup (0–20) ----------
-    p4_score = 0
-    p4_max = 20
-    p4_details = []
-
-    env = _env_stats_from_serp(serp or [])
-    med_views = env["median_views"]
-
-    if med_views == 0:
-        p4_score += 6
-        p4_details.append("No clear competition data – environment may be open.")
-    elif med_views < 50000:
-        p4_score += 10
-        p4_details.append(f"Median views ≈ {med_views:,} – relatively low competition.")
-    elif 50000 <= med_views <= 200000:
-        p4_score += 7
-        p4_details.append(f"Median views ≈ {med_views:,} – moderate competition.")
-    else:
-        p4_score += 4
-        p4_details.append(f"Median views ≈ {med_views:,} – heavy competition; title/thumbnail must be exceptional.")
-        fixes.append("Environment is competitive – lean harder into a bold hook and strong thumbnail contrast.")
+def _store_keyword_serp(kw: str, region: str, serp, titles):
+    keyword_stats.record_live_serp(kw, region, serp)
+    autocomplete.record_search(kw, titles)
+    snapshots.record(kw, region, serp)
 
-    if in_playlists:
-        p4_score += 5
-        p4_details.append("Video will be in playlists – good for session time and binge-watching.")
-    else:
-        fixes.append("Add this video to at least one relevant playlist to increase session watch time.")
 
-    if any(word in desc_lc for word in ["watch next", "next video", "playlist", "series", "part 2", "episode 2"]):
-        p4_score += 5
-        p4_details.append("Description hints at next videos/playlist – good for extending sessions.")
+async def _keyword_context(kw: str, region: str) -> dict:
+    """
+    SERP-derived context for a keyword: top entities + environment stats.
+    Served from cache, then a fresh precomputed KeywordStats row, and only then
+    from a live SERP fetch.
+    """
+    key = make_key(kw, region)
+    ctx = await aget_cached("kwctx", key)
+    if ctx is not None:
+        return ctx
+
+    stats = await sync_to_async(keyword_stats.get_fresh)(kw, region)
+    if stats is not None:
+        ctx = {"entities": stats.entity_list, "env": stats.env, "serp_count": stats.serp_count}
+        titles = stats.serp_titles
     else:
-        fixes.append("Add a clear call-to-action to a relevant 'next video' or playlist to extend session time.")
-
-    p4_score = min(p4_max, max(0, p4_score))
-    p4_pct = int(p4_score / p4_max * 100) if p4_max else 0
-    pillars["Environment & Session"] = {
-        "score": p4_score,
-        "max": p4_max,
-        "pct": p4_pct,
-        "details": p4_details,
-    }
-
-    # ---------- Aggregate ----------
-    overall = p1_score + p2_score + p3_score + p4_score
-    overall = max(0, min(100, overall))
-
-    return overall, pillars, fixes
+        serp = await asearch_videos(kw, max_results=keyword_stats.SERP_SIZE, region=region) if kw else []
+        titles = [v["title"] for v in serp]
+        if kw:
+            await sync_to_async(_store_keyword_serp)(kw, region, serp, titles)
+        ctx = {
+            "entities": serp_entities(serp, top_k=10),
+            "env": env_stats_from_serp(serp),
+            "serp_count": len(serp),
+        }
+    ctx["title_sketches"] = [(similarity.signature(t), t) for t in titles if t]
+    return await aset_cached("kwctx", key, ctx)
 
 
-def _tokenize(text: str):
-    if not text:
-        return []
-    words = re.findall(r"[A-Za-z0-9]+", text.lower())
-    return [w for w in words if len(w) >= 3 and w not in STOPWORDS]
+LIBRARY_SIMILAR_CANDIDATES = 200
 
 
-def _extract_top_entities(strings, top_k=10):
-    counter = Counter()
-    for s in strings:
-        counter.update(_tokenize(s))
-    return [w for w, _ in counter.most_common(top_k)]
+def _closest_title(title: str, serp_sketches=()):
+    """
+    Most similar existing title, from the keyword's SERP (cached sketches) and the
+    Library (LSH bucket lookup), as (similarity, title, source) or None.
+    """
+    sig = similarity.signature(title)
+    if sig is None:
+        return None
+    candidates = [(other, t, "ranking for this keyword") for other, t in serp_sketches]
+    # weak matches still share a band now and then; the titles sharing the most bands come first
+    best = (
+        TitleBand.objects.filter(bucket__in=similarity.band_keys(sig))
+        .values("optimization_id").annotate(shared=Count("id"))
+        .order_by("-shared", "-optimization_id")[:LIBRARY_SIMILAR_CANDIDATES]
+    )
+    ids = [row["optimization_id"] for row in best]
+    for row in Optimization.objects.filter(id__in=ids).only("title", "title_minhash"):
+        if row.title_minhash:
+            candidates.append((similarity.unpack(row.title_minhash), row.title, "in your Library"))
+    return similarity.closest(sig, candidates)
 
 
 def _score_optimize(main_keyword, title, description, tags_list, entities):
@@ -759,7 +609,114 @@ def score_metadata(title: str, description: str, tags_list: list[str], hashtags_
 
 # ===================== OPTIMIZE VIEW (with AI) =====================
 
-def optimize(request):
+async def _analyze_package(kw: str, title: str, desc: str, tags: list[str], has_custom_thumbnail: bool,
+                           in_playlists: bool, region: str = None, with_ai: bool = True, ctx: dict = None) -> dict:
+    """
+    The Optimize analysis of one package: pillar + metadata scores, fixes,
+    rule-based suggestions and (with_ai) Gemini rewrites. Raises YouTubeError
+    when the keyword's SERP can't be fetched. Pass the keyword's `ctx` if the
+    caller already has it.
+    """
+    region = region or getattr(settings, "YOUTUBE_DEFAULT_REGION", "US")
+    if ctx is None:
+        ctx = await _keyword_context(kw, region)
+    entities = ctx["entities"]
+
+    closest = await sync_to_async(_closest_title)(title, ctx.get("title_sketches", []))
+
+    # ---- NEW: advanced holistic scoring ----
+    overall_score, pillars, pillar_fixes = score_holistic_package(
+        kw, title, desc, tags, entities, None, has_custom_thumbnail, in_playlists,
+        env_stats=ctx["env"],
+        closest_title=closest,
+    )
+
+    # Legacy-style metadata-only score (still useful)
+    meta_score, meta_breakdown, meta_fixes = score_metadata(
+        title or "", desc or "", tags or [], hashtags_from_tags(tags, kw)
+    )
+
+    # combine all fixes
+    all_fixes = pillar_fixes + meta_fixes
+
+    analysis = {
+        "entities": entities,
+        "score": overall_score,
+        # simple breakdown for template (pillar name -> score)
+        "breakdown": {name: info["score"] for name, info in pillars.items()},
+        "pillars": pillars,
+        "fixes": all_fixes,
+        "serp_count": ctx["serp_count"],
+        "title_len": len(title),
+        "desc_len": len(desc),
+        "tags_count": len(tags),
+        "title_uniqueness": {
+            "pct": 100 - int(closest[0] * 100),
+            "closest": closest[1],
+            "source": closest[2],
+        } if closest else None,
+        "checks": {
+            "custom_thumbnail": has_custom_thumbnail,
+            "in_playlists": in_playlists,
+        },
+        "meta_score": meta_score,
+        "meta_breakdown": meta_breakdown,
+        "meta_fixes": meta_fixes,
+    }
+
+    # ---------- rule-based suggestions ----------
+    suggested_titles = suggest_titles(kw, entities)
+    suggested_desc = suggest_description(kw, entities)
+    suggested_tags = suggest_tags(kw, entities)
+    suggested_hash = hashtags_from_tags(suggested_tags, kw)
+
+    analysis.update({
+        "suggested_titles": suggested_titles,
+        "suggested_description": suggested_desc,
+        "suggested_tags": suggested_tags,
+        "suggested_hashtags": suggested_hash,
+    })
+
+    # ---------- AI-powered suggestions (Gemini) ----------
+    if with_ai and (kw or title or desc):
+        ai_payload = {
+            "keyword": kw,
+            "current_title": title,
+            "current_description": desc,
+            "current_tags": tags,
+            "entities": entities,
+        }
+        ai_prompt = f"""
+        You are a senior YouTube SEO strategist.
+
+        Improve this video package for both Search and Recommendation.
+
+        DATA (JSON):
+        {json.dumps(ai_payload, indent=2)}
+
+        Return ONLY valid JSON with this exact structure:
+        {{
+          "titles": ["title1", "title2", "title3"],
+          "description": "rewritten description",
+          "tags": ["tag1", "tag2", "tag3"],
+          "hashtags": ["#tag1", "#tag2", "#tag3"]
+        }}
+        """
+        try:
+            ai_raw = await agenerate_content(ai_prompt)
+            try:
+                ai_json = json.loads(ai_raw)
+                analysis["ai_metadata"] = ai_json
+            except Exception:
+                analysis["ai_metadata_raw"] = ai_raw
+        except Exception as e:
+            # don't kill the whole analysis if AI fails
+            analysis["ai_error"] = str(e)
+
+    return analysis
+
+
+async def optimize(request):
     """
     GET -> analyze inputs with advanced, pillar-based scoring + rule-based + AI suggestions.
     POST -> save optimization to Library.
@@ -775,7 +732,7 @@ def optimize(request):
         score = int(request.POST.get("score", "0") or 0)
         entities = request.POST.get("entities", "")
 
-        Optimization.objects.create(
+        await Optimization.objects.acreate(
             keyword=kw,
             title=title,
             description=desc,
@@ -785,6 +742,7 @@ def optimize(request):
             score=score,
             entities=entities,
         )
+        await sync_to_async(autocomplete.record_keyword)(kw)
         messages.success(request, "Optimization saved to Library ✅")
         return redirect("library")
 
@@ -803,99 +761,13 @@ def optimize(request):
 
     if action == "analyze":
         try:
-            region = getattr(settings, "YOUTUBE_DEFAULT_REGION", "US")
-            serp = search_videos(kw, max_results=15, region=region) if kw else []
-            corpus = [(v["title"] or "") + " " + (v["description"] or "") for v in serp]
-            entities = _extract_top_entities(corpus, top_k=10)
-
-            # ---- NEW: advanced holistic scoring ----
-            overall_score, pillars, pillar_fixes = score_holistic_package(
-                kw, title, desc, tags, entities, serp, has_custom_thumbnail, in_playlists
-            )
-
-            # Legacy-style metadata-only score (still useful)
-            meta_score, meta_breakdown, meta_fixes = score_metadata(
-                title or "", desc or "", tags or [], hashtags_from_tags(tags, kw)
-            )
-
-            # combine all fixes
-            all_fixes = pillar_fixes + meta_fixes
-
-            analysis = {
-                "entities": entities,
-                "score": overall_score,
-                # simple breakdown for template (pillar name -> score)
-                "breakdown": {name: info["score"] for name, info in pillars.items()},
-                "pillars": pillars,
-                "fixes": all_fixes,
-                "serp_count": len(serp),
-                "title_len": len(title),
-                "desc_len": len(desc),
-                "tags_count": len(tags),
-                "checks": {
-                    "custom_thumbnail": has_custom_thumbnail,
-                    "in_playlists": in_playlists,
-                },
-                "meta_score": meta_score,
-                "meta_breakdown": meta_breakdown,
-                "meta_fixes": meta_fixes,
-            }
-
-            # ---------- rule-based suggestions ----------
-            suggested_titles = suggest_titles(kw, entities)
-            suggested_desc = suggest_description(kw, entities)
-            suggested_tags = suggest_tags(kw, entities)
-            suggested_hash = hashtags_from_tags(suggested_tags, kw)
-
-            analysis.update({
-                "suggested_titles": suggested_titles,
-                "suggested_description": suggested_desc,
-                "suggested_tags": suggested_tags,
-                "suggested_hashtags": suggested_hash,
-            })
-
-            # ---------- AI-powered suggestions (Gemini) ----------
-            if kw or title or desc:
-                ai_payload = {
-                    "keyword": kw,
-                    "current_title": title,
-                    "current_description": desc,
-                    "current_tags": tags,
-                    "entities": entities,
-                }
-                ai_prompt = f"""
-                You are a senior YouTube SEO strategist.
-
-                Improve this video package for both Search and Recommendation.
-
-                DATA (JSON):
-                {json.dumps(ai_payload, indent=2)}
-
-                Return ONLY valid JSON with this exact structure:
-                {{
-                  "titles": ["title1", "title2", "title3"],
-                  "description": "rewritten description",
-                  "tags": ["tag1", "tag2", "tag3"],
-                  "hashtags": ["#tag1", "#tag2", "#tag3"]
-                }}
-                """
-                try:
-                    ai_raw = generate_content(ai_prompt)
-                    try:
-                        ai_json = json.loads(ai_raw)
-                        analysis["ai_metadata"] = ai_json
-                    except Exception:
-                        analysis["ai_metadata_raw"] = ai_raw
-                except Exception as e:
-                    # don't kill the whole analysis if AI fails
-                    analysis["ai_error"] = str(e)
-
+            analysis = await _analyze_package(kw, title, desc, tags, has_custom_thumbnail, in_playlists)
         except YouTubeError as e:
             error = str(e)
         except Exception as e:
             error = f"Unexpected error: {e}"
 
-    return render(request, "optimize.html", {
+    return await arender(request, "optimize.html", {
         "keyword": kw,
         "title": title,
         "description": desc,
@@ -907,18 +779,233 @@ def optimize(request):
     })
 
 
+@require_POST
+def optimize_score(request):
+    """
+    Live re-score of the Optimize form (JSON). Uses only the cached keyword
+    context from a previous analyze - no YouTube or AI calls - so it is cheap
+    enough to call on every debounced keystroke.
+    """
+    started = time.perf_counter()
+
+    kw = request.POST.get("keyword", "").strip()
+    title = request.POST.get("title", "").strip()
+    desc = request.POST.get("description", "").strip()
+    tags_raw = request.POST.get("tags", "").strip()
+    tags = [t.strip() for t in tags_raw.split(",")] if tags_raw else []
+    has_custom_thumbnail = bool(request.POST.get("has_custom_thumbnail"))
+    in_playlists = bool(request.POST.get("in_playlists"))
+
+    region = getattr(settings, "YOUTUBE_DEFAULT_REGION", "US")
+    ctx = get_cached("kwctx", make_key(kw, region)) if kw else None
+    entities = ctx["entities"] if ctx else []
+
+    overall_score, pillars, pillar_fixes = score_holistic_package(
+        kw, title, desc, tags, entities, None, has_custom_thumbnail, in_playlists,
+        env_stats=ctx["env"] if ctx else None,
+        closest_title=_closest_title(title, ctx.get("title_sketches", []) if ctx else []),
+    )
+    meta_score, meta_breakdown, meta_fixes = score_metadata(
+        title, desc, tags, hashtags_from_tags(tags, kw)
+    )
+
+    return JsonResponse({
+        "score": overall_score,
+        "pillars": {name: {"score": p["score"], "max": p["max"], "pct": p["pct"]} for name, p in pillars.items()},
+        "fixes": pillar_fixes + meta_fixes,
+        "meta_score": meta_score,
+        "context_cached": ctx is not None,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    })
+
+
 # ===================== LIBRARY =====================
 
+def _page_qs(params, filters):
+    return urlencode({k: v for k, v in {**params, **filters}.items() if v is not None})
+
+
+def _library_page(q, number, after, before, filters):
+    if q:
+        # relevance order; the "cursors" are page numbers
+        page = search.search_page(q, number=number, **filters)
+        prev_params = {"q": q, "p": page.prev_cursor}
+        next_params = {"q": q, "p": page.next_cursor}
+    else:
+        page = library_pages.keyset_page(after=after, before=before, number=number, **filters)
+        prev_params = {"before": page.prev_cursor, "p": number - 1}
+        next_params = {"after": page.next_cursor, "p": number + 1}
+    rank_tracking.annotate_latest(page.object_list)
+    page.prev_qs = _page_qs(prev_params, filters)
+    page.next_qs = _page_qs(next_params, filters)
+    return page
+
+
 def library(request):
-    qs = Optimization.objects.order_by("-created_at")
-    p = Paginator(qs, 10)
-    page = p.get_page(request.GET.get("page", 1))
-    return render(request, "library.html", {"page": page})
+    try:
+        number = int(request.GET.get("p", 1))
+    except ValueError:
+        number = 1
+    filters = library_pages.clean_filters(
+        tag=request.GET.get("tag"),
+        entity=request.GET.get("entity"),
+        min_score=request.GET.get("min_score"),
+    )
+    q = request.GET.get("q", "").strip()
+    after, before = request.GET.get("after"), request.GET.get("before")
+
+    # one indexed read decides between 304, cached fragments and a full render
+    version, updated_at = versions.current(versions.LIBRARY)
+    last_modified = updated_at.timestamp() if updated_at else None
+    frag_key = make_key(version, q, number, after, before, *sorted(filters.items()))
+    etag = _etag(request, "library", frag_key)
+    not_modified = _not_modified(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    # lazy: only evaluated by fragments that miss the cache
+    response = render(request, "library.html", {
+        "page": SimpleLazyObject(lambda: _library_page(q, number, after, before, filters)),
+        "q": q,
+        "filters": filters,
+        "filter_qs": urlencode(filters),
+        "top_tags": SimpleLazyObject(
+            lambda: list(library_pages.top_terms("tags", min_score=filters.get("min_score", 0), limit=12))
+        ),
+        "dashboard": SimpleLazyObject(rollups.summary),
+        "version": version,
+        "frag_key": frag_key,
+        "fragment_ttl": ttl_for("fragment"),
+    })
+    return _with_validators(response, etag, last_modified)
+
+
+@require_POST
+def library_track(request, pk: int):
+    """Attach (or clear) the published video of a package so its rank gets tracked."""
+    opt = get_object_or_404(Optimization, pk=pk)
+    raw = request.POST.get("video", "").strip()
+    video_id = parse_video_id(raw) if raw else None
+    if raw and not video_id:
+        messages.error(request, "That doesn't look like a YouTube video URL or ID.")
+        return redirect("library")
+    # plain UPDATE: the title sketch, terms and rollups don't depend on the video
+    with transaction.atomic():
+        Optimization.objects.filter(pk=opt.pk).update(video_id=video_id)
+        versions.bump(versions.LIBRARY)
+    if video_id:
+        keyword_stats.track([opt.keyword], rank_tracking.default_region())
+        messages.success(request, f"Tracking rank of {video_id} for “{opt.keyword}”.")
+    else:
+        messages.success(request, f"Stopped tracking “{opt.keyword}”.")
+    return redirect("library")
+
+
+def library_ranks(request, pk: int):
+    """Rank history of a tracked package (JSON, newest first); rank null = not in the top `depth`."""
+    opt = get_object_or_404(Optimization, pk=pk)
+    ranks = rank_tracking.package_ranks(opt)
+    return JsonResponse({"id": opt.pk, "keyword": opt.keyword, "video": opt.video_id,
+                         "ranks": [{"fetched_at": t.isoformat(), "rank": r, "depth": d} for t, r, d in ranks]})
+
+
+def library_export(request):
+    """
+    Streamed CSV/JSONL download of the Library (honours tag/entity/min_score
+    filters, or a single `id`). Memory stays flat at any size.
+    """
+    fmt = request.GET.get("format", "csv")
+    if fmt not in transfer.FORMATS:
+        fmt = "csv"
+    filters = library_pages.clean_filters(
+        tag=request.GET.get("tag"),
+        entity=request.GET.get("entity"),
+        min_score=request.GET.get("min_score"),
+    )
+    qs = library_pages.filtered(**filters)
+    if request.GET.get("id", "").isdigit():
+        qs = qs.filter(pk=int(request.GET["id"]))
+    response = StreamingHttpResponse(transfer.iter_export(fmt, qs), content_type=transfer.CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="library.{fmt}"'
+    return response
+
+
+# ===================== BULK KEYWORD RESEARCH =====================
+
+RESEARCH_UPLOAD_MAX_BYTES = 2 * 1024 * 1024
+
+
+def research_jobs(request):
+    """
+    GET -> upload form + recent jobs.
+    POST -> create a job from pasted keywords or an uploaded list (it runs from research_csv).
+    """
+    if request.method == "POST":
+        upload = request.FILES.get("file")
+        texts = [request.POST.get("keywords", "")]
+        if upload:
+            texts.append(upload.read(RESEARCH_UPLOAD_MAX_BYTES).decode("utf-8-sig", errors="replace"))
+        keywords = research.parse_keywords(*texts)
+        if not keywords:
+            messages.error(request, "No keywords found - paste them one per line or upload a .txt/.csv list.")
+            return redirect("research")
+        name = request.POST.get("name", "").strip() or (upload.name if upload else "")
+        region = getattr(settings, "YOUTUBE_DEFAULT_REGION", "US")
+        job = research.create_job(keywords, region, name)
+        messages.success(request, f"Research job #{job.pk} created with {job.total} keyword(s) ✅")
+        return redirect("research")
+
+    return render(request, "research.html", {
+        "jobs": ResearchJob.objects.order_by("-created_at")[:20],
+        "max_keywords": getattr(settings, "RESEARCH_MAX_KEYWORDS", 5000),
+        "budget": research.default_budget(),
+        "units": research.UNITS,
+        "serp_size": keyword_stats.SERP_SIZE,
+    })
+
+
+async def research_csv(request, pk: int):
+    """
+    Streamed CSV of a research job. GET: the finished rows (following a run in
+    progress). POST: also runs the pending keywords, streaming each row as it
+    finishes; stopping the download leaves the rest pending for next time.
+    """
+    job = await aget_object_or_404(ResearchJob, pk=pk)
+    lines = research.acsv_lines(job, run_pending=request.method == "POST")
+    response = StreamingHttpResponse(lines, content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="research-{job.pk}.csv"'
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+# ===================== CHANNEL AUDIT =====================
+
+def channel_audit(request):
+    """Competitor channel: cadence, median views, best uploads and lengths from its uploads playlist."""
+    channel = request.GET.get("channel", "").strip()
+    n = request.GET.get("n", "")
+    limit = channels.max_videos()
+    n = min(int(n), limit) if n.isdigit() and int(n) > 0 else limit
+    report, error = None, None
+    if channel:
+        try:
+            report = channels.analyze(channel, n)
+        except YouTubeError as e:
+            error = str(e)
+        except Exception as e:
+            error = f"Unexpected error: {e}"
+    return render(request, "channel_audit.html", {
+        "channel": channel,
+        "n": n,
+        "n_options": [o for o in (50, 100, 200, 500) if o < limit] + [limit],
+        "report": report,
+        "error": error,
+    })
 
 
 # ===================== AI GENERATOR (already working) =====================
 
-def ai_generator(request):
+async def ai_generator(request):
     """
     Handles AI content generation.
     GET: form only.
@@ -940,16 +1027,16 @@ Please provide:
 3. Tags: A comma-separated list of 15-20 relevant tags.
 4. Hashtags: 3-5 relevant hashtags.
 """
-            response = generate_content(prompt)
+            response = await agenerate_content(prompt)
             context["topic"] = topic
             context["response"] = response
 
-    return render(request, "ai_generator.html", context)
+    return await arender(request, "ai_generator.html", context)
 
 
 # ===================== TAG / HASHTAG FINDERS (AI) =====================
 
-def tag_finder(request):
+async def tag_finder(request):
     topic = ""
     tags_text = None
 
@@ -963,15 +1050,15 @@ Generate 25 SEO-friendly YouTube tags for a video about: "{topic}".
 
 Return them as a single comma-separated line only, no explanation.
 """
-            tags_text = generate_content(prompt).strip()
+            tags_text = (await agenerate_content(prompt)).strip()
 
-    return render(request, "tag_finder.html", {
+    return await arender(request, "tag_finder.html", {
         "topic": topic,
         "tags_text": tags_text,
     })
 
 
-def hashtag_finder(request):
+async def hashtag_finder(request):
     topic = ""
     hashtags_text = None
 
@@ -985,17 +1072,219 @@ Generate 15 short, brand-safe YouTube hashtags for a video about: "{topic}".
 
 Return them as a single space-separated line like: #tag1 #tag2 #tag3
 """
-            hashtags_text = generate_content(prompt).strip()
+            hashtags_text = (await agenerate_content(prompt)).strip()
 
-    return render(request, "hashtag_finder.html", {
+    return await arender(request, "hashtag_finder.html", {
         "topic": topic,
         "hashtags_text": hashtags_text,
     })
 
 
-# ===================== YOUTUBE LOOKUP (no AI yet) =====================
+# ===================== BATCH API (NDJSON) =====================
+
+BATCH_TYPES = ("discover", "optimize")
+
+
+def _api_error(message: str, status: int = 400):
+    return JsonResponse({"error": message}, status=status)
+
+
+def _batch_items(payload) -> list[dict]:
+    """
+    Validated items of a batch request: {"items": [{"type": ..., "keyword": ...}, ...]},
+    or {"keywords": [...]} as shorthand for Discover items. Raises ValueError.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Expected a JSON object.")
+    items = payload.get("items")
+    if items is None:
+        items = [{"type": "discover", "keyword": kw} for kw in payload.get("keywords") or []]
+    if not isinstance(items, list) or not items:
+        raise ValueError('Send "items" (a list of objects) or "keywords" (a list of strings).')
+    limit = getattr(settings, "BATCH_API_MAX_ITEMS", 100)
+    if len(items) > limit:
+        raise ValueError(f"At most {limit} items per batch.")
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"Item {i}: expected an object.")
+        item.setdefault("type", "discover")
+        if item["type"] not in BATCH_TYPES:
+            raise ValueError(f"Item {i}: type must be one of {', '.join(BATCH_TYPES)}.")
+        if not isinstance(item.get("keyword"), str) or not item["keyword"].strip():
+            raise ValueError(f"Item {i}: keyword is required.")
+        item["keyword"] = item["keyword"].strip()
+    return items
+
+
+async def _batch_discover(item: dict, region: str, shared: batch.Shared) -> dict:
+    q = item["keyword"]
+    try:
+        n = max(1, min(int(item.get("n", 10)), 20))
+    except (TypeError, ValueError):
+        n = 10
+    entry = await shared.get(("serp", q.lower(), n), lambda: _discover_results(q, n, region))
+    results = _refine_results(entry["items"], item.get("sort", "ranking"), "", None, None)
+    return {
+        "n": n,
+        "results": results,
+        **_serp_summary(results),
+        "ai_insight": entry["ai_insight"] if results else None,
+    }
+
+
+async def _batch_optimize(item: dict, region: str, shared: batch.Shared) -> dict:
+    kw = item["keyword"]
+    tags = item.get("tags") or []
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(",")]
+    ctx = await shared.get(("kwctx", kw.lower()), lambda: _keyword_context(kw, region))
+    return await _analyze_package(
+        kw, str(item.get("title", "")).strip(), str(item.get("description", "")).strip(),
+        [str(t) for t in tags], bool(item.get("has_custom_thumbnail")), bool(item.get("in_playlists")),
+        region=region, with_ai=bool(item.get("ai", True)), ctx=ctx,
+    )
+
+
+BATCH_HANDLERS = {"discover": _batch_discover, "optimize": _batch_optimize}
+
+
+async def _batch_lines(items: list[dict], region: str):
+    """One NDJSON line per item in completion order, then a summary line."""
+    started = time.perf_counter()
+    shared = batch.Shared()
+    jobs = [
+        (lambda item=item: BATCH_HANDLERS[item["type"]](item, region, shared))
+        for item in items
+    ]
+    errors = 0
+    finished = batch.as_completed(jobs, getattr(settings, "BATCH_API_CONCURRENCY", 4))
+    async with aclosing(finished):          # a client that hangs up cancels the rest
+        async for index, result, exc in finished:
+            item = items[index]
+            line = {"index": index, "type": item["type"], "keyword": item["keyword"], "ok": exc is None}
+            if exc is None:
+                line["result"] = result
+            else:
+                errors += 1
+                line["error"] = str(exc) if isinstance(exc, YouTubeError) else f"Unexpected error: {exc}"
+            yield json.dumps(line, cls=DjangoJSONEncoder) + "\n"
+    yield json.dumps({"done": True, "items": len(items), "errors": errors,
+                      "seconds": round(time.perf_counter() - started, 3)}) + "\n"
+
+
+@csrf_exempt
+@require_POST
+async def api_batch(request):
+    """
+    Discover and/or Optimize many keywords in one request, for scripts.
+
+    POST a JSON body:
+        {"region": "US",
+         "items": [{"type": "discover", "keyword": "python tutorial", "n": 10},
+                   {"type": "optimize", "keyword": "...", "title": "...", "description": "...",
+                    "tags": ["..."], "has_custom_thumbnail": true, "ai": false}]}
+    ({"keywords": [...]} is shorthand for Discover items.) Items run
+    BATCH_API_CONCURRENCY at a time; items on the same keyword share one SERP
+    fetch. The response is NDJSON streamed in completion order, one
+    {"index", "type", "keyword", "ok", "result" | "error"} line per item and a
+    final {"done": true, ...} line. Requires `Authorization: Bearer <API_TOKEN>`;
+    with no API_TOKEN configured the endpoint is off (503) unless API_OPEN
+    explicitly allows anonymous use.
+
+    The JSON content type is required: a cross-site page can't send it without
+    a CORS preflight, which is what makes skipping the CSRF token safe.
+    """
+    token = getattr(settings, "API_TOKEN", "")
+    if not token and not getattr(settings, "API_OPEN", False):
+        return _api_error("The batch API is disabled: set API_TOKEN to enable it.", status=503)
+    if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return _api_error("Missing or invalid API token.", status=403)
+    if request.content_type != "application/json":
+        return _api_error("Send the batch as application/json.", status=415)
+    try:
+        payload = json.loads(request.body)
+        items = _batch_items(payload)
+    except ValueError as e:
+        return _api_error(str(e))
+
+    region = str(payload.get("region") or getattr(settings, "YOUTUBE_DEFAULT_REGION", "US"))
+    response = StreamingHttpResponse(_batch_lines(items, region), content_type="application/x-ndjson; charset=utf-8")
+    response["X-Accel-Buffering"] = "no"     # let proxies pass lines through as they come
+    return response
+
+
+# ===================== YOUTUBE LOOKUP =====================
+
+LOOKUP_MAX_URLS = 200
+
+
+def _score_lookup(video: dict, keyword: str, entities: list[str], env: dict,
+                  has_custom_thumbnail: bool, in_playlists: bool) -> dict:
+    kw = keyword or (video["tags"][0] if video.get("tags") else "")
+    score, pillars, fixes = score_holistic_package(
+        kw, video["title"], video["description"], video.get("tags", []), entities, None,
+        has_custom_thumbnail, in_playlists, env_stats=env,
+    )
+    return {"video": video, "keyword": kw, "score": score, "pillars": pillars, "fixes": fixes}
+
+
+async def youtube_lookup(request):
+    """
+    Score the current package of one or many videos (watch / youtu.be / shorts
+    URLs or ids). Details come from the per-id cache and batched videos.list
+    calls. With a target keyword its SERP context is used for every video;
+    without one each video is scored on its first tag, against the entities
+    and stats of the pasted set.
+    """
+    submitted = request.method == "POST"
+    params = request.POST if submitted else request.GET     # GET ?id=<url> links to a single video
+    raw = params.get("urls") or params.get("id", "")
+    keyword = params.get("keyword", "").strip()
+    has_custom_thumbnail = bool(params.get("has_custom_thumbnail")) if submitted else True
+    in_playlists = bool(params.get("in_playlists")) if submitted else True
+    region = getattr(settings, "YOUTUBE_DEFAULT_REGION", "US")
+
+    ids, rejected = parse_video_ids(raw)
+    skipped = max(0, len(ids) - LOOKUP_MAX_URLS)
+    ids = ids[:LOOKUP_MAX_URLS]
+    rows, missing, calls, error = [], [], 0, None
+    if ids:
+        try:
+            found, calls = await alookup_videos(ids)
+            videos = [found[i] for i in ids if i in found]
+            missing = [i for i in ids if i not in found]
+            if keyword:
+                ctx = await _keyword_context(keyword, region)
+                entities, env = ctx["entities"], ctx["env"]
+            else:
+                entities, env = serp_entities(videos), env_stats_from_serp(videos)
+            rows = [_score_lookup(v, keyword, entities, env, has_custom_thumbnail, in_playlists) for v in videos]
+        except YouTubeError as e:
+            error = str(e)
+        except Exception as e:
+            error = f"Unexpected error: {e}"
+
+    return await arender(request, "youtube_lookup.html", {
+        "urls": raw,
+        "keyword": keyword,
+        "has_custom_thumbnail": has_custom_thumbnail,
+        "in_playlists": in_playlists,
+        "max_urls": LOOKUP_MAX_URLS,
+        "rows": rows,
+        "avg_score": round(sum(r["score"] for r in rows) / len(rows)) if rows else None,
+        "missing": missing,
+        "rejected": rejected[:20],
+        "skipped": skipped,
+        "api_calls": calls,
+        "error": error,
+    })
+
+
+# ===================== METRICS =====================
 
-def youtube_lookup(request):
-    # To properly add AI here we would need a video-details service.
-    # For now, leave this as a placeholder page.
-    return render(request, "youtube_lookup.html")
+def metrics_view(request):
+    """Prometheus scrape target. With METRICS_TOKEN set, requires `Authorization: Bearer <token>`."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=403)
+    return HttpResponse(metrics.exposition(), content_type="text/plain; version=0.0.4; charset=utf-8")